@@ -1,6 +1,9 @@
 import os
-from sqlalchemy import create_engine
+import weakref
+from sqlalchemy import Connection, create_engine, inspect, text
 from sqlalchemy.orm import declarative_base, sessionmaker
+from adapters.metrics import METRICS_ENABLED, instrument_engine, register_pool_metrics
+from adapters.pool import pool_options
 
 
 # Utiliser PostgreSQL en production, SQLite en local
@@ -13,20 +16,28 @@ DATABASE_URL = os.environ.get(
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-# Configuration selon l'environnement
+# Configuration selon l'environnement (pool réglé par DB_POOL_*, voir adapters/pool.py)
 if DATABASE_URL.startswith("postgresql://"):
     # PostgreSQL en production
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL))
 else:
     # SQLite en local
     engine = create_engine(
         DATABASE_URL,
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        **pool_options(DATABASE_URL)
     )
 
+if METRICS_ENABLED:
+    instrument_engine(engine)
+    register_pool_metrics(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Pile asynchrone (AsyncSession) : USE_ASYNC_DB=1 pour l'activer
+USE_ASYNC_DB = os.environ.get("USE_ASYNC_DB", "0") == "1"
+
 
 def get_db():
     """Générateur de session de base de données."""
@@ -37,6 +48,104 @@ def get_db():
         db.close()
 
 
-def create_tables():
-    """Crée toutes les tables dans la base de données."""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+def to_async_url(url: str) -> str:
+    """Convertit une URL synchrone vers le driver asynchrone (asyncpg, aiosqlite)."""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+_async_sessionmaker = None
+
+
+def get_async_sessionmaker():
+    """
+    Crée à la demande le moteur et la fabrique de sessions asynchrones.
+    Import paresseux : les drivers asynchrones ne sont requis qu'en mode async.
+    """
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        async_url = to_async_url(DATABASE_URL)
+        async_engine = create_async_engine(async_url, **pool_options(async_url, asynchronous=True))
+        if METRICS_ENABLED:
+            instrument_engine(async_engine.sync_engine)
+            register_pool_metrics(async_engine.sync_engine, prefix="db_async_pool")
+        _async_sessionmaker = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return _async_sessionmaker
+
+
+def get_async_engine():
+    """Moteur asynchrone (créé à la demande)."""
+    return get_async_sessionmaker().kw["bind"]
+
+
+async def get_async_db():
+    """Générateur de session asynchrone de base de données."""
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+# Index de recherche plein texte sur les titres
+# - PostgreSQL : index GIN pg_trgm, utilisé directement par ILIKE '%terme%'
+# - SQLite : table virtuelle FTS5 (tokenizer trigram) synchronisée par triggers
+POSTGRES_SEARCH_INDEX = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_books_title_trgm ON books USING gin (title gin_trgm_ops)",
+]
+
+SQLITE_SEARCH_INDEX = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5("
+    "title, content='books', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN "
+    "INSERT INTO books_fts(rowid, title) VALUES (new.id, new.title); END",
+    "CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN "
+    "INSERT INTO books_fts(books_fts, rowid, title) VALUES ('delete', old.id, old.title); END",
+    "CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE OF title ON books BEGIN "
+    "INSERT INTO books_fts(books_fts, rowid, title) VALUES ('delete', old.id, old.title); "
+    "INSERT INTO books_fts(rowid, title) VALUES (new.id, new.title); END",
+    "INSERT INTO books_fts(books_fts) VALUES ('rebuild')",
+]
+
+_search_index_cache = weakref.WeakKeyDictionary()
+
+
+def create_search_index(bind=engine):
+    """
+    Crée l'index de recherche sur les titres selon le moteur de base de données.
+    `bind` peut être un moteur ou une connexion déjà ouverte.
+    """
+    if isinstance(bind, Connection):
+        _create_search_index(bind)
+    else:
+        with bind.begin() as connection:
+            _create_search_index(connection)
+
+
+def _create_search_index(connection: Connection):
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        statements = POSTGRES_SEARCH_INDEX
+    elif dialect == "sqlite":
+        statements = [] if inspect(connection).has_table("books_fts") else SQLITE_SEARCH_INDEX
+    else:
+        return
+    for statement in statements:
+        connection.execute(text(statement))
+    # Seule la table FTS5 de SQLite change la requête de recherche (PostgreSQL : ILIKE indexé)
+    _search_index_cache[connection.engine] = dialect == "sqlite"
+
+
+def has_search_index(bind, connection=None) -> bool:
+    """
+    Indique si la table FTS5 de recherche est disponible (SQLite).
+    Le résultat est mis en cache par moteur ; `connection` permet l'inspection
+    depuis une connexion déjà ouverte (cas du moteur asynchrone).
+    """
+    if bind not in _search_index_cache:
+        _search_index_cache[bind] = (
+            bind.dialect.name == "sqlite" and inspect(connection or bind).has_table("books_fts")
+        )
+    return _search_index_cache[bind]
@@ -0,0 +1,273 @@
+"""
+Métriques de l'application au format texte Prometheus.
+Compteurs, jauges et histogrammes minimalistes (sans dépendance), chronométrage
+des requêtes SQL par événements SQLAlchemy, et compteurs par requête HTTP.
+
+Tout est désactivé par défaut (METRICS_ENABLED=1 pour l'activer) : sans cela,
+aucun middleware, aucun événement ni décorateur n'est installé.
+"""
+import contextvars
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from adapters.pool import WORKERS
+
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "0") == "1"
+
+# Chaque worker a ses propres compteurs et /metrics ne répond que pour celui qui
+# reçoit la collecte : avec plusieurs workers, l'étiquette worker (pid) sépare leurs
+# séries, à agréger côté Prometheus (ex. sum without (worker) (...))
+WORKER_LABEL = f'worker="{os.getpid()}"' if WORKERS > 1 else ""
+
+# Bornes des histogrammes de durée (secondes) et de nombre de requêtes SQL
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+def escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Étiquettes Prometheus `{a="x",b="y"}` (vide s'il n'y en a pas), plus celle du worker."""
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    if WORKER_LABEL:
+        pairs.append(WORKER_LABEL)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    """Base commune : nom, aide, étiquettes et verrou."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """Lignes du format texte Prometheus (en-tête compris)."""
+
+
+class Counter(Metric):
+    """Compteur monotone par combinaison d'étiquettes."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Tuple[str, ...] = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{format_labels(self.labels, labels)} {format_value(value)}"
+            for labels, value in values
+        ]
+
+
+class Gauge(Counter):
+    """Valeur instantanée, modifiable dans les deux sens."""
+
+    kind = "gauge"
+
+    def dec(self, labels: Tuple[str, ...] = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+
+class CallbackGauge(Metric):
+    """Jauge lue à l'export par une fonction (ex. état du pool de connexions)."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], Optional[float]]):
+        super().__init__(name, documentation)
+        self.read = read
+
+    def render(self) -> List[str]:
+        value = self.read()
+        return [] if value is None else self.header() + [f"{self.name}{format_labels((), ())} {format_value(value)}"]
+
+
+class CallbackCounter(CallbackGauge):
+    """Compteur monotone lu à l'export par une fonction (ex. connexions obtenues du pool)."""
+
+    kind = "counter"
+
+
+class Histogram(Metric):
+    """Histogramme à bornes fixes (compteurs cumulés à l'export)."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        # étiquettes -> [compteurs par borne (+Inf en dernier), somme]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, labels: Tuple[str, ...] = ()) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        lines = self.header()
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else format_value(bound)
+                bucket_labels = format_labels(self.labels, labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labels, labels)} {format_value(total)}")
+            lines.append(f"{self.name}_count{format_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ensemble des métriques exportées sur /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.register(Counter(
+    "http_requests_total", "Requêtes HTTP traitées.", ("method", "route", "status")
+))
+HTTP_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds", "Durée des requêtes HTTP.", ("method", "route")
+))
+HTTP_IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight", "Requêtes HTTP en cours de traitement."
+))
+REQUEST_QUERIES = registry.register(Histogram(
+    "http_request_db_queries", "Requêtes SQL exécutées par requête HTTP.", ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS
+))
+REQUEST_DB_SECONDS = registry.register(Histogram(
+    "http_request_db_seconds", "Temps SQL cumulé par requête HTTP.", ("method", "route")
+))
+DB_QUERIES = registry.register(Counter(
+    "db_queries_total", "Requêtes SQL exécutées.", ("operation",)
+))
+DB_DURATION = registry.register(Histogram(
+    "db_query_duration_seconds", "Durée des requêtes SQL.", ("operation",)
+))
+REPOSITORY_DURATION = registry.register(Histogram(
+    "repository_call_duration_seconds", "Durée des appels au repository.", ("repository", "method")
+))
+
+
+# --- Compteurs SQL de la requête HTTP en cours ---
+
+class RequestQueries:
+    """Nombre et durée cumulée des requêtes SQL d'une requête HTTP."""
+
+    __slots__ = ("count", "seconds", "_lock")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, elapsed: float):
+        # Plusieurs threads du threadpool peuvent exécuter du SQL pour la même requête
+        with self._lock:
+            self.count += 1
+            self.seconds += elapsed
+
+
+# Objet mutable : les threads du threadpool reçoivent une copie du contexte,
+# mais partagent la même instance.
+current_request_queries: contextvars.ContextVar[Optional[RequestQueries]] = contextvars.ContextVar(
+    "current_request_queries", default=None
+)
+
+
+# --- Chronométrage SQL par événements SQLAlchemy ---
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_start
+    operation = (statement.lstrip().split(None, 1) or ["?"])[0].upper()
+    DB_QUERIES.inc((operation,))
+    DB_DURATION.observe(elapsed, (operation,))
+    queries = current_request_queries.get()
+    if queries is not None:
+        queries.add(elapsed)
+
+
+def instrument_engine(engine):
+    """Installe les événements de chronométrage SQL sur un moteur synchrone."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def register_pool_metrics(engine, prefix: str = "db_pool"):
+    """Exporte l'état du pool de connexions d'un moteur, lu à chaque export."""
+    from adapters.pool import pool_status
+
+    # Jauges pour l'état instantané, compteurs (suffixe _total) pour les cumuls depuis le démarrage
+    for metric, name, field, documentation in (
+        (CallbackGauge, "checked_out", "checked_out", "Connexions actuellement prises."),
+        (CallbackGauge, "overflow", "overflow", "Connexions ouvertes au-delà de pool_size."),
+        (CallbackCounter, "checkouts_total", "checkouts", "Connexions obtenues depuis le démarrage."),
+        (CallbackCounter, "timeouts_total", "timeouts", "Attentes de connexion expirées."),
+        (CallbackCounter, "wait_seconds_total", "wait_seconds_total", "Temps cumulé d'attente d'une connexion."),
+    ):
+        registry.register(metric(
+            f"{prefix}_{name}", documentation, lambda field=field: pool_status(engine)[field]
+        ))
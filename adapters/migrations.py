@@ -0,0 +1,213 @@
+"""
+Migrations de schéma versionnées.
+Chaque migration est appliquée une seule fois, dans l'ordre, et enregistrée dans
+la table schema_version ; au démarrage, une base à jour ne coûte qu'une lecture
+de cette table. Les migrations restent idempotentes (IF NOT EXISTS, colonnes
+vérifiées) : une base créée avant le suivi des versions les reçoit toutes sans
+dommage, sur SQLite comme sur PostgreSQL.
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, List
+from sqlalchemy import Connection, create_engine, func, insert, inspect, select, text
+from sqlalchemy.pool import NullPool
+from adapters.database import Base, create_search_index, engine
+from adapters.models import schema_version
+from domain.book import normalize
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou de fichier, préparation du schéma non protégée
+    fcntl = None
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Étape du schéma : `apply` reçoit la connexion de la migration, dans sa transaction."""
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+def create_initial_tables(connection: Connection):
+    """Tables du modèle (books, collection_state) ; sans effet sur celles qui existent."""
+    Base.metadata.create_all(bind=connection)
+
+
+# Colonnes ajoutées après la création initiale de la table books
+BOOKS_ADDED_COLUMNS = {
+    "version": "ALTER TABLE books ADD COLUMN version INTEGER NOT NULL DEFAULT 1",
+    "updated_at": "ALTER TABLE books ADD COLUMN updated_at TIMESTAMP",
+    "title_key": "ALTER TABLE books ADD COLUMN title_key VARCHAR",
+    "author_key": "ALTER TABLE books ADD COLUMN author_key VARCHAR",
+}
+
+UNIQUE_KEY_INDEX = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_books_title_author_key ON books (title_key, author_key)"
+)
+
+DUPLICATE_KEYS = (
+    "SELECT min(title), min(author), count(*) FROM books "
+    "GROUP BY title_key, author_key HAVING count(*) > 1 ORDER BY min(id) LIMIT 5"
+)
+
+
+class DuplicateKeysError(Exception):
+    def __init__(self, duplicates):
+        self.duplicates = duplicates
+        listed = ", ".join(f"'{title}' par {author} ({count}×)" for title, author, count in duplicates)
+        super().__init__(
+            f"Migration impossible : livres en double (titre, auteur) : {listed}. "
+            f"Supprimez ou renommez les doublons, puis relancez la migration."
+        )
+
+
+def add_normalized_keys(connection: Connection):
+    """
+    Colonnes de version et clés normalisées, remplies pour les livres existants
+    (casefold n'existe pas en SQL), puis index unique (titre, auteur), dont dépendent
+    les créations sans doublon : des doublons existants font échouer la migration.
+    """
+    columns = {column["name"] for column in inspect(connection).get_columns("books")}
+    for name, statement in BOOKS_ADDED_COLUMNS.items():
+        if name not in columns:
+            connection.execute(text(statement))
+
+    rows = connection.execute(text("SELECT id, title, author FROM books WHERE title_key IS NULL")).all()
+    if rows:
+        connection.execute(
+            text("UPDATE books SET title_key = :title_key, author_key = :author_key WHERE id = :id"),
+            [{"id": book_id, "title_key": normalize(title), "author_key": normalize(author)}
+             for book_id, title, author in rows]
+        )
+    duplicates = connection.execute(text(DUPLICATE_KEYS)).all()
+    if duplicates:
+        raise DuplicateKeysError([tuple(row) for row in duplicates])
+    connection.execute(text(UNIQUE_KEY_INDEX))
+
+
+# Index des listes filtrées (voir BookModel.__table_args__)
+BOOKS_QUERY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_books_author_key_year ON books (author_key, year)",
+    "CREATE INDEX IF NOT EXISTS ix_books_year_rating ON books (year, rating)",
+]
+
+
+def add_query_indexes(connection: Connection):
+    """Index composites des filtres par auteur et années, et années et note."""
+    for statement in BOOKS_QUERY_INDEXES:
+        connection.execute(text(statement))
+
+
+# Ligne unique du compteur de la collection : les écritures ne font plus qu'un UPDATE
+# (un INSERT à la première écriture ferait échouer l'un de deux premiers écrivains simultanés)
+SEED_COLLECTION_STATE = (
+    "INSERT INTO collection_state (id, version) "
+    "SELECT 1, 0 WHERE NOT EXISTS (SELECT 1 FROM collection_state WHERE id = 1)"
+)
+
+
+def seed_collection_state(connection: Connection):
+    """Crée la ligne du compteur de modifications (version 0) si elle n'existe pas."""
+    connection.execute(text(SEED_COLLECTION_STATE))
+
+
+# Ordre d'application ; une nouvelle migration s'ajoute à la fin, avec la version suivante
+MIGRATIONS: List[Migration] = [
+    Migration(1, "initial_tables", create_initial_tables),
+    Migration(2, "normalized_keys", add_normalized_keys),
+    Migration(3, "query_indexes", add_query_indexes),
+    Migration(4, "title_search_index", create_search_index),
+    Migration(5, "collection_state_row", seed_collection_state),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(connection: Connection) -> int:
+    """Dernière migration appliquée (0 : base vide ou antérieure au suivi des versions)."""
+    if not inspect(connection).has_table(schema_version.name):
+        return 0
+    return connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+
+def migrate(bind=engine) -> List[int]:
+    """
+    Applique les migrations manquantes, chacune dans sa transaction ; retourne leurs versions.
+    Une migration en échec lève son exception : ni elle ni les suivantes ne sont enregistrées.
+    `bind` peut être un moteur ou une connexion déjà ouverte (cas du moteur asynchrone).
+    """
+    if isinstance(bind, Connection):
+        return _migrate(bind)
+    with bind.connect() as connection:
+        return _migrate(connection)
+
+
+def _migrate(connection: Connection) -> List[int]:
+    applied = []
+    schema_version.create(connection, checkfirst=True)
+    connection.commit()
+    version = current_version(connection)
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        try:
+            migration.apply(connection)
+            connection.execute(insert(schema_version).values(
+                version=migration.version, name=migration.name, applied_at=func.now()
+            ))
+            connection.commit()
+        except Exception:
+            # Migration en échec : rien n'est enregistré, elle sera rejouée au prochain démarrage
+            connection.rollback()
+            raise
+        applied.append(migration.version)
+    return applied
+
+
+# Clé du verrou consultatif PostgreSQL qui protège la préparation du schéma
+SCHEMA_LOCK_KEY = 0x626F6F6B
+
+
+@contextmanager
+def schema_lock(bind=engine):
+    """
+    Verrou exclusif entre processus (workers, instances) le temps de préparer le schéma :
+    pg_advisory_lock sur PostgreSQL, verrou de fichier `<base>.lock` sur SQLite.
+    La connexion du verrou est prise hors du pool, qui peut n'en compter qu'une.
+    """
+    if bind.dialect.name == "postgresql":
+        lock_engine = create_engine(bind.url, poolclass=NullPool)
+        try:
+            with lock_engine.connect() as connection:
+                connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+                try:
+                    yield
+                finally:
+                    connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SCHEMA_LOCK_KEY})
+        finally:
+            lock_engine.dispose()
+        return
+    database = bind.url.database if bind.dialect.name == "sqlite" else None
+    if fcntl is None or not database or database == ":memory:":
+        yield
+        return
+    with open(f"{database}.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def setup_schema(bind=engine) -> List[int]:
+    """
+    Met le schéma à jour au démarrage. Une base déjà à jour ne coûte qu'une lecture
+    de schema_version, sans verrou ; sinon, les migrations manquantes sont appliquées
+    sous schema_lock (un seul processus à la fois, les suivants n'ont plus rien à faire).
+    """
+    with bind.connect() as connection:
+        if current_version(connection) >= LATEST_VERSION:
+            return []
+    with schema_lock(bind):
+        return migrate(bind)
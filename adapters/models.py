@@ -1,5 +1,7 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, func, literal_column
+from sqlalchemy.orm import validates
 from adapters.database import Base
+from domain.book import normalize
 
 class BookModel(Base):
     """
@@ -13,14 +15,59 @@ class BookModel(Base):
     author = Column(String, nullable=False, index=True)
     year = Column(Integer, nullable=False)
     rating = Column(Integer, nullable=True)
+    # Version de la ligne et date de modification, pour les ETag / Last-Modified
+    version = Column(Integer, nullable=False, default=1, server_default="1",
+                     onupdate=literal_column("version") + 1)
+    updated_at = Column(DateTime(timezone=True), nullable=True, default=func.now(), onupdate=func.now())
+    # Titre et auteur normalisés (casefold, sans espaces autour) : unicité atomique
+    title_key = Column(String, nullable=True)
+    author_key = Column(String, nullable=True)
+    
+    __table_args__ = (
+        Index("uq_books_title_author_key", "title_key", "author_key", unique=True),
+        # Listes filtrées : auteur + années (triées par année), années + note minimale
+        Index("ix_books_author_key_year", "author_key", "year"),
+        Index("ix_books_year_rating", "year", "rating"),
+    )
+    
+    @validates("title", "author")
+    def _set_key(self, field, value):
+        """Maintient title_key / author_key à jour lors des écritures ORM."""
+        setattr(self, f"{field}_key", normalize(value))
+        return value
     
     def to_domain(self):
-        """Convertit le modèle DB en objet Domain Book."""
+        """Convertit le modèle DB en objet Domain Book (déjà validé à l'écriture)."""
         from domain.book import Book
-        return Book(
-            title=self.title,
-            author=self.author,
-            year=self.year,
-            rating=self.rating,
-            book_id=self.id
-        )
\ No newline at end of file
+        return Book.from_storage(self.id, self.title, self.author, self.year, self.rating)
+
+
+class CollectionStateModel(Base):
+    """
+    Compteur de modifications de la collection (une seule ligne, id = 1).
+    Incrémenté à chaque écriture, il sert d'ETag aux listes et statistiques.
+    """
+    __tablename__ = "collection_state"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+
+
+# Table virtuelle FTS5 (SQLite) : hors de Base.metadata, elle est créée par create_search_index()
+books_fts = Table(
+    "books_fts",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("title", String),
+)
+
+
+# Migrations appliquées (voir adapters/migrations.py) : hors de Base.metadata, comme books_fts
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=True),
+)
@@ -0,0 +1,145 @@
+"""
+Pool de connexions configurable et instrumenté.
+Les réglages viennent des variables d'environnement ; les pools comptent
+les attentes d'obtention de connexion pour dimensionner les workers.
+"""
+import os
+import threading
+import time
+from typing import Tuple
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+# Configuration par variables d'environnement (valeurs par défaut de SQLAlchemy, sauf recycle et pre-ping)
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+POOL_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "1") == "1"
+# Connexions à la base pour l'ensemble des processus workers (0 : pas de limite)
+CONNECTION_BUDGET = int(os.environ.get("DB_CONNECTION_BUDGET", "0"))
+# Processus qui se partagent ce budget (fixé par server.py pour ses workers)
+WORKERS = int(os.environ.get("WEB_CONCURRENCY", "1"))
+
+
+class PoolWaitStats:
+    """Compteurs d'obtention de connexion : nombre, expirations, temps d'attente."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_total, 6),
+                "wait_seconds_max": round(self.wait_max, 6),
+            }
+
+
+class TimedPoolMixin:
+    """Mesure le temps passé à obtenir une connexion (attente dans la file comprise)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    """QueuePool instrumenté (moteur synchrone)."""
+
+
+class TimedAsyncQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool instrumenté (moteur asynchrone)."""
+
+
+def is_memory_sqlite(url: str) -> bool:
+    """Une base SQLite en mémoire garde son pool dédié (une seule connexion)."""
+    return url.startswith("sqlite") and (":memory:" in url or url.split("://", 1)[1] in ("", "/"))
+
+
+def budgeted_pool_size(pool_size: int = POOL_SIZE, max_overflow: int = POOL_MAX_OVERFLOW,
+                       budget: int = CONNECTION_BUDGET, workers: int = WORKERS) -> Tuple[int, int]:
+    """
+    (pool_size, max_overflow) d'un worker, réduits pour que workers × (pool_size + max_overflow)
+    reste dans le budget : les connexions permanentes d'abord, le surplus avec ce qui reste.
+    """
+    if budget <= 0:
+        return pool_size, max_overflow
+    per_worker = max(budget // max(workers, 1), 1)
+    size = min(pool_size, per_worker)
+    return size, min(max_overflow, per_worker - size)
+
+
+def pool_options(url: str, asynchronous: bool = False) -> dict:
+    """Arguments de create_engine / create_async_engine pour le pool configuré."""
+    if is_memory_sqlite(url):
+        return {}
+    pool_size, max_overflow = budgeted_pool_size()
+    return {
+        "poolclass": TimedAsyncQueuePool if asynchronous else TimedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": POOL_PRE_PING,
+    }
+
+
+def pool_status(engine) -> dict:
+    """État instantané du pool d'un moteur et compteurs d'attente."""
+    pool = engine.pool
+    status = {
+        "pool_class": type(pool).__name__,
+        "size": None,
+        "checked_in": None,
+        "checked_out": None,
+        "overflow": None,
+        "max_overflow": None,
+        "timeout": None,
+        "recycle": pool._recycle,
+        "pre_ping": pool._pre_ping,
+    }
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # overflow() part de -pool_size : on ne compte que les connexions en surplus
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    wait_stats = getattr(pool, "wait_stats", None)
+    status.update(wait_stats.stats() if wait_stats else PoolWaitStats().stats())
+    return status
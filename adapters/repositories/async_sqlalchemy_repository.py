@@ -0,0 +1,230 @@
+"""
+Adapter SQLAlchemy asynchrone pour le repository de livres.
+Implémente l'interface IAsyncBookRepository avec AsyncSession (asyncpg, aiosqlite).
+"""
+from datetime import datetime
+from typing import AsyncIterator, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.book import Book, BookRow, book_from_row
+from domain.exceptions import DuplicateBookError
+from domain.ports import IAsyncBookRepository
+from domain.query import DEFAULT_AUTHOR_QUERY, DEFAULT_QUERY, AuthorCursor, AuthorQuery, AuthorRow, BookCursor, BookQuery
+from adapters.database import has_search_index
+from adapters.models import BookModel
+from adapters.repositories.sqlalchemy_repository import (
+    DELETE_BATCH_SIZE, KEYS_CHUNK_SIZE, assign_inserted_ids, authors_statement, book_row, book_rows,
+    book_version_statement, collection_version_statement,
+    delete_batch_conditions, delete_statement, exists_condition, existing_keys_statement,
+    filter_condition, insert_ignore_statement, page_rows_statement, patch_statement, rows_statement,
+    statistics_from_row, statistics_statement, title_search_condition, touch_collection_statement
+)
+
+
+class AsyncSQLAlchemyBookRepository(IAsyncBookRepository):
+    """Implémentation SQLAlchemy asynchrone du repository de livres."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _touch_collection(self):
+        """
+        Incrémente le compteur de modifications, dans la transaction en cours, toujours
+        après l'écriture du livre : chaque écriture verrouille la ligne du livre puis
+        celle du compteur, dans le même ordre (sans quoi PostgreSQL peut s'interbloquer).
+        """
+        await self.db.execute(touch_collection_statement())
+
+    async def _use_fts(self) -> bool:
+        engine = self.db.bind.sync_engine
+        return await self.db.run_sync(
+            lambda session: has_search_index(engine, session.connection())
+        )
+
+    async def add(self, book: Book) -> Book:
+        """Ajoute un livre à la base de données."""
+        db_book = BookModel(
+            title=book.title,
+            author=book.author,
+            year=book.year,
+            rating=book.rating
+        )
+        self.db.add(db_book)
+        try:
+            await self.db.flush()
+            await self._touch_collection()
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise DuplicateBookError(book.title, book.author)
+
+        book.id = db_book.id
+        return book
+
+    async def add_if_absent(self, book: Book) -> Optional[Book]:
+        """Ajoute un livre en une seule requête INSERT ... ON CONFLICT DO NOTHING RETURNING."""
+        statement = insert_ignore_statement(self.db.bind.dialect.name)
+        book_id = (await self.db.execute(statement.values(**book_row(book)).returning(BookModel.id))).scalar()
+        if book_id is None:
+            await self.db.rollback()
+            return None
+        await self._touch_collection()
+        await self.db.commit()
+
+        book.id = book_id
+        return book
+
+    async def add_many(self, books: List[Book]) -> List[Book]:
+        """Ajoute plusieurs livres en un seul INSERT multi-lignes et un seul commit."""
+        if not books:
+            return []
+        statement = insert_ignore_statement(self.db.bind.dialect.name).returning(
+            BookModel.id, BookModel.title_key, BookModel.author_key
+        )
+        rows = (await self.db.execute(statement, book_rows(books))).all()
+        await self._touch_collection()
+        await self.db.commit()
+        return assign_inserted_ids(books, rows)
+
+    async def get_all(self) -> List[Book]:
+        """Retourne tous les livres."""
+        return [book_from_row(row) for row in await self.get_all_rows()]
+
+    async def get_page(self, after: Optional[int] = None, limit: int = 100) -> List[Book]:
+        """Retourne une page de livres triés par ID (keyset sur la clé primaire)."""
+        return [book_from_row(row) for row in await self.get_page_rows(after, limit)]
+
+    async def iter_all(self, batch_size: int = 1000) -> AsyncIterator[Book]:
+        """Parcourt tous les livres avec un curseur côté serveur, sur sa propre connexion."""
+        statement = rows_statement().order_by(BookModel.id).execution_options(yield_per=batch_size)
+        async with self.db.bind.connect() as connection:
+            result = await connection.stream(statement)
+            async for row in result:
+                yield book_from_row(row)
+
+    async def get_by_id(self, book_id: int) -> Optional[Book]:
+        """Récupère un livre par son ID."""
+        db_book = await self.db.get(BookModel, book_id)
+        return db_book.to_domain() if db_book else None
+
+    async def find_by_title(self, search_term: str) -> List[Book]:
+        """Trouve des livres par titre."""
+        return [book_from_row(row) for row in await self.find_rows_by_title(search_term)]
+
+    async def get_all_rows(self, query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Retourne tous les livres sous forme de lignes (ni ORM, ni validation)."""
+        if query is None or query.is_default:
+            return (await self.db.execute(rows_statement())).all()
+        return await self.get_page_rows(limit=None, query=query)
+
+    async def get_page_rows(self, after: Optional[BookCursor] = None, limit: Optional[int] = 100,
+                            query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Retourne une page de lignes, filtrées et triées en SQL."""
+        return (await self.db.execute(page_rows_statement(after, limit, query or DEFAULT_QUERY))).all()
+
+    async def find_rows_by_title(self, search_term: str) -> List[BookRow]:
+        """Trouve des lignes par titre."""
+        if not search_term:
+            return []
+
+        condition = title_search_condition(search_term, await self._use_fts())
+        return (await self.db.execute(rows_statement().where(condition).order_by(BookModel.id))).all()
+
+    async def get_authors(self, after: Optional[AuthorCursor] = None, limit: Optional[int] = 100,
+                          query: Optional[AuthorQuery] = None) -> List[AuthorRow]:
+        """Agrégats par auteur, en un seul GROUP BY."""
+        return (await self.db.execute(authors_statement(after, limit, query or DEFAULT_AUTHOR_QUERY))).all()
+
+    async def exists(self, title: str, author: str) -> bool:
+        """Vérifie si un livre existe déjà."""
+        book_id = await self.db.scalar(select(BookModel.id).where(exists_condition(title, author)).limit(1))
+        return book_id is not None
+
+    async def existing_keys(self, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """Retourne les clés (titre, auteur) déjà présentes, par requêtes IN ensemblistes."""
+        keys = list(keys)
+        found = set()
+        for start in range(0, len(keys), KEYS_CHUNK_SIZE):
+            rows = await self.db.execute(existing_keys_statement(keys[start:start + KEYS_CHUNK_SIZE]))
+            found.update((title, author) for title, author in rows)
+        return found
+
+    async def _delete(self, condition) -> List[int]:
+        """Un DELETE ... RETURNING, dans sa propre transaction."""
+        ids = (await self.db.execute(delete_statement(condition))).scalars().all()
+        if ids:
+            await self._touch_collection()
+        await self.db.commit()
+        return ids
+
+    async def remove_by_id(self, book_id: int) -> bool:
+        """Supprime un livre par son ID, en une seule requête."""
+        return bool(await self._delete(BookModel.id == book_id))
+
+    async def remove_many(self, ids: Optional[Iterable[int]] = None, author: Optional[str] = None,
+                          year_min: Optional[int] = None, year_max: Optional[int] = None) -> List[int]:
+        """Supprime par lots : un DELETE ensembliste et un commit par lot."""
+        removed = []
+        for condition in delete_batch_conditions(ids, filter_condition(author, year_min, year_max)):
+            batch = await self._delete(condition)
+            removed.extend(batch)
+            if ids is None and len(batch) < DELETE_BATCH_SIZE:
+                break
+        return removed
+
+    async def update(self, book: Book) -> Optional[Book]:
+        """Met à jour un livre existant."""
+        db_book = await self.db.get(BookModel, book.id)
+        if db_book:
+            db_book.title = book.title
+            db_book.author = book.author
+            db_book.year = book.year
+            db_book.rating = book.rating
+            try:
+                await self.db.flush()
+                await self._touch_collection()
+                await self.db.commit()
+            except IntegrityError:
+                await self.db.rollback()
+                raise DuplicateBookError(book.title, book.author)
+            return db_book.to_domain()
+        return None
+
+    async def patch(self, book_id: int, changes: dict) -> Optional[Book]:
+        """Modifie uniquement les champs fournis, en un seul UPDATE ... RETURNING."""
+        try:
+            row = (await self.db.execute(patch_statement(book_id, changes))).first()
+            if row is None:
+                await self.db.rollback()
+                return None
+            await self._touch_collection()
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            current = (await self.db.execute(
+                select(BookModel.title, BookModel.author).where(BookModel.id == book_id)
+            )).one_or_none()
+            if current is None:
+                return None
+            raise DuplicateBookError(changes.get("title", current.title), changes.get("author", current.author))
+        return book_from_row(row)
+
+    async def count(self) -> int:
+        """Retourne le nombre de livres."""
+        return await self.db.scalar(select(func.count(BookModel.id)))
+
+    async def get_statistics(self) -> dict:
+        """Calcule les agrégats en une seule requête SQL."""
+        return statistics_from_row((await self.db.execute(statistics_statement())).one())
+
+    async def get_book_version(self, book_id: int) -> Optional[Tuple[int, Optional[datetime]]]:
+        """Retourne (version, date de modification) d'un livre, sans le charger."""
+        row = (await self.db.execute(book_version_statement(book_id))).first()
+        return tuple(row) if row else None
+
+    async def get_collection_version(self) -> Tuple[int, Optional[datetime]]:
+        """Retourne le compteur de modifications de la collection."""
+        row = (await self.db.execute(collection_version_statement())).first()
+        return tuple(row) if row else (0, None)
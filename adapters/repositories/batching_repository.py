@@ -0,0 +1,203 @@
+"""
+Adapter de regroupement des écritures (group commit) pour le repository SQLAlchemy.
+Les créations, modifications et suppressions simultanées sont mises en file et
+exécutées ensemble, dans une seule transaction, par un thread d'écriture ; chaque
+appel ne se termine qu'une fois le commit de son lot effectué.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional
+from sqlalchemy.orm import sessionmaker
+from domain.ports import IBookRepository
+from adapters.repositories.sqlalchemy_repository import SQLAlchemyBookRepository
+from adapters.repositories.timed_repository import described, implement_port
+
+
+# Configuration par variables d'environnement (désactivé par défaut)
+BATCHING_ENABLED = os.environ.get("BOOK_WRITE_BATCHING_ENABLED", "0") == "1"
+# Attente maximale après la première écriture d'un lot, et taille maximale d'un lot
+BATCH_MAX_DELAY = float(os.environ.get("BOOK_WRITE_BATCH_DELAY_MS", "2")) / 1000
+BATCH_MAX_SIZE = int(os.environ.get("BOOK_WRITE_BATCH_SIZE", "100"))
+
+# Écritures unitaires regroupées ; add_many et remove_many font déjà leurs propres lots
+BATCHED_METHODS = {"add", "add_if_absent", "update", "patch", "remove_by_id"}
+
+
+class SharedTransactionBookRepository(SQLAlchemyBookRepository):
+    """
+    Repository SQLAlchemy dont les écritures restent dans la transaction du lot :
+    « valider » se contente d'envoyer les requêtes en attente (les contraintes sont
+    vérifiées à ce moment), et rien n'est annulé. Une écriture en erreur lève une
+    exception : le lot entier est alors annulé puis rejoué écriture par écriture.
+    """
+
+    def _commit(self):
+        self.db.flush()
+
+    def _rollback(self):
+        pass
+
+
+class _Write:
+    __slots__ = ("method", "args", "kwargs", "future")
+
+    def __init__(self, method: str, args: tuple, kwargs: dict):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+
+    def run(self, repository: SQLAlchemyBookRepository):
+        return getattr(repository, self.method)(*self.args, **self.kwargs)
+
+
+class WriteBatcher:
+    """
+    File d'écritures d'un moteur, vidée par un thread dédié avec sa propre session.
+    Un lot part dès BATCH_MAX_SIZE écritures, ou BATCH_MAX_DELAY après la première :
+    un seul commit (donc un seul fsync) pour tout le lot.
+    """
+
+    def __init__(self, session_factory: sessionmaker, max_delay: float = BATCH_MAX_DELAY,
+                 max_size: int = BATCH_MAX_SIZE):
+        self.session_factory = session_factory
+        self.max_delay = max_delay
+        self.max_size = max_size
+        self.batches = 0
+        self.writes = 0
+        self.replayed = 0
+        self.largest = 0
+        self._queue: "queue.Queue[Optional[_Write]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, method: str, args: tuple = (), kwargs: Optional[dict] = None):
+        """Met l'écriture en file et attend le commit de son lot ; retourne son résultat."""
+        write = _Write(method, args, kwargs or {})
+        self._start()
+        self._queue.put(write)
+        return write.future.result()
+
+    def close(self):
+        """Arrête le thread d'écriture après les écritures déjà en file."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "writes": self.writes,
+            "replayed": self.replayed,
+            "largest": self.largest,
+        }
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="book-write-batcher", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """Boucle du thread : un lot = la première écriture en attente et celles qui suivent avant l'échéance."""
+        closing = False
+        while not closing:
+            write = self._queue.get()
+            if write is None:
+                return
+            batch = [write]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_size:
+                try:
+                    write = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if write is None:
+                    closing = True
+                    break
+                batch.append(write)
+            self._flush(batch)
+
+    def _flush(self, batch: List[_Write]):
+        self.batches += 1
+        self.writes += len(batch)
+        self.largest = max(self.largest, len(batch))
+        session = self.session_factory()
+        try:
+            if len(batch) == 1 or not self._commit_together(session, batch):
+                self._commit_each(session, batch)
+        finally:
+            session.close()
+
+    def _commit_together(self, session, batch: List[_Write]) -> bool:
+        """Exécute le lot dans une seule transaction ; False (lot annulé) si une écriture échoue."""
+        repository = SharedTransactionBookRepository(session)
+        try:
+            results = [write.run(repository) for write in batch]
+            session.commit()
+        except Exception:
+            session.rollback()
+            self.replayed += 1
+            return False
+        for write, result in zip(batch, results):
+            write.future.set_result(result)
+        return True
+
+    def _commit_each(self, session, batch: List[_Write]):
+        """Une transaction par écriture : chaque appel reçoit son propre résultat ou son erreur."""
+        repository = SQLAlchemyBookRepository(session)
+        for write in batch:
+            try:
+                write.future.set_result(write.run(repository))
+            except Exception as error:
+                session.rollback()
+                write.future.set_exception(error)
+
+
+# Un thread d'écriture par moteur, pour tout le processus (le repository est créé par requête)
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def write_batcher(bind) -> WriteBatcher:
+    """File d'écritures du moteur `bind`, créée au premier appel."""
+    with _batchers_lock:
+        if bind not in _batchers:
+            _batchers[bind] = WriteBatcher(sessionmaker(bind=bind, autoflush=False))
+        return _batchers[bind]
+
+
+def batching_method(name: str, template):
+    """Méthode déléguant `name` au repository décoré, ou à la file d'écritures."""
+    if name in BATCHED_METHODS:
+        def method(self, *args, **kwargs):
+            # La session de la requête rend sa connexion (prise par une lecture précédente)
+            # avant d'attendre le lot : avec un pool d'une connexion, le thread d'écriture
+            # l'attendrait sinon jusqu'à l'expiration
+            self.repository.db.close()
+            return self.batcher.submit(name, args, kwargs)
+        return described(method, template)
+
+    def method(self, *args, **kwargs):
+        return getattr(self.repository, name)(*args, **kwargs)
+    return described(method, template)
+
+
+class BatchingBookRepository(IBookRepository):
+    """
+    Décorateur du repository SQLAlchemy : les écritures unitaires passent par la file
+    d'écritures du moteur, les lectures et les écritures en masse par la session de la requête.
+    Une requête n'occupe jamais deux connexions du pool : la sienne est rendue avant la file.
+    """
+
+    def __init__(self, repository: SQLAlchemyBookRepository, batcher: Optional[WriteBatcher] = None):
+        self.repository = repository
+        self.batcher = batcher or write_batcher(repository.db.get_bind())
+
+
+implement_port(BatchingBookRepository, IBookRepository, batching_method)
@@ -0,0 +1,314 @@
+"""
+Adapter de cache pour le repository de livres.
+Décore n'importe quel IBookRepository avec des caches LRU + TTL bornés
+(lecture directe, invalidation précise à l'écriture).
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+from domain.book import Book, BookRow, book_from_row, book_to_row
+from domain.ports import IBookRepository
+from domain.query import AuthorCursor, AuthorQuery, AuthorRow, BookCursor, BookQuery
+from adapters.pool import WORKERS
+
+
+def cache_allowed(requested: bool, workers: int = WORKERS) -> bool:
+    """
+    Le cache est propre au processus : avec plusieurs workers, une écriture servie
+    par l'un laisserait les autres répondre d'après leur copie. Il n'est donc
+    activé qu'avec un seul worker.
+    """
+    return requested and workers <= 1
+
+
+# Configuration par variables d'environnement
+CACHE_ENABLED = cache_allowed(os.environ.get("BOOK_CACHE_ENABLED", "0") == "1")
+CACHE_MAX_SIZE = int(os.environ.get("BOOK_CACHE_MAX_SIZE", "1024"))
+CACHE_TTL = float(os.environ.get("BOOK_CACHE_TTL", "30"))
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Cache LRU borné dont les entrées expirent après `ttl` secondes."""
+
+    def __init__(self, max_size: int = CACHE_MAX_SIZE, ttl: float = CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Retourne la valeur en cache, ou _MISSING si absente ou expirée."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return _MISSING
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_if(self, key, predicate):
+        """Supprime l'entrée `key` si sa valeur satisfait le prédicat (sans compter de succès/échec)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and predicate(entry[1]):
+                del self._entries[key]
+
+    def delete_where(self, predicate):
+        """Supprime les entrées dont (clé, valeur) satisfont le prédicat."""
+        with self._lock:
+            for key in [key for key, (_, value) in self._entries.items() if predicate(key, value)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class BookCache:
+    """
+    Ensemble des caches partagés entre les requêtes.
+    Le repository est créé à chaque requête ; le cache, lui, vit avec le processus.
+    Les écritures d'un autre processus (worker, instance) ne l'invalident pas : les
+    lectures de version, toujours faites à la source, écartent les entrées périmées.
+    """
+
+    def __init__(self, max_size: int = CACHE_MAX_SIZE, ttl: float = CACHE_TTL):
+        # ID -> (version du livre lue avant le remplissage, ligne)
+        self.by_id = TTLCache(max_size, ttl)
+        self.search = TTLCache(max_size, ttl)
+        self.count = TTLCache(1, ttl)
+        self.statistics = TTLCache(1, ttl)
+        # Compteur de la collection sous lequel recherches, nombre et statistiques sont valides
+        self.collection_version = None
+        self._lock = threading.Lock()
+
+    def sync_collection(self, version: int):
+        """Vide les caches de la collection si son compteur a changé depuis la dernière lecture."""
+        with self._lock:
+            if version != self.collection_version:
+                for cache in (self.search, self.count, self.statistics):
+                    cache.clear()
+                self.collection_version = version
+
+    def clear(self):
+        for cache in (self.by_id, self.search, self.count, self.statistics):
+            cache.clear()
+
+    def stats(self) -> dict:
+        """Compteurs de succès/échecs par cache."""
+        return {
+            "by_id": self.by_id.stats(),
+            "search": self.search.stats(),
+            "count": self.count.stats(),
+            "statistics": self.statistics.stats(),
+        }
+
+
+# Cache du processus, utilisé par get_book_service
+book_cache = BookCache()
+
+
+class CachingBookRepository(IBookRepository):
+    """Décorateur de repository : lecture via le cache, invalidation à l'écriture."""
+
+    def __init__(self, repository: IBookRepository, cache: BookCache = book_cache):
+        self.repository = repository
+        self.cache = cache
+        # Versions lues à la source pendant la requête, attachées aux entrées remplies ensuite
+        self._book_versions = {}
+
+    # --- Invalidation ---
+
+    def _invalidate_book(self, book_id: int, *titles: str):
+        """Invalide un livre : son entrée, les recherches qui le contiennent ou le trouveraient."""
+        self.cache.by_id.delete(book_id)
+        self.cache.search.delete_where(
+            lambda term, rows: any(row[0] == book_id for row in rows)
+            or any(term.lower() in title.lower() for title in titles)
+        )
+        self.cache.statistics.clear()
+
+    # --- Écritures ---
+
+    def add(self, book: Book) -> Book:
+        """Ajoute un livre et invalide les entrées concernées."""
+        created = self.repository.add(book)
+        self._invalidate_book(created.id, created.title)
+        self.cache.count.clear()
+        return created
+
+    def add_if_absent(self, book: Book) -> Optional[Book]:
+        """Ajoute un livre s'il n'existe pas et invalide les entrées concernées."""
+        created = self.repository.add_if_absent(book)
+        if created is not None:
+            self._invalidate_book(created.id, created.title)
+            self.cache.count.clear()
+        return created
+
+    def add_many(self, books: List[Book]) -> List[Book]:
+        """
+        Ajoute plusieurs livres et invalide en une fois les entrées de la collection :
+        les nouveaux IDs ne sont pas en cache, seules les recherches peuvent changer.
+        """
+        created = self.repository.add_many(books)
+        if any(book.id is not None for book in created):
+            self.cache.search.clear()
+            self.cache.statistics.clear()
+            self.cache.count.clear()
+        return created
+
+    def remove_by_id(self, book_id: int) -> bool:
+        """Supprime un livre et invalide les entrées concernées."""
+        removed = self.repository.remove_by_id(book_id)
+        if removed:
+            self._invalidate_book(book_id)
+            self.cache.count.clear()
+        return removed
+
+    def remove_many(self, ids: Optional[Iterable[int]] = None, author: Optional[str] = None,
+                    year_min: Optional[int] = None, year_max: Optional[int] = None) -> List[int]:
+        """Supprime des livres en masse et invalide les entrées concernées."""
+        removed = self.repository.remove_many(ids, author, year_min, year_max)
+        if removed:
+            # Une seule passe sur les recherches en cache, quel que soit le nombre de livres
+            removed_ids = set(removed)
+            for book_id in removed_ids:
+                self.cache.by_id.delete(book_id)
+            self.cache.search.delete_where(lambda term, rows: any(row[0] in removed_ids for row in rows))
+            self.cache.statistics.clear()
+            self.cache.count.clear()
+        return removed
+
+    def update(self, book: Book) -> Optional[Book]:
+        """Met à jour un livre et invalide les entrées concernées."""
+        updated = self.repository.update(book)
+        if updated is not None:
+            self._invalidate_book(book.id, book.title)
+        return updated
+
+    def patch(self, book_id: int, changes: dict) -> Optional[Book]:
+        """Modifie un livre et invalide les entrées concernées."""
+        patched = self.repository.patch(book_id, changes)
+        if patched is not None:
+            self._invalidate_book(book_id, patched.title)
+        return patched
+
+    # --- Lectures en cache ---
+
+    def get_by_id(self, book_id: int) -> Optional[Book]:
+        """
+        Récupère un livre par son ID (en cache). Le cache garde la ligne et chaque
+        appel reçoit son propre Book : le modifier n'altère pas l'entrée partagée.
+        """
+        entry = self.cache.by_id.get(book_id)
+        if entry is _MISSING:
+            book = self.repository.get_by_id(book_id)
+            if book is not None:
+                self.cache.by_id.set(book_id, (self._book_versions.get(book_id), book_to_row(book)))
+            return book
+        return book_from_row(entry[1])
+
+    def find_by_title(self, search_term: str) -> List[Book]:
+        """Trouve des livres par titre (en cache par terme)."""
+        return [book_from_row(row) for row in self.find_rows_by_title(search_term)]
+
+    def find_rows_by_title(self, search_term: str) -> List[BookRow]:
+        """Trouve des lignes par titre ; le cache conserve les lignes, plus légères que des Book."""
+        rows = self.cache.search.get(search_term)
+        if rows is _MISSING:
+            rows = self.repository.find_rows_by_title(search_term)
+            self.cache.search.set(search_term, rows)
+        return list(rows)
+
+    def count(self) -> int:
+        """Retourne le nombre de livres (en cache)."""
+        total = self.cache.count.get("count")
+        if total is _MISSING:
+            total = self.repository.count()
+            self.cache.count.set("count", total)
+        return total
+
+    def get_statistics(self) -> dict:
+        """Calcule les agrégats de la collection (en cache)."""
+        stats = self.cache.statistics.get("statistics")
+        if stats is _MISSING:
+            stats = self.repository.get_statistics()
+            self.cache.statistics.set("statistics", stats)
+        return stats
+
+    # --- Lectures non mises en cache ---
+
+    def get_all(self) -> List[Book]:
+        """Retourne tous les livres."""
+        return self.repository.get_all()
+
+    def get_page(self, after: Optional[int] = None, limit: int = 100) -> List[Book]:
+        """Retourne une page de livres triés par ID."""
+        return self.repository.get_page(after=after, limit=limit)
+
+    def get_all_rows(self, query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Retourne tous les livres sous forme de lignes."""
+        return self.repository.get_all_rows(query)
+
+    def get_page_rows(self, after: Optional[BookCursor] = None, limit: Optional[int] = 100,
+                      query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Retourne une page de lignes filtrées et triées."""
+        return self.repository.get_page_rows(after=after, limit=limit, query=query)
+
+    def get_authors(self, after: Optional[AuthorCursor] = None, limit: Optional[int] = 100,
+                    query: Optional[AuthorQuery] = None) -> List[AuthorRow]:
+        """Retourne les agrégats par auteur."""
+        return self.repository.get_authors(after=after, limit=limit, query=query)
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Book]:
+        """Parcourt tous les livres."""
+        return self.repository.iter_all(batch_size)
+
+    def exists(self, title: str, author: str) -> bool:
+        """Vérifie si un livre existe déjà."""
+        return self.repository.exists(title, author)
+
+    def existing_keys(self, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """Retourne les clés (titre, auteur) déjà présentes."""
+        return self.repository.existing_keys(keys)
+
+    def get_book_version(self, book_id: int) -> Optional[Tuple[int, Optional[datetime]]]:
+        """
+        Retourne la version d'un livre (toujours lue à la source) et écarte l'entrée
+        en cache remplie sous une autre version : le corps suit l'ETag.
+        """
+        current = self.repository.get_book_version(book_id)
+        version = current[0] if current is not None else None
+        self.cache.by_id.discard_if(book_id, lambda entry: entry[0] != version)
+        self._book_versions[book_id] = version
+        return current
+
+    def get_collection_version(self) -> Tuple[int, Optional[datetime]]:
+        """Retourne le compteur de modifications (toujours lu à la source) et resynchronise le cache."""
+        current = self.repository.get_collection_version()
+        self.cache.sync_collection(current[0])
+        return current
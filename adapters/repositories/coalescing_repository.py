@@ -0,0 +1,249 @@
+"""
+Adapter de regroupement (singleflight) pour le repository de livres.
+Décore n'importe quel IBookRepository (ou IAsyncBookRepository) : des lectures
+identiques et simultanées partagent une seule exécution et son résultat.
+"""
+import asyncio
+import os
+import threading
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Hashable, Tuple
+from domain.book import book_from_row, book_to_row
+from domain.ports import IAsyncBookRepository, IBookRepository
+from adapters.repositories.timed_repository import described, implement_port
+
+
+# Configuration par variable d'environnement
+COALESCING_ENABLED = os.environ.get("BOOK_COALESCING_ENABLED", "0") == "1"
+
+
+def copy_book(book):
+    return book_from_row(book_to_row(book)) if book is not None else None
+
+
+def copy_books(books):
+    return [book_from_row(book_to_row(book)) for book in books]
+
+
+def copy_statistics(stats):
+    return {**stats, "rating_distribution": dict(stats["rating_distribution"])}
+
+
+# Lectures regroupées -> copie du résultat pour chaque appel qui le partage
+# (un Book est modifiable : chaque requête reçoit le sien)
+COALESCED_METHODS: Dict[str, Callable] = {
+    "get_by_id": copy_book,
+    "get_all": copy_books,
+    "find_by_title": copy_books,
+    "get_all_rows": list,
+    "find_rows_by_title": list,
+    "count": int,
+    "get_statistics": copy_statistics,
+}
+
+# Écritures : les lectures suivantes ne rejoignent plus les exécutions déjà en cours
+WRITE_METHODS = {"add", "add_if_absent", "add_many", "update", "patch", "remove_by_id", "remove_many"}
+
+
+def flight_key(args: tuple, kwargs: dict) -> Hashable:
+    """Clé d'un appel : ses arguments (tous hachables dans le port)."""
+    return args, tuple(sorted(kwargs.items()))
+
+
+class FlightCounters:
+    """Compteurs par méthode : exécutions réelles, et appels servis par une exécution partagée."""
+
+    def __init__(self):
+        self.executed: Dict[str, int] = defaultdict(int)
+        self.shared: Dict[str, int] = defaultdict(int)
+        # Incrémentée à chaque écriture, elle fait partie de la clé des exécutions
+        self.generation = 0
+
+    def forget(self):
+        """Après une écriture : les appels suivants ne rejoignent plus les exécutions en cours."""
+        self.generation += 1
+
+    def stats(self) -> dict:
+        return {
+            method: {"executed": self.executed[method], "shared": self.shared[method]}
+            for method in sorted(set(self.executed) | set(self.shared))
+        }
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class Singleflight(FlightCounters):
+    """
+    Exécutions en cours, partagées entre threads (routes synchrones).
+    Le premier appel exécute ; les appels identiques arrivés pendant ce temps
+    attendent son résultat (ou son exception) au lieu d'exécuter la même requête.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, method: str, key: Hashable, function: Callable) -> Tuple[object, bool]:
+        """Retourne (résultat, partagé) ; partagé vaut True si un autre appel l'a calculé."""
+        with self._lock:
+            key = (self.generation, method, key)
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.executed[method] += 1
+            else:
+                self.shared[method] += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+        try:
+            flight.result = function()
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    def forget(self):
+        with self._lock:
+            super().forget()
+
+
+class AsyncSingleflight(FlightCounters):
+    """Variante asynchrone : les appels identiques attendent le même Future (une boucle par processus)."""
+
+    def __init__(self):
+        super().__init__()
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, method: str, key: Hashable, function: Callable[[], Awaitable]) -> Tuple[object, bool]:
+        """Retourne (résultat, partagé), comme Singleflight.do."""
+        key = (self.generation, method, key)
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.shared[method] += 1
+            # shield : un appel suiveur annulé n'annule pas l'exécution partagée
+            return await asyncio.shield(flight), True
+        # Exécution dans sa propre tâche, attendue à travers shield par le premier appel
+        # aussi : son annulation ne se propage pas aux suiveurs
+        flight = self._flights[key] = asyncio.ensure_future(function())
+        flight.add_done_callback(lambda done: self._land(key, done))
+        self.executed[method] += 1
+        try:
+            return await asyncio.shield(flight), False
+        except asyncio.CancelledError:
+            # La tâche utilise le repository (et la session) du premier appel : il ne
+            # se termine, et sa session n'est fermée, qu'une fois l'exécution finie
+            while not flight.done():
+                try:
+                    await asyncio.wait({flight})
+                except asyncio.CancelledError:
+                    pass
+            raise
+
+    def _land(self, key: Hashable, flight: asyncio.Future):
+        """Fin de l'exécution : retirée des exécutions en cours, exception marquée comme lue."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # Sans appel encore en attente, asyncio journaliserait l'exception
+            flight.exception()
+
+
+# Exécutions partagées entre les requêtes du processus (le repository est créé par requête)
+flights = Singleflight()
+async_flights = AsyncSingleflight()
+
+
+def coalescing_method(name: str, template):
+    """Méthode déléguant `name` au repository décoré, regroupée s'il s'agit d'une lecture."""
+    if name in COALESCED_METHODS:
+        copy = COALESCED_METHODS[name]
+
+        def method(self, *args, **kwargs):
+            def call():
+                return getattr(self.repository, name)(*args, **kwargs)
+            result, shared = self.flights.do(name, flight_key(args, kwargs), call)
+            return copy(result) if shared else result
+        return described(method, template)
+
+    if name in WRITE_METHODS:
+        def method(self, *args, **kwargs):
+            try:
+                return getattr(self.repository, name)(*args, **kwargs)
+            finally:
+                self.flights.forget()
+        return described(method, template)
+
+    def method(self, *args, **kwargs):
+        return getattr(self.repository, name)(*args, **kwargs)
+    return described(method, template)
+
+
+def coalescing_async_method(name: str, template):
+    """Version asynchrone de coalescing_method."""
+    if name in COALESCED_METHODS:
+        copy = COALESCED_METHODS[name]
+
+        async def method(self, *args, **kwargs):
+            def call():
+                return getattr(self.repository, name)(*args, **kwargs)
+            result, shared = await self.flights.do(name, flight_key(args, kwargs), call)
+            return copy(result) if shared else result
+        return described(method, template)
+
+    if name in WRITE_METHODS:
+        async def method(self, *args, **kwargs):
+            try:
+                return await getattr(self.repository, name)(*args, **kwargs)
+            finally:
+                self.flights.forget()
+        return described(method, template)
+
+    if name == "iter_all":
+        # Générateur asynchrone : retourné tel quel, sans await
+        def method(self, *args, **kwargs):
+            return self.repository.iter_all(*args, **kwargs)
+        return described(method, template)
+
+    async def method(self, *args, **kwargs):
+        return await getattr(self.repository, name)(*args, **kwargs)
+    return described(method, template)
+
+
+class CoalescingBookRepository(IBookRepository):
+    """
+    Décorateur de repository : les lectures identiques simultanées (même méthode,
+    mêmes arguments) partagent une exécution. Aucune donnée n'est conservée
+    après la fin de l'exécution : ce n'est pas un cache.
+    """
+
+    def __init__(self, repository: IBookRepository, group: Singleflight = flights):
+        self.repository = repository
+        self.flights = group
+
+
+class AsyncCoalescingBookRepository(IAsyncBookRepository):
+    """Décorateur de repository asynchrone à lectures regroupées."""
+
+    def __init__(self, repository: IAsyncBookRepository, group: AsyncSingleflight = async_flights):
+        self.repository = repository
+        self.flights = group
+
+
+implement_port(CoalescingBookRepository, IBookRepository, coalescing_method)
+implement_port(AsyncCoalescingBookRepository, IAsyncBookRepository, coalescing_async_method)
@@ -0,0 +1,326 @@
+"""
+Adapter en mémoire colonnaire pour le repository de livres.
+Pensé pour les lectures analytiques (statistiques, filtres par année ou auteur)
+sur des millions de livres : une colonne par champ au lieu d'un objet par livre.
+"""
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from itertools import compress, islice, repeat
+from operator import and_
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from domain.book import Book, BookRow, book_from_row, normalize
+from domain.exceptions import DuplicateBookError
+from domain.ports import IBookRepository
+from domain.query import DEFAULT_AUTHOR_QUERY, AuthorCursor, AuthorQuery, AuthorRow, BookCursor, BookQuery, page_rows
+from adapters.repositories.in_memory_repository import AuthorIndex
+
+
+# Part de lignes supprimées au-delà de laquelle les colonnes sont compactées
+COMPACT_RATIO = 0.25
+
+# Note absente (les notes valides vont de 1 à 5)
+NO_RATING = 0
+
+
+class ColumnarBookRepository(IBookRepository):
+    """
+    Implémentation colonnaire du repository de livres.
+
+    - `id`, `year`, `rating` et les versions sont des tableaux typés (array / bytearray),
+      sans objet Python par valeur ; la colonne des IDs, triée, sert d'index (bisect) ;
+    - titres et auteurs sont internés : un auteur de cent livres n'est stocké qu'une fois ;
+    - statistiques, filtres et recherche par titre s'exécutent en C sur les colonnes
+      (min/max/sum/count, itertools.compress, map avec des méthodes natives), sans
+      boucle Python par livre. Pas d'index n-grammes : la recherche parcourt la
+      colonne des titres en minuscules, pour un coût mémoire bien moindre.
+
+    Une suppression marque la ligne comme morte ; les colonnes sont compactées
+    dès que les lignes mortes dépassent COMPACT_RATIO.
+    """
+
+    def __init__(self):
+        # Colonnes, triées par ID (les IDs sont attribués de façon croissante)
+        self._ids = array("q")
+        self._years = array("h")
+        self._ratings = bytearray()
+        self._titles: List[str] = []
+        self._title_keys: List[str] = []
+        self._authors: List[str] = []
+        self._author_keys: List[str] = []
+        # Version de chaque ligne et date de modification (timestamp POSIX)
+        self._versions = array("q")
+        self._updated = array("d")
+        # 1 par ligne vivante, 0 par ligne supprimée en attente de compactage
+        self._alive = bytearray()
+        self._dead = 0
+        self._next_id = 1
+        # Clés (titre, auteur) normalisées -> ID
+        self._keys: Dict[Tuple[str, str], int] = {}
+        self._collection_version: Tuple[int, Optional[datetime]] = (0, None)
+        # Agrégats par auteur tenus à jour à l'écriture (voir InMemoryBookRepository)
+        self._author_index = AuthorIndex()
+
+    def _touch(self, position: int = None):
+        now = datetime.now(timezone.utc)
+        if position is not None:
+            self._versions[position] += 1
+            self._updated[position] = now.timestamp()
+        self._collection_version = (self._collection_version[0] + 1, now)
+
+    # --- Colonnes ---
+
+    def _position(self, book_id: int) -> Optional[int]:
+        """Position d'un livre vivant, par recherche dichotomique dans la colonne des IDs."""
+        position = bisect_left(self._ids, book_id)
+        if position < len(self._ids) and self._ids[position] == book_id and self._alive[position]:
+            return position
+        return None
+
+    def _store(self, position: int, book: Book):
+        """Écrit les champs d'un livre à une position existante."""
+        self._author_index.remove(self._authors[position], self._ratings[position])
+        self._author_index.add(book.author, book.rating)
+        self._titles[position] = sys.intern(book.title)
+        self._title_keys[position] = book.title.lower()
+        self._authors[position] = sys.intern(book.author)
+        self._author_keys[position] = sys.intern(normalize(book.author))
+        self._years[position] = book.year
+        self._ratings[position] = book.rating or NO_RATING
+
+    def _append(self, book: Book) -> int:
+        self._author_index.add(book.author, book.rating)
+        self._ids.append(book.id)
+        self._years.append(book.year)
+        self._ratings.append(book.rating or NO_RATING)
+        self._titles.append(sys.intern(book.title))
+        self._title_keys.append(book.title.lower())
+        self._authors.append(sys.intern(book.author))
+        self._author_keys.append(sys.intern(normalize(book.author)))
+        self._versions.append(0)
+        self._updated.append(0.0)
+        self._alive.append(1)
+        return len(self._ids) - 1
+
+    def _live(self, column):
+        """Valeurs des lignes vivantes d'une colonne (itertools.compress, en C)."""
+        return compress(column, self._alive) if self._dead else column
+
+    def _compact(self):
+        """Retire les lignes mortes de toutes les colonnes."""
+        self._ids = array("q", self._live(self._ids))
+        self._years = array("h", self._live(self._years))
+        self._ratings = bytearray(self._live(self._ratings))
+        self._titles = list(self._live(self._titles))
+        self._title_keys = list(self._live(self._title_keys))
+        self._authors = list(self._live(self._authors))
+        self._author_keys = list(self._live(self._author_keys))
+        self._versions = array("q", self._live(self._versions))
+        self._updated = array("d", self._live(self._updated))
+        self._alive = bytearray(b"\x01" * len(self._ids))
+        self._dead = 0
+
+    def _row(self, position: int) -> BookRow:
+        rating = self._ratings[position]
+        return (self._ids[position], self._titles[position], self._authors[position],
+                self._years[position], rating if rating != NO_RATING else None)
+
+    def _rows(self, positions: Iterable[int]) -> List[BookRow]:
+        return [self._row(position) for position in positions]
+
+    def _mask(self, author_key: Optional[str] = None, year_min: Optional[int] = None,
+              year_max: Optional[int] = None, rating_min: Optional[int] = None):
+        """Masque des lignes vivantes satisfaisant tous les filtres : une passe en C par critère."""
+        mask = self._alive
+        if author_key is not None:
+            mask = map(and_, mask, map(author_key.__eq__, self._author_keys))
+        if year_min is not None:
+            mask = map(and_, mask, map(year_min.__le__, self._years))
+        if year_max is not None:
+            mask = map(and_, mask, map(year_max.__ge__, self._years))
+        if rating_min is not None:
+            # Les notes absentes (0) sont sous toute note minimale
+            mask = map(and_, mask, map(rating_min.__le__, self._ratings))
+        return mask
+
+    def _live_positions(self, start: int = 0) -> Iterator[int]:
+        positions = range(start, len(self._ids))
+        return compress(positions, islice(self._alive, start, None)) if self._dead else iter(positions)
+
+    # --- Écritures ---
+
+    def add(self, book: Book) -> Book:
+        """Ajoute un livre en fin de colonnes."""
+        key = book.key
+        if key in self._keys:
+            raise DuplicateBookError(book.title, book.author)
+        book.id = self._next_id
+        self._next_id += 1
+        self._keys[key] = book.id
+        self._touch(self._append(book))
+        return book
+
+    def add_if_absent(self, book: Book) -> Optional[Book]:
+        """Ajoute un livre s'il n'existe pas déjà."""
+        if book.key in self._keys:
+            return None
+        return self.add(book)
+
+    def add_many(self, books: List[Book]) -> List[Book]:
+        """Ajoute plusieurs livres ; les doublons sont ignorés."""
+        for book in books:
+            self.add_if_absent(book)
+        return books
+
+    def update(self, book: Book) -> Optional[Book]:
+        """Met à jour un livre en place dans les colonnes."""
+        position = self._position(book.id)
+        if position is None:
+            return None
+        key = book.key
+        if self._keys.get(key, book.id) != book.id:
+            raise DuplicateBookError(book.title, book.author)
+        self._keys.pop((normalize(self._titles[position]), self._author_keys[position]), None)
+        self._store(position, book)
+        self._keys[key] = book.id
+        self._touch(position)
+        return book
+
+    def patch(self, book_id: int, changes: dict) -> Optional[Book]:
+        """Modifie uniquement les champs fournis."""
+        position = self._position(book_id)
+        if position is None:
+            return None
+        _, title, author, year, rating = self._row(position)
+        fields = {"title": title, "author": author, "year": year, "rating": rating}
+        fields.update(changes)
+        return self.update(Book(book_id=book_id, **fields))
+
+    def remove_by_id(self, book_id: int) -> bool:
+        """Supprime un livre par son ID (ligne marquée morte)."""
+        position = self._position(book_id)
+        if position is None:
+            return False
+        self._keys.pop((normalize(self._titles[position]), self._author_keys[position]), None)
+        self._author_index.remove(self._authors[position], self._ratings[position])
+        self._alive[position] = 0
+        # Une note nulle ne compte ni dans la distribution ni dans la somme
+        self._ratings[position] = NO_RATING
+        self._dead += 1
+        self._touch()
+        if self._dead > COMPACT_RATIO * len(self._ids):
+            self._compact()
+        return True
+
+    def remove_many(self, ids: Optional[Iterable[int]] = None, author: Optional[str] = None,
+                    year_min: Optional[int] = None, year_max: Optional[int] = None) -> List[int]:
+        """Supprime les livres correspondant à tous les critères ; filtre calculé sur les colonnes."""
+        if ids is None:
+            author_key = normalize(author) if author is not None else None
+            removed = list(compress(self._ids, self._mask(author_key, year_min, year_max)))
+        else:
+            author_key = normalize(author) if author is not None else None
+            positions = (self._position(book_id) for book_id in dict.fromkeys(ids))
+            removed = [
+                self._ids[position] for position in positions
+                if position is not None
+                and (author_key is None or self._author_keys[position] == author_key)
+                and (year_min is None or self._years[position] >= year_min)
+                and (year_max is None or self._years[position] <= year_max)
+            ]
+        for book_id in removed:
+            self.remove_by_id(book_id)
+        return removed
+
+    # --- Lectures ---
+
+    def get_all(self) -> List[Book]:
+        """Retourne tous les livres."""
+        return [book_from_row(row) for row in self.get_all_rows()]
+
+    def get_page(self, after: Optional[int] = None, limit: int = 100) -> List[Book]:
+        """Retourne une page de livres triés par ID."""
+        return [book_from_row(row) for row in self.get_page_rows(after, limit)]
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Book]:
+        """Parcourt tous les livres (instantané pris au premier élément)."""
+        yield from self.get_all()
+
+    def get_by_id(self, book_id: int) -> Optional[Book]:
+        """Récupère un livre par son ID."""
+        position = self._position(book_id)
+        return book_from_row(self._row(position)) if position is not None else None
+
+    def find_by_title(self, search_term: str) -> List[Book]:
+        """Trouve des livres par titre."""
+        return [book_from_row(row) for row in self.find_rows_by_title(search_term)]
+
+    def get_all_rows(self, query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Retourne tous les livres sous forme de lignes, filtrées et triées selon `query`."""
+        if query is None or query.is_default:
+            return self._rows(self._live_positions())
+        return self.get_page_rows(limit=None, query=query)
+
+    def get_page_rows(self, after: Optional[BookCursor] = None, limit: Optional[int] = 100,
+                      query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Retourne une page de lignes ; les filtres sont des masques calculés sur les colonnes."""
+        if query is None or query.is_default:
+            # Colonne des IDs triée : recherche dichotomique du curseur
+            start = bisect_right(self._ids, after) if after is not None else 0
+            return self._rows(islice(self._live_positions(start), limit))
+        mask = self._mask(query.author_key, query.year_min, query.year_max, query.rating_min)
+        rows = self._rows(compress(range(len(self._ids)), mask))
+        return page_rows(rows, query, after, limit)
+
+    def find_rows_by_title(self, search_term: str) -> List[BookRow]:
+        """Trouve des lignes par titre : str.__contains__ appliqué en C à la colonne des titres."""
+        if not search_term:
+            return []
+        matches = map(str.__contains__, self._title_keys, repeat(search_term.lower()))
+        positions = compress(range(len(self._ids)), matches)
+        if self._dead:
+            positions = (position for position in positions if self._alive[position])
+        return self._rows(positions)
+
+    def get_authors(self, after: Optional[AuthorCursor] = None, limit: Optional[int] = 100,
+                    query: Optional[AuthorQuery] = None) -> List[AuthorRow]:
+        """Agrégats par auteur, lus dans l'index tenu à jour à l'écriture."""
+        return self._author_index.page(after, limit, query or DEFAULT_AUTHOR_QUERY)
+
+    def exists(self, title: str, author: str) -> bool:
+        """Vérifie si un livre existe déjà."""
+        return (normalize(title), normalize(author)) in self._keys
+
+    def existing_keys(self, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """Retourne les clés (titre, auteur) déjà présentes."""
+        return {key for key in keys if key in self._keys}
+
+    def count(self) -> int:
+        """Retourne le nombre de livres."""
+        return len(self._ids) - self._dead
+
+    def get_statistics(self) -> dict:
+        """Calcule les agrégats par opérations natives sur les colonnes year et rating."""
+        years = self._years if not self._dead else array("h", self._live(self._years))
+        # Les lignes mortes ont une note nulle : la colonne se lit telle quelle
+        distribution = {rating: self._ratings.count(rating) for rating in range(1, 6)}
+        return {
+            "total": len(years),
+            "oldest": min(years) if years else None,
+            "newest": max(years) if years else None,
+            "rating_count": sum(distribution.values()),
+            "rating_sum": sum(self._ratings),
+            "rating_distribution": distribution,
+        }
+
+    def get_book_version(self, book_id: int) -> Optional[Tuple[int, Optional[datetime]]]:
+        """Retourne (version, date de modification) d'un livre."""
+        position = self._position(book_id)
+        if position is None:
+            return None
+        return self._versions[position], datetime.fromtimestamp(self._updated[position], timezone.utc)
+
+    def get_collection_version(self) -> Tuple[int, Optional[datetime]]:
+        """Retourne le compteur de modifications de la collection."""
+        return self._collection_version
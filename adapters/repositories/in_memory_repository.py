@@ -2,66 +2,292 @@
 Adapter In-Memory pour le repository de livres.
 Utile pour les tests et le développement rapide.
 """
-from typing import List, Optional
-from domain.book import Book
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from domain.book import Book, BookRow, book_to_row, normalize
+from domain.exceptions import DuplicateBookError
 from domain.ports import IBookRepository
+from domain.query import DEFAULT_AUTHOR_QUERY, AuthorCursor, AuthorQuery, AuthorRow, BookCursor, BookQuery, page_authors, page_rows
+
+
+NGRAM_SIZE = 3
+
+
+def title_ngrams(text: str) -> Set[str]:
+    """Découpe un texte (en minuscules) en n-grammes de caractères."""
+    text = text.lower()
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class AuthorIndex:
+    """
+    Agrégats par auteur normalisé, tenus à jour à chaque écriture :
+    l'équivalent en mémoire du GROUP BY de l'adapter SQL, sans parcourir les livres.
+    """
+    
+    def __init__(self):
+        # Auteur normalisé -> [livres, livres notés, somme des notes]
+        self._totals: Dict[str, List[int]] = {}
+        # Auteur normalisé -> nombre de livres par graphie (le nom retenu est la plus petite)
+        self._spellings: Dict[str, Counter] = {}
+    
+    def add(self, author: str, rating: Optional[int]):
+        key = normalize(author)
+        totals = self._totals.setdefault(key, [0, 0, 0])
+        totals[0] += 1
+        if rating:
+            totals[1] += 1
+            totals[2] += rating
+        self._spellings.setdefault(key, Counter())[author] += 1
+    
+    def remove(self, author: str, rating: Optional[int]):
+        key = normalize(author)
+        totals = self._totals[key]
+        totals[0] -= 1
+        if rating:
+            totals[1] -= 1
+            totals[2] -= rating
+        spellings = self._spellings[key]
+        spellings[author] -= 1
+        if not spellings[author]:
+            del spellings[author]
+        if not totals[0]:
+            del self._totals[key], self._spellings[key]
+    
+    def row(self, key: str) -> Optional[AuthorRow]:
+        """Ligne d'un auteur normalisé, ou None s'il n'a aucun livre."""
+        totals = self._totals.get(key)
+        if totals is None:
+            return None
+        return (min(self._spellings[key]), *totals)
+    
+    def page(self, after: Optional[AuthorCursor], limit: Optional[int], query: AuthorQuery) -> List[AuthorRow]:
+        """Page d'auteurs triée selon `query`, après le curseur `after`."""
+        return page_authors(map(self.row, self._totals), query, after, limit)
 
 
 class InMemoryBookRepository(IBookRepository):
     """Implémentation en mémoire du repository de livres."""
     
     def __init__(self):
-        self._books: List[Book] = []
+        # Dictionnaire id -> Book : accès O(1), ordre d'insertion conservé
+        self._books: Dict[int, Book] = {}
         self._next_id = 1
+        # Clés (titre, auteur) normalisées -> ID, pour exists() en O(1) et l'unicité
+        self._keys: Dict[Tuple[str, str], int] = {}
+        # Index inversé : n-gramme du titre -> IDs des livres qui le contiennent
+        self._title_index: Dict[str, Set[int]] = defaultdict(set)
+        # Agrégats par auteur, pour get_authors() sans parcours
+        self._authors = AuthorIndex()
+        # Versions par livre et compteur de modifications de la collection
+        self._versions: Dict[int, Tuple[int, datetime]] = {}
+        self._collection_version: Tuple[int, Optional[datetime]] = (0, None)
+    
+    def _touch(self, book_id: int = None, removed: bool = False):
+        now = datetime.now(timezone.utc)
+        if book_id is not None:
+            if removed:
+                self._versions.pop(book_id, None)
+            else:
+                version = self._versions.get(book_id, (0, None))[0]
+                self._versions[book_id] = (version + 1, now)
+        self._collection_version = (self._collection_version[0] + 1, now)
+    
+    def _index(self, book: Book):
+        self._keys[book.key] = book.id
+        self._authors.add(book.author, book.rating)
+        for ngram in title_ngrams(book.title):
+            self._title_index[ngram].add(book.id)
+    
+    def _unindex(self, book: Book):
+        self._keys.pop(book.key, None)
+        self._authors.remove(book.author, book.rating)
+        for ngram in title_ngrams(book.title):
+            postings = self._title_index.get(ngram)
+            if postings is not None:
+                postings.discard(book.id)
+                if not postings:
+                    del self._title_index[ngram]
     
     def add(self, book: Book) -> Book:
         """Ajoute un livre en mémoire."""
+        if book.key in self._keys:
+            raise DuplicateBookError(book.title, book.author)
         book.id = self._next_id
         self._next_id += 1
-        self._books.append(book)
+        self._books[book.id] = book
+        self._index(book)
+        self._touch(book.id)
         return book
     
+    def add_if_absent(self, book: Book) -> Optional[Book]:
+        """Ajoute un livre s'il n'existe pas déjà."""
+        if book.key in self._keys:
+            return None
+        return self.add(book)
+    
+    def add_many(self, books: List[Book]) -> List[Book]:
+        """Ajoute plusieurs livres en mémoire ; les doublons sont ignorés."""
+        for book in books:
+            self.add_if_absent(book)
+        return books
+    
     def get_all(self) -> List[Book]:
         """Retourne tous les livres."""
-        return self._books.copy()
+        return list(self._books.values())
+    
+    def get_page(self, after: Optional[int] = None, limit: int = 100) -> List[Book]:
+        """Retourne une page de livres triés par ID."""
+        if after is None:
+            # Les IDs sont attribués de façon croissante : l'ordre d'insertion est trié
+            return list(islice(self._books.values(), limit))
+        page = []
+        for book_id in range(after + 1, self._next_id):
+            book = self._books.get(book_id)
+            if book is not None:
+                page.append(book)
+                if len(page) == limit:
+                    break
+        return page
+    
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Book]:
+        """Parcourt tous les livres (instantané des références, les livres sont déjà en mémoire)."""
+        yield from list(self._books.values())
     
     def get_by_id(self, book_id: int) -> Optional[Book]:
         """Récupère un livre par son ID."""
-        for book in self._books:
-            if book.id == book_id:
-                return book
-        return None
+        return self._books.get(book_id)
     
     def find_by_title(self, search_term: str) -> List[Book]:
         """Trouve des livres par titre."""
         if not search_term:
             return []
-        return [book for book in self._books if book.matches_title(search_term)]
+        ngrams = title_ngrams(search_term)
+        if not ngrams:
+            # Terme trop court pour l'index : parcours complet
+            return [book for book in self._books.values() if book.matches_title(search_term)]
+        
+        # Intersection des listes de postings, en commençant par la plus courte
+        postings = sorted((self._title_index.get(ngram, set()) for ngram in ngrams), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        books = (self._books[book_id] for book_id in sorted(candidates))
+        return [book for book in books if book.matches_title(search_term)]
+    
+    def get_all_rows(self, query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Retourne tous les livres sous forme de lignes, filtrées et triées selon `query`."""
+        if query is None or query.is_default:
+            return [book_to_row(book) for book in self._books.values()]
+        return self.get_page_rows(limit=None, query=query)
+    
+    def get_page_rows(self, after: Optional[BookCursor] = None, limit: Optional[int] = 100,
+                      query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Retourne une page de lignes, filtrées et triées selon `query`."""
+        if query is None or query.is_default:
+            return [book_to_row(book) for book in self.get_page(after, limit)]
+        rows = (row for row in map(book_to_row, self._books.values()) if query.matches(row))
+        return page_rows(rows, query, after, limit)
+    
+    def find_rows_by_title(self, search_term: str) -> List[BookRow]:
+        """Trouve des lignes par titre."""
+        return [book_to_row(book) for book in self.find_by_title(search_term)]
+    
+    def get_authors(self, after: Optional[AuthorCursor] = None, limit: Optional[int] = 100,
+                    query: Optional[AuthorQuery] = None) -> List[AuthorRow]:
+        """Agrégats par auteur, lus dans l'index tenu à jour à l'écriture."""
+        return self._authors.page(after, limit, query or DEFAULT_AUTHOR_QUERY)
     
     def exists(self, title: str, author: str) -> bool:
         """Vérifie si un livre existe déjà."""
-        return any(
-            book.title.lower() == title.lower() and 
-            book.author.lower() == author.lower()
-            for book in self._books
-        )
+        return (normalize(title), normalize(author)) in self._keys
+    
+    def existing_keys(self, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """Retourne les clés (titre, auteur) déjà présentes."""
+        return {key for key in keys if key in self._keys}
     
     def remove_by_id(self, book_id: int) -> bool:
         """Supprime un livre par son ID."""
-        for i, book in enumerate(self._books):
-            if book.id == book_id:
-                self._books.pop(i)
-                return True
-        return False
+        book = self._books.pop(book_id, None)
+        if book is None:
+            return False
+        self._unindex(book)
+        self._touch(book_id, removed=True)
+        return True
+    
+    def remove_many(self, ids: Optional[Iterable[int]] = None, author: Optional[str] = None,
+                    year_min: Optional[int] = None, year_max: Optional[int] = None) -> List[int]:
+        """Supprime les livres correspondant à tous les critères fournis."""
+        if ids is None:
+            candidates = list(self._books.values())
+        else:
+            candidates = [self._books[book_id] for book_id in dict.fromkeys(ids) if book_id in self._books]
+        author_key = normalize(author) if author is not None else None
+        removed = [
+            book.id for book in candidates
+            if (author_key is None or normalize(book.author) == author_key)
+            and (year_min is None or book.year >= year_min)
+            and (year_max is None or book.year <= year_max)
+        ]
+        for book_id in removed:
+            self.remove_by_id(book_id)
+        return removed
     
     def update(self, book: Book) -> Optional[Book]:
         """Met à jour un livre existant."""
-        for i, existing_book in enumerate(self._books):
-            if existing_book.id == book.id:
-                self._books[i] = book
-                return book
-        return None
+        existing_book = self._books.get(book.id)
+        if existing_book is None:
+            return None
+        if self._keys.get(book.key, book.id) != book.id:
+            raise DuplicateBookError(book.title, book.author)
+        self._unindex(existing_book)
+        self._books[book.id] = book
+        self._index(book)
+        self._touch(book.id)
+        return book
+    
+    def patch(self, book_id: int, changes: dict) -> Optional[Book]:
+        """Modifie uniquement les champs fournis."""
+        existing_book = self._books.get(book_id)
+        if existing_book is None:
+            return None
+        fields = {
+            "title": existing_book.title, "author": existing_book.author,
+            "year": existing_book.year, "rating": existing_book.rating,
+        }
+        fields.update(changes)
+        return self.update(Book(book_id=book_id, **fields))
     
     def count(self) -> int:
         """Retourne le nombre de livres."""
-        return len(self._books)
\ No newline at end of file
+        return len(self._books)
+    
+    def get_statistics(self) -> dict:
+        """Calcule les agrégats en une seule passe sur les livres."""
+        oldest = newest = None
+        rating_sum = 0
+        distribution = {rating: 0 for rating in range(1, 6)}
+        for book in self._books.values():
+            if oldest is None or book.year < oldest:
+                oldest = book.year
+            if newest is None or book.year > newest:
+                newest = book.year
+            if book.rating is not None:
+                distribution[book.rating] += 1
+                rating_sum += book.rating
+        return {
+            "total": len(self._books),
+            "oldest": oldest,
+            "newest": newest,
+            "rating_count": sum(distribution.values()),
+            "rating_sum": rating_sum,
+            "rating_distribution": distribution,
+        }
+    
+    def get_book_version(self, book_id: int) -> Optional[Tuple[int, Optional[datetime]]]:
+        """Retourne (version, date de modification) d'un livre."""
+        return self._versions.get(book_id)
+    
+    def get_collection_version(self) -> Tuple[int, Optional[datetime]]:
+        """Retourne le compteur de modifications de la collection."""
+        return self._collection_version
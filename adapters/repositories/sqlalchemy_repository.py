@@ -2,12 +2,264 @@
 Adapter SQLAlchemy pour le repository de livres.
 Implémente l'interface IBookRepository.
 """
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+from sqlalchemy import and_, case, delete, func, insert, or_, select, true, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from domain.book import Book
+from domain.book import Book, BookRow, book_from_row, normalize
+from domain.exceptions import DuplicateBookError
 from domain.ports import IBookRepository
-from adapters.models import BookModel
+from domain.query import DEFAULT_AUTHOR_QUERY, DEFAULT_QUERY, AuthorCursor, AuthorQuery, AuthorRow, BookCursor, BookQuery
+from adapters.database import has_search_index
+from adapters.models import BookModel, CollectionStateModel, books_fts
+
+
+# Nombre maximal de clés par requête IN (limite de paramètres SQLite)
+KEYS_CHUNK_SIZE = 400
+
+# Nombre de livres supprimés par DELETE (et par transaction) lors d'une suppression filtrée
+DELETE_BATCH_SIZE = 1000
+
+
+# Construction des requêtes, partagée avec l'adapter asynchrone
+
+def title_search_condition(search_term: str, use_fts: bool):
+    """Condition de recherche par titre, servie par l'index de recherche."""
+    pattern = f"%{search_term}%"
+    if use_fts:
+        # SQLite : LIKE sur la table FTS5 trigram, servi par l'index
+        return BookModel.id.in_(
+            select(books_fts.c.rowid).where(books_fts.c.title.like(pattern))
+        )
+    # PostgreSQL : ILIKE servi par l'index GIN pg_trgm
+    return BookModel.title.ilike(pattern)
+
+
+def existing_keys_statement(chunk: List[Tuple[str, str]]):
+    """SELECT des clés (titre, auteur) normalisées présentes parmi `chunk` (index unique)."""
+    return select(BookModel.title_key, BookModel.author_key).where(
+        tuple_(BookModel.title_key, BookModel.author_key).in_(chunk)
+    )
+
+
+def exists_condition(title: str, author: str):
+    """Égalité sur les clés normalisées, servie par l'index unique."""
+    return (BookModel.title_key == normalize(title)) & (BookModel.author_key == normalize(author))
+
+
+def insert_ignore_statement(dialect_name: str):
+    """INSERT ... ON CONFLICT DO NOTHING sur la clé (titre, auteur) normalisée."""
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(dialect_name)
+    if dialect_insert is None:
+        return insert(BookModel)
+    return dialect_insert(BookModel).on_conflict_do_nothing(
+        index_elements=[BookModel.title_key, BookModel.author_key]
+    )
+
+
+def assign_inserted_ids(books: List[Book], rows) -> List[Book]:
+    """Attribue les IDs retournés (id, title_key, author_key) ; les doublons gardent None."""
+    ids = {(title_key, author_key): book_id for book_id, title_key, author_key in rows}
+    for book in books:
+        book.id = ids.get(book.key)
+    return books
+
+
+def statistics_statement():
+    """SELECT unique calculant COUNT/MIN/MAX et la distribution des notes."""
+    rating_columns = [
+        func.sum(case((BookModel.rating == rating, 1), else_=0))
+        for rating in range(1, 6)
+    ]
+    return select(
+        func.count(BookModel.id),
+        func.min(BookModel.year),
+        func.max(BookModel.year),
+        func.count(BookModel.rating),
+        func.sum(BookModel.rating),
+        *rating_columns
+    )
+
+
+def statistics_from_row(row) -> dict:
+    """Convertit la ligne de statistics_statement() en dict du port."""
+    total, oldest, newest, rating_count, rating_sum = row[:5]
+    return {
+        "total": total,
+        "oldest": oldest,
+        "newest": newest,
+        "rating_count": rating_count,
+        "rating_sum": rating_sum or 0,
+        "rating_distribution": {
+            rating: count or 0 for rating, count in zip(range(1, 6), row[5:])
+        },
+    }
+
+
+def touch_collection_statement():
+    """UPDATE incrémentant le compteur de modifications de la collection."""
+    return update(CollectionStateModel).where(CollectionStateModel.id == 1).values(
+        version=CollectionStateModel.version + 1,
+        updated_at=func.now()
+    )
+
+
+def rows_statement():
+    """SELECT des seules colonnes d'une ligne de lecture, sans passer par l'ORM."""
+    return select(BookModel.id, BookModel.title, BookModel.author, BookModel.year, BookModel.rating)
+
+
+# Colonnes de tri ; une note absente est triée comme 0, comme dans domain.query
+SORT_COLUMNS = {
+    "id": BookModel.id,
+    "title": BookModel.title,
+    "author": BookModel.author,
+    "year": BookModel.year,
+    "rating": func.coalesce(BookModel.rating, 0),
+}
+
+
+def query_condition(query: BookQuery):
+    """WHERE des filtres d'une requête de liste (index (author_key, year) et (year, rating))."""
+    condition = filter_condition(query.author, query.year_min, query.year_max)
+    if query.rating_min is not None:
+        condition = and_(condition, BookModel.rating >= query.rating_min)
+    return condition
+
+
+def after_condition(query: BookQuery, after: BookCursor):
+    """
+    Keyset sur (valeur triée, id) : lignes situées après le curseur dans l'ordre demandé.
+    Le curseur porte la valeur triée du dernier livre reçu : rien n'est relu, et la
+    page suivante reste juste si ce livre a été modifié ou supprimé entre-temps.
+    """
+    if query.sort == "id":
+        return BookModel.id < after if query.descending else BookModel.id > after
+    column = SORT_COLUMNS[query.sort]
+    value, book_id = query.cursor_key(after)
+    if query.descending:
+        return or_(column < value, and_(column == value, BookModel.id < book_id))
+    return or_(column > value, and_(column == value, BookModel.id > book_id))
+
+
+def page_rows_statement(after: Optional[BookCursor], limit: Optional[int], query: BookQuery = DEFAULT_QUERY):
+    """SELECT d'une page de lignes filtrées et triées, l'ID départageant les valeurs égales."""
+    statement = rows_statement()
+    if not query.is_default:
+        statement = statement.where(query_condition(query))
+    if after is not None:
+        statement = statement.where(after_condition(query, after))
+    columns = [SORT_COLUMNS[query.sort]] if query.sort != "id" else []
+    columns.append(BookModel.id)
+    statement = statement.order_by(*(column.desc() if query.descending else column for column in columns))
+    return statement.limit(limit) if limit is not None else statement
+
+
+def authors_statement(after: Optional[AuthorCursor], limit: Optional[int],
+                      query: AuthorQuery = DEFAULT_AUTHOR_QUERY):
+    """
+    GROUP BY sur l'auteur normalisé, parcouru dans l'index (author_key, year) :
+    plus petite graphie, nombre de livres, livres notés et somme des notes.
+    Keyset sur author_key, ou sur (nombre de livres, author_key) portés par le curseur.
+    """
+    book_count = func.count(BookModel.id)
+    statement = select(
+        func.min(BookModel.author), book_count, func.count(BookModel.rating),
+        func.coalesce(func.sum(BookModel.rating), 0)
+    ).group_by(BookModel.author_key)
+    if after is not None:
+        if query.sort == "name":
+            key, = query.cursor_key(after)
+            statement = statement.where(BookModel.author_key < key if query.descending else BookModel.author_key > key)
+        else:
+            count, key = query.cursor_key(after)
+            if query.descending:
+                condition = or_(book_count < count, and_(book_count == count, BookModel.author_key < key))
+            else:
+                condition = or_(book_count > count, and_(book_count == count, BookModel.author_key > key))
+            statement = statement.having(condition)
+    columns = [book_count, BookModel.author_key] if query.sort == "count" else [BookModel.author_key]
+    statement = statement.order_by(*(column.desc() if query.descending else column for column in columns))
+    return statement.limit(limit) if limit is not None else statement
+
+
+def book_version_statement(book_id: int):
+    """SELECT léger de la version d'un livre."""
+    return select(BookModel.version, BookModel.updated_at).where(BookModel.id == book_id)
+
+
+def collection_version_statement():
+    """SELECT du compteur de modifications de la collection."""
+    return select(CollectionStateModel.version, CollectionStateModel.updated_at).where(
+        CollectionStateModel.id == 1
+    )
+
+
+def patch_statement(book_id: int, changes: dict):
+    """
+    UPDATE ... RETURNING des seuls champs modifiés.
+    Les clés normalisées suivent le titre et l'auteur ; version et updated_at
+    sont incrémentés par les valeurs `onupdate` du modèle.
+    """
+    values = dict(changes)
+    if "title" in changes:
+        values["title_key"] = normalize(changes["title"])
+    if "author" in changes:
+        values["author_key"] = normalize(changes["author"])
+    return update(BookModel).where(BookModel.id == book_id).values(**values).returning(
+        BookModel.id, BookModel.title, BookModel.author, BookModel.year, BookModel.rating
+    )
+
+
+def filter_condition(author: Optional[str] = None, year_min: Optional[int] = None,
+                     year_max: Optional[int] = None):
+    """Condition sur l'auteur (clé normalisée) et l'intervalle d'années (bornes incluses)."""
+    conditions = []
+    if author is not None:
+        conditions.append(BookModel.author_key == normalize(author))
+    if year_min is not None:
+        conditions.append(BookModel.year >= year_min)
+    if year_max is not None:
+        conditions.append(BookModel.year <= year_max)
+    return and_(true(), *conditions)
+
+
+def delete_statement(condition):
+    """DELETE ... RETURNING id des livres qui satisfont `condition`."""
+    return delete(BookModel).where(condition).returning(BookModel.id)
+
+
+def delete_batch_conditions(ids: Optional[Iterable[int]], condition) -> Iterator:
+    """
+    Conditions des DELETE successifs d'une suppression en masse :
+    un lot de KEYS_CHUNK_SIZE IDs, ou les DELETE_BATCH_SIZE premiers livres filtrés
+    (à répéter jusqu'à un lot incomplet).
+    """
+    if ids is not None:
+        ids = list(dict.fromkeys(ids))
+        for start in range(0, len(ids), KEYS_CHUNK_SIZE):
+            yield BookModel.id.in_(ids[start:start + KEYS_CHUNK_SIZE]) & condition
+        return
+    batch = select(BookModel.id).where(condition).order_by(BookModel.id).limit(DELETE_BATCH_SIZE)
+    while True:
+        yield BookModel.id.in_(batch.scalar_subquery())
+
+
+def book_row(book: Book) -> dict:
+    """Paramètres d'INSERT pour un livre, clés normalisées comprises."""
+    title_key, author_key = book.key
+    return {
+        "title": book.title, "author": book.author, "year": book.year, "rating": book.rating,
+        "title_key": title_key, "author_key": author_key,
+    }
+
+
+def book_rows(books: List[Book]) -> List[dict]:
+    """Paramètres d'INSERT pour une liste de livres."""
+    return [book_row(book) for book in books]
 
 
 class SQLAlchemyBookRepository(IBookRepository):
@@ -15,6 +267,22 @@ class SQLAlchemyBookRepository(IBookRepository):
     
     def __init__(self, db: Session):
         self.db = db
+    
+    def _commit(self):
+        """Valide la transaction de l'écriture en cours."""
+        self.db.commit()
+
+    def _rollback(self):
+        """Annule la transaction de l'écriture en cours."""
+        self.db.rollback()
+
+    def _touch_collection(self):
+        """
+        Incrémente le compteur de modifications, dans la transaction en cours, toujours
+        après l'écriture du livre : chaque écriture verrouille la ligne du livre puis
+        celle du compteur, dans le même ordre (sans quoi PostgreSQL peut s'interbloquer).
+        """
+        self.db.execute(touch_collection_statement())
 
     def add(self, book: Book) -> Book:
         """Ajoute un livre à la base de données."""
@@ -25,16 +293,62 @@ class SQLAlchemyBookRepository(IBookRepository):
             rating=book.rating
         )
         self.db.add(db_book)
-        self.db.commit()
+        try:
+            self.db.flush()
+            self._touch_collection()
+            self._commit()
+        except IntegrityError:
+            self._rollback()
+            raise DuplicateBookError(book.title, book.author)
         self.db.refresh(db_book)
         
         book.id = db_book.id
         return book
+    
+    def add_if_absent(self, book: Book) -> Optional[Book]:
+        """Ajoute un livre en une seule requête INSERT ... ON CONFLICT DO NOTHING RETURNING."""
+        statement = insert_ignore_statement(self.db.get_bind().dialect.name)
+        book_id = self.db.execute(statement.values(**book_row(book)).returning(BookModel.id)).scalar()
+        if book_id is None:
+            self._rollback()
+            return None
+        self._touch_collection()
+        self._commit()
+        
+        book.id = book_id
+        return book
+    
+    def add_many(self, books: List[Book]) -> List[Book]:
+        """Ajoute plusieurs livres en un seul INSERT multi-lignes et un seul commit."""
+        if not books:
+            return []
+        statement = insert_ignore_statement(self.db.get_bind().dialect.name).returning(
+            BookModel.id, BookModel.title_key, BookModel.author_key
+        )
+        rows = self.db.execute(statement, book_rows(books)).all()
+        self._touch_collection()
+        self._commit()
+        return assign_inserted_ids(books, rows)
 
     def get_all(self) -> List[Book]:
         """Retourne tous les livres."""
-        db_books = self.db.query(BookModel).all()
-        return [db_book.to_domain() for db_book in db_books]
+        return [book_from_row(row) for row in self.get_all_rows()]
+    
+    def get_page(self, after: Optional[int] = None, limit: int = 100) -> List[Book]:
+        """Retourne une page de livres triés par ID (keyset sur la clé primaire)."""
+        return [book_from_row(row) for row in self.get_page_rows(after, limit)]
+    
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Book]:
+        """
+        Parcourt tous les livres avec un curseur côté serveur (stream_results).
+        Utilise sa propre connexion : le générateur peut être consommé après la
+        fermeture de la session de la requête (StreamingResponse).
+        """
+        statement = rows_statement().order_by(BookModel.id)
+        with self.db.get_bind().connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=batch_size).execute(statement)
+            for row in result:
+                yield book_from_row(row)
     
     def get_by_id(self, book_id: int) -> Optional[Book]:
         """Récupère un livre par son ID."""
@@ -43,30 +357,67 @@ class SQLAlchemyBookRepository(IBookRepository):
     
     def find_by_title(self, search_term: str) -> List[Book]:
         """Trouve des livres par titre."""
+        return [book_from_row(row) for row in self.find_rows_by_title(search_term)]
+
+    def get_all_rows(self, query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Retourne tous les livres sous forme de lignes (ni ORM, ni validation)."""
+        if query is None or query.is_default:
+            return self.db.execute(rows_statement()).all()
+        return self.get_page_rows(limit=None, query=query)
+
+    def get_page_rows(self, after: Optional[BookCursor] = None, limit: Optional[int] = 100,
+                      query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Retourne une page de lignes, filtrées et triées en SQL."""
+        return self.db.execute(page_rows_statement(after, limit, query or DEFAULT_QUERY)).all()
+
+    def find_rows_by_title(self, search_term: str) -> List[BookRow]:
+        """Trouve des lignes par titre."""
         if not search_term:
             return []
         
-        db_books = self.db.query(BookModel).filter(
-            BookModel.title.ilike(f"%{search_term}%")
-        ).all()
-        return [db_book.to_domain() for db_book in db_books]
+        condition = title_search_condition(search_term, has_search_index(self.db.get_bind()))
+        return self.db.execute(rows_statement().where(condition).order_by(BookModel.id)).all()
+
+    def get_authors(self, after: Optional[AuthorCursor] = None, limit: Optional[int] = 100,
+                    query: Optional[AuthorQuery] = None) -> List[AuthorRow]:
+        """Agrégats par auteur, en un seul GROUP BY."""
+        return self.db.execute(authors_statement(after, limit, query or DEFAULT_AUTHOR_QUERY)).all()
 
     def exists(self, title: str, author: str) -> bool:
         """Vérifie si un livre existe déjà."""
-        count = self.db.query(BookModel).filter(
-            BookModel.title.ilike(title),
-            BookModel.author.ilike(author)
-        ).count()
-        return count > 0
+        return self.db.query(BookModel.id).filter(exists_condition(title, author)).first() is not None
+    
+    def existing_keys(self, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """Retourne les clés (titre, auteur) déjà présentes, par requêtes IN ensemblistes."""
+        keys = list(keys)
+        found = set()
+        for start in range(0, len(keys), KEYS_CHUNK_SIZE):
+            rows = self.db.execute(existing_keys_statement(keys[start:start + KEYS_CHUNK_SIZE]))
+            found.update((title, author) for title, author in rows)
+        return found
+    
+    def _delete(self, condition) -> List[int]:
+        """Un DELETE ... RETURNING, dans sa propre transaction."""
+        ids = self.db.execute(delete_statement(condition)).scalars().all()
+        if ids:
+            self._touch_collection()
+        self._commit()
+        return ids
     
     def remove_by_id(self, book_id: int) -> bool:
-        """Supprime un livre par son ID."""
-        db_book = self.db.query(BookModel).filter(BookModel.id == book_id).first()
-        if db_book:
-            self.db.delete(db_book)
-            self.db.commit()
-            return True
-        return False
+        """Supprime un livre par son ID, en une seule requête."""
+        return bool(self._delete(BookModel.id == book_id))
+    
+    def remove_many(self, ids: Optional[Iterable[int]] = None, author: Optional[str] = None,
+                    year_min: Optional[int] = None, year_max: Optional[int] = None) -> List[int]:
+        """Supprime par lots : un DELETE ensembliste et un commit par lot."""
+        removed = []
+        for condition in delete_batch_conditions(ids, filter_condition(author, year_min, year_max)):
+            batch = self._delete(condition)
+            removed.extend(batch)
+            if ids is None and len(batch) < DELETE_BATCH_SIZE:
+                break
+        return removed
     
     def update(self, book: Book) -> Optional[Book]:
         """Met à jour un livre existant."""
@@ -76,11 +427,52 @@ class SQLAlchemyBookRepository(IBookRepository):
             db_book.author = book.author
             db_book.year = book.year
             db_book.rating = book.rating
-            self.db.commit()
+            try:
+                self.db.flush()
+                self._touch_collection()
+                self._commit()
+            except IntegrityError:
+                self._rollback()
+                raise DuplicateBookError(book.title, book.author)
             self.db.refresh(db_book)
             return db_book.to_domain()
         return None
 
+    def patch(self, book_id: int, changes: dict) -> Optional[Book]:
+        """Modifie uniquement les champs fournis, en un seul UPDATE ... RETURNING."""
+        try:
+            row = self.db.execute(patch_statement(book_id, changes)).first()
+            if row is None:
+                self._rollback()
+                return None
+            self._touch_collection()
+            self._commit()
+        except IntegrityError:
+            self._rollback()
+            # Chemin d'erreur uniquement : relit le livre pour un message complet
+            current = self.db.execute(
+                select(BookModel.title, BookModel.author).where(BookModel.id == book_id)
+            ).one_or_none()
+            if current is None:
+                # Supprimé entre-temps : comme un livre introuvable
+                return None
+            raise DuplicateBookError(changes.get("title", current.title), changes.get("author", current.author))
+        return book_from_row(row)
+    
     def count(self) -> int:
         """Retourne le nombre de livres."""
-        return self.db.query(BookModel).count()
\ No newline at end of file
+        return self.db.query(BookModel).count()
+    
+    def get_statistics(self) -> dict:
+        """Calcule les agrégats en une seule requête SQL."""
+        return statistics_from_row(self.db.execute(statistics_statement()).one())
+    
+    def get_book_version(self, book_id: int) -> Optional[Tuple[int, Optional[datetime]]]:
+        """Retourne (version, date de modification) d'un livre, sans le charger."""
+        row = self.db.execute(book_version_statement(book_id)).first()
+        return tuple(row) if row else None
+    
+    def get_collection_version(self) -> Tuple[int, Optional[datetime]]:
+        """Retourne le compteur de modifications de la collection."""
+        row = self.db.execute(collection_version_statement()).first()
+        return tuple(row) if row else (0, None)
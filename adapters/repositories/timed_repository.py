@@ -0,0 +1,89 @@
+"""
+Adapter de mesure pour le repository de livres.
+Décore n'importe quel IBookRepository (ou IAsyncBookRepository) et chronomètre
+chaque méthode du port dans l'histogramme repository_call_duration_seconds.
+"""
+import abc
+import time
+from domain.ports import IAsyncBookRepository, IBookRepository
+from adapters.metrics import REPOSITORY_DURATION
+
+# Méthodes qui retournent un itérateur : on mesure le parcours complet, pas sa création
+ITERATOR_METHODS = {"iter_all"}
+
+
+def described(method, template):
+    """Reprend le nom et la docstring de la méthode du port (sans son marqueur abstrait)."""
+    method.__name__ = template.__name__
+    method.__qualname__ = template.__qualname__
+    method.__doc__ = template.__doc__
+    return method
+
+
+def timed_method(name: str, template):
+    """Méthode déléguant `name` au repository décoré, en mesurant sa durée."""
+    if name in ITERATOR_METHODS:
+        def method(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                yield from getattr(self.repository, name)(*args, **kwargs)
+            finally:
+                REPOSITORY_DURATION.observe(time.perf_counter() - start, (self.label, name))
+        return described(method, template)
+
+    def method(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return getattr(self.repository, name)(*args, **kwargs)
+        finally:
+            REPOSITORY_DURATION.observe(time.perf_counter() - start, (self.label, name))
+    return described(method, template)
+
+
+def timed_async_method(name: str, template):
+    """Version asynchrone de timed_method."""
+    if name in ITERATOR_METHODS:
+        async def method(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                async for item in getattr(self.repository, name)(*args, **kwargs):
+                    yield item
+            finally:
+                REPOSITORY_DURATION.observe(time.perf_counter() - start, (self.label, name))
+        return described(method, template)
+
+    async def method(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await getattr(self.repository, name)(*args, **kwargs)
+        finally:
+            REPOSITORY_DURATION.observe(time.perf_counter() - start, (self.label, name))
+    return described(method, template)
+
+
+def implement_port(cls, port, make_method):
+    """Génère les méthodes abstraites du port sur `cls` (toutes les méthodes, sans oubli)."""
+    for name in port.__abstractmethods__:
+        setattr(cls, name, make_method(name, getattr(port, name)))
+    abc.update_abstractmethods(cls)
+    return cls
+
+
+class TimedBookRepository(IBookRepository):
+    """Décorateur de repository : chaque appel est chronométré, étiqueté par implémentation."""
+
+    def __init__(self, repository: IBookRepository):
+        self.repository = repository
+        self.label = type(repository).__name__
+
+
+class AsyncTimedBookRepository(IAsyncBookRepository):
+    """Décorateur de repository asynchrone chronométré."""
+
+    def __init__(self, repository: IAsyncBookRepository):
+        self.repository = repository
+        self.label = type(repository).__name__
+
+
+implement_port(TimedBookRepository, IBookRepository, timed_method)
+implement_port(AsyncTimedBookRepository, IAsyncBookRepository, timed_async_method)
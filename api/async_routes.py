@@ -0,0 +1,332 @@
+"""
+Routes asynchrones (USE_ASYNC_DB=1).
+Mêmes chemins, schémas et codes d'erreur que api.routes, mais chaque route est
+une coroutine qui attend le service asynchrone : pas de threadpool par requête.
+"""
+import csv
+import io
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from starlette.background import BackgroundTask
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Literal, Optional
+from adapters.database import get_async_db, get_async_engine
+from adapters.pool import pool_status
+from adapters.repositories.async_sqlalchemy_repository import AsyncSQLAlchemyBookRepository
+from adapters.repositories.coalescing_repository import (
+    COALESCING_ENABLED, AsyncCoalescingBookRepository, async_flights
+)
+from adapters.repositories.timed_repository import AsyncTimedBookRepository
+from adapters.metrics import METRICS_ENABLED
+from service.async_book_service import AsyncBookService
+from api.routes import (
+    BULK_OPENAPI, EXPORT_CHUNK_SIZE, EXPORT_FIELDS, author_books_query, author_cursor, authors_query, book_cursor,
+    build_bulk_report, collection_etag, list_query, ndjson_lines, not_modified, parse_author_cursor, parse_book_cursor,
+    parse_bulk_body, row_json, rows_response, update_fields
+)
+from api.schemas import (
+    AuthorResponse, BookCreate, BookUpdate, BookResponse, StatsResponse, BulkImportResponse,
+    BulkDeleteRequest, BulkDeleteResponse, CoalescingStatsResponse, PoolStatsResponse
+)
+from domain.book import BookRow
+from domain.query import AuthorQuery, BookQuery
+from domain.exceptions import (
+    DuplicateBookError, BookNotFoundError, AuthorNotFoundError,
+    YearError, TitleError, AuthorError
+)
+
+router = APIRouter(prefix="/books", tags=["Books"])
+authors_router = APIRouter(prefix="/authors", tags=["Authors"])
+
+
+def get_async_book_service(db=Depends(get_async_db)) -> AsyncBookService:
+    """Injection de dépendances pour le service asynchrone."""
+    repository = AsyncSQLAlchemyBookRepository(db)
+    if METRICS_ENABLED:
+        repository = AsyncTimedBookRepository(repository)
+    if COALESCING_ENABLED:
+        repository = AsyncCoalescingBookRepository(repository, async_flights)
+    return AsyncBookService(repository)
+
+
+@router.post("/", response_model=BookResponse, status_code=status.HTTP_201_CREATED)
+async def create_book(
+    book: BookCreate,
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Crée un nouveau livre."""
+    try:
+        return await service.create_book(book.title, book.author, book.year, book.rating)
+    except DuplicateBookError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except (YearError, TitleError, AuthorError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/bulk", response_model=BulkImportResponse, openapi_extra=BULK_OPENAPI)
+async def create_books_bulk(
+    request: Request,
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Importe des livres en masse (tableau JSON, NDJSON ou CSV)."""
+    rows = parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+    valid = [data for _, data in rows if isinstance(data, dict)]
+    outcomes = await service.create_books(valid)
+    return build_bulk_report(rows, outcomes)
+
+
+async def stream_books_json(service: AsyncBookService, query: BookQuery) -> AsyncIterator[bytes]:
+    """Génère un tableau JSON livre par livre, page par page."""
+    yield b"["
+    first = True
+    async for row in service.iter_rows(query):
+        if not first:
+            yield b","
+        first = False
+        yield row_json(row)
+    yield b"]"
+
+
+@router.get("/", response_model=List[BookResponse])
+async def list_books(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Taille de la page"),
+    after: Optional[str] = Query(None, min_length=1, description="Curseur : en-tête X-Next-Cursor de la page précédente"),
+    stream: bool = Query(False, description="Diffuse toute la liste en continu"),
+    query: BookQuery = Depends(list_query),
+    db: AsyncSession = Depends(get_async_db),
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Liste les livres, filtrés et triés (pagination par curseur `limit`/`after`, ou `stream`)."""
+    version, updated_at = await service.get_collection_version()
+    cached = not_modified(request, response, collection_etag("books", version, request), updated_at)
+    if cached:
+        return cached
+    if stream:
+        return StreamingResponse(
+            stream_books_json(service, query), media_type="application/json", headers=dict(response.headers),
+            # La session de la requête est fermée avant l'envoi du corps : les pages lues
+            # pendant le flux rouvrent une connexion, rendue au pool une fois le flux terminé
+            background=BackgroundTask(db.close)
+        )
+    if limit is None and after is None:
+        return rows_response(await service.list_all_rows(query), response)
+
+    page_size = limit or 100
+    rows = await service.list_rows_page(after=parse_book_cursor(after, query), limit=page_size, query=query)
+    if len(rows) == page_size:
+        response.headers["X-Next-Cursor"] = book_cursor(query, rows[-1])
+    return rows_response(rows, response)
+
+
+@router.get("/search", response_model=List[BookResponse])
+async def search_books(
+    q: str,
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Recherche des livres par titre."""
+    return rows_response(await service.search_rows(q))
+
+
+async def export_ndjson(rows: AsyncIterator[BookRow]) -> AsyncIterator[bytes]:
+    """Sérialise les lignes en NDJSON, par paquets de lignes."""
+    chunk = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) == EXPORT_CHUNK_SIZE:
+            yield ndjson_lines(chunk)
+            chunk = []
+    if chunk:
+        yield ndjson_lines(chunk)
+
+
+async def export_csv(rows: AsyncIterator[BookRow]) -> AsyncIterator[str]:
+    """Sérialise les lignes en CSV (avec en-tête), par paquets de lignes."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    count = 0
+    async for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+EXPORT_FORMATS = {
+    "ndjson": (export_ndjson, "application/x-ndjson"),
+    "csv": (export_csv, "text/csv; charset=utf-8"),
+}
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_books(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Format d'export"),
+    db: AsyncSession = Depends(get_async_db),
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Exporte toute la bibliothèque en flux continu (NDJSON ou CSV)."""
+    serializer, media_type = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        serializer(service.export_books()),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="books.{format}"'},
+        # Pages lues pendant le flux : connexion rendue au pool une fois le flux terminé (voir list_books)
+        background=BackgroundTask(db.close)
+    )
+
+
+@router.get("/stats", response_model=StatsResponse)
+async def get_stats(
+    request: Request,
+    response: Response,
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Retourne des statistiques sur la bibliothèque (304 si inchangées)."""
+    version, updated_at = await service.get_collection_version()
+    cached = not_modified(request, response, collection_etag("stats", version, request), updated_at)
+    if cached:
+        return cached
+    return await service.get_statistics()
+
+
+@router.get("/coalescing/stats", response_model=CoalescingStatsResponse)
+async def get_coalescing_stats():
+    """Retourne les compteurs de regroupement des lectures simultanées."""
+    return {"enabled": COALESCING_ENABLED, "methods": async_flights.stats()}
+
+
+@router.get("/pool/stats", response_model=PoolStatsResponse)
+async def get_pool_stats():
+    """Retourne l'état du pool de connexions asynchrone."""
+    return pool_status(get_async_engine().sync_engine)
+
+
+@router.get("/{book_id}", response_model=BookResponse)
+async def get_book(
+    book_id: int,
+    request: Request,
+    response: Response,
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Récupère un livre par son ID (304 si inchangé)."""
+    book_version = await service.get_book_version(book_id)
+    if book_version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(BookNotFoundError(f"ID {book_id}")))
+    version, updated_at = book_version
+    cached = not_modified(request, response, f'W/"book-{book_id}-{version}"', updated_at)
+    if cached:
+        return cached
+    try:
+        return await service.get_book_by_id(book_id)
+    except BookNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.put("/{book_id}", response_model=BookResponse)
+async def update_book(
+    book_id: int,
+    book: BookUpdate,
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Met à jour un livre existant."""
+    try:
+        return await service.update_book(book_id, **update_fields(book))
+    except BookNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except DuplicateBookError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except (YearError, TitleError, AuthorError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.patch("/{book_id}", response_model=BookResponse)
+async def patch_book(
+    book_id: int,
+    book: BookUpdate,
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Modifie partiellement un livre : seuls les champs envoyés sont modifiés."""
+    try:
+        return await service.patch_book(book_id, book.model_dump(exclude_unset=True))
+    except BookNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except DuplicateBookError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except (YearError, TitleError, AuthorError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.delete("/", response_model=BulkDeleteResponse)
+async def delete_books(
+    criteria: BulkDeleteRequest,
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Supprime en masse les livres correspondant à tous les critères fournis."""
+    try:
+        deleted = await service.delete_books(**criteria.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"deleted": deleted}
+
+
+@router.delete("/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_book(
+    book_id: int,
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Supprime un livre par son ID."""
+    try:
+        await service.delete_book(book_id)
+    except BookNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@authors_router.get("/", response_model=List[AuthorResponse])
+async def list_authors(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000, description="Taille de la page"),
+    after: Optional[str] = Query(None, min_length=1, description="Curseur : en-tête X-Next-Cursor de la page précédente"),
+    query: AuthorQuery = Depends(authors_query),
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Liste les auteurs avec leur nombre de livres et leur note moyenne (tri `name` ou `count`)."""
+    version, updated_at = await service.get_collection_version()
+    cached = not_modified(request, response, collection_etag("authors", version, request), updated_at)
+    if cached:
+        return cached
+    authors = await service.list_authors(after=parse_author_cursor(after, query), limit=limit, query=query)
+    if len(authors) == limit:
+        response.headers["X-Next-Cursor"] = author_cursor(query, authors[-1])
+    return authors
+
+
+@authors_router.get("/{name}/books", response_model=List[BookResponse])
+async def list_author_books(
+    name: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000, description="Taille de la page"),
+    after: Optional[str] = Query(None, min_length=1, description="Curseur : en-tête X-Next-Cursor de la page précédente"),
+    query: BookQuery = Depends(author_books_query),
+    service: AsyncBookService = Depends(get_async_book_service)
+):
+    """Liste les livres d'un auteur (casse et espaces autour ignorés), par année par défaut."""
+    version, updated_at = await service.get_collection_version()
+    cached = not_modified(request, response, collection_etag("author-books", version, request), updated_at)
+    if cached:
+        return cached
+    try:
+        rows = await service.list_author_rows(
+            name, after=parse_book_cursor(after, query), limit=limit, query=query
+        )
+    except AuthorNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = book_cursor(query, rows[-1])
+    return rows_response(rows, response)
@@ -0,0 +1,208 @@
+"""
+Compression des réponses négociée par Accept-Encoding : brotli (si le paquet
+`brotli` est installé) ou gzip. Middleware ASGI : les réponses diffusées sont
+compressées au fil de l'eau, les petits corps partent tels quels.
+"""
+import os
+import zlib
+from typing import List, Optional
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # dépendance optionnelle : gzip seul
+    brotli = None
+
+
+# Configuration par variables d'environnement
+COMPRESSION_ENABLED = os.environ.get("COMPRESSION_ENABLED", "0") == "1"
+# En dessous (un paquet réseau environ), compresser ne réduit pas le nombre de paquets
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1400"))
+# Niveaux modérés : sur du JSON, l'essentiel du gain pour une fraction du coût CPU
+GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "4"))
+
+# Un flux est compressé et vidé vers le client (Z_SYNC_FLUSH) par blocs de cette taille
+FLUSH_SIZE = 16 * 1024
+# Blocs compressés dans un thread (zlib et brotli libèrent le GIL) pour ne pas bloquer la boucle
+OFFLOAD_SIZE = 256 * 1024
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/xml", "application/javascript", "text/",
+)
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int = GZIP_LEVEL):
+        # wbits=31 : en-tête et somme de contrôle gzip
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, quality: int = BROTLI_QUALITY):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def available_encodings() -> List[str]:
+    """Encodages proposés, par ordre de préférence à qualité égale."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate(accept_encoding: str, encodings: Optional[List[str]] = None) -> Optional[str]:
+    """Encodage retenu pour un en-tête Accept-Encoding (valeurs q comprises), ou None."""
+    encodings = encodings if encodings is not None else available_encodings()
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        token, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if token:
+            weights[token.strip()] = quality
+    wildcard = weights.get("*", 0.0)
+    candidates = [(weights.get(name, wildcard), -rank, name) for rank, name in enumerate(encodings)]
+    quality, _, name = max(candidates)
+    return name if quality > 0 else None
+
+
+def make_encoder(name: str, gzip_level: int = GZIP_LEVEL, brotli_quality: int = BROTLI_QUALITY):
+    return BrotliEncoder(brotli_quality) if name == "br" else GzipEncoder(gzip_level)
+
+
+def is_compressible(headers: Headers, status: int) -> bool:
+    """Réponse avec un corps textuel, pas déjà encodée."""
+    if status < 200 or status in (204, 304) or "content-encoding" in headers:
+        return False
+    return headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI de compression.
+
+    Les premiers blocs du corps sont retenus jusqu'à `minimum_size` octets : un corps
+    plus petit part non compressé. Un corps complet est compressé d'un bloc ; un flux
+    l'est par blocs de FLUSH_SIZE octets, chacun vidé vers le client (Z_SYNC_FLUSH)
+    sans attendre la fin de la réponse.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE, gzip_level: int = GZIP_LEVEL,
+                 brotli_quality: int = BROTLI_QUALITY):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(send, encoding, self)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    """État de compression d'une réponse."""
+
+    def __init__(self, send, encoding: str, middleware: CompressionMiddleware):
+        self._send = send
+        self.encoding = encoding
+        self.middleware = middleware
+        self.start_message = None
+        # Pas d'encodeur : décision en attente (corps retenu dans `pending`)
+        self.encoder = None
+        # Réponse non compressible : transmise telle quelle
+        self.passthrough = False
+        # Corps reçu, pas encore compressé
+        self.pending: List[bytes] = []
+        self.pending_size = 0
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            if not is_compressible(headers, message["status"]):
+                self.passthrough = True
+                await self._send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+        self.pending.append(body)
+        self.pending_size += len(body)
+        if self.encoder is None:
+            if self.pending_size < self.middleware.minimum_size:
+                if more_body:
+                    return
+                # Petit corps : envoyé tel quel
+                await self._send_start(compressed=False)
+                await self._send({"type": "http.response.body", "body": self._take()})
+                return
+            self.encoder = make_encoder(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            if not more_body:
+                # Corps complet : compressé d'un bloc, avec sa longueur
+                data = await self._compress(self._take()) + self.encoder.finish()
+                await self._send_start(compressed=True, content_length=len(data))
+                await self._send({"type": "http.response.body", "body": data})
+                return
+            await self._send_start(compressed=True)
+
+        # Flux : les petits blocs (un livre chacun) sont regroupés avant compression
+        if more_body and self.pending_size < FLUSH_SIZE:
+            return
+        data = await self._compress(self._take())
+        data += self.encoder.flush() if more_body else self.encoder.finish()
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _take(self) -> bytes:
+        data, self.pending, self.pending_size = b"".join(self.pending), [], 0
+        return data
+
+    async def _compress(self, data: bytes) -> bytes:
+        if len(data) >= OFFLOAD_SIZE:
+            return await anyio.to_thread.run_sync(self.encoder.compress, data)
+        return self.encoder.compress(data)
+
+    async def _send_start(self, compressed: bool, content_length: Optional[int] = None):
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if compressed:
+            headers["Content-Encoding"] = self.encoding
+            if content_length is not None:
+                headers["Content-Length"] = str(content_length)
+            elif "content-length" in headers:
+                del headers["content-length"]
+        await self._send(self.start_message)
@@ -0,0 +1,61 @@
+"""
+Instrumentation HTTP : middleware ASGI et route /metrics (format texte Prometheus).
+"""
+import time
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from adapters.metrics import (
+    HTTP_DURATION, HTTP_IN_FLIGHT, HTTP_REQUESTS, REQUEST_DB_SECONDS, REQUEST_QUERIES,
+    RequestQueries, current_request_queries, registry
+)
+
+router = APIRouter(tags=["Metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI : latence par route, requêtes en cours, et nombre/durée des
+    requêtes SQL de chaque requête HTTP (flux compris, jusqu'au dernier octet).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        queries = RequestQueries()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = current_request_queries.set(queries)
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            current_request_queries.reset(token)
+            # Gabarit de la route (ex. /books/{book_id}) : cardinalité bornée
+            route = scope.get("route")
+            labels = (scope["method"], route.path if route is not None else "<unmatched>")
+            HTTP_REQUESTS.inc(labels + (str(status_code),))
+            HTTP_DURATION.observe(elapsed, labels)
+            REQUEST_QUERIES.observe(queries.count, labels)
+            REQUEST_DB_SECONDS.observe(queries.seconds, labels)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Exporte les métriques au format texte Prometheus."""
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
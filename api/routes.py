@@ -1,21 +1,89 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+import io
+import json
+import zlib
+import orjson
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from starlette.background import BackgroundTask
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from adapters.database import get_db
+from typing import Iterator, List, Literal, Optional, Tuple
+from adapters.database import engine, get_db
+from adapters.pool import pool_status
 from adapters.repositories.sqlalchemy_repository import SQLAlchemyBookRepository  
+from adapters.repositories.caching_repository import CACHE_ENABLED, CachingBookRepository, book_cache
+from adapters.repositories.batching_repository import BATCHING_ENABLED, BatchingBookRepository, write_batcher
+from adapters.repositories.coalescing_repository import COALESCING_ENABLED, CoalescingBookRepository, flights
+from adapters.repositories.timed_repository import TimedBookRepository
+from adapters.metrics import METRICS_ENABLED
 from service.book_service import BookService
-from api.schemas import BookCreate, BookUpdate, BookResponse, StatsResponse
+from api.schemas import (
+    AuthorResponse, BookCreate, BookUpdate, BookResponse, StatsResponse, BulkImportResponse,
+    BatchingStatsResponse, BulkDeleteRequest, BulkDeleteResponse, CacheStatsResponse, CoalescingStatsResponse, PoolStatsResponse
+)
+from domain.book import BOOK_FIELDS, BookRow
+from domain.query import AUTHOR_SORT_FIELDS, SORT_FIELDS, AuthorCursor, AuthorQuery, BookCursor, BookQuery
 from domain.exceptions import (
-    DuplicateBookError, BookNotFoundError, 
+    DuplicateBookError, BookNotFoundError, AuthorNotFoundError,
     YearError, TitleError, AuthorError
 )
 
 router = APIRouter(prefix="/books", tags=["Books"])
+authors_router = APIRouter(prefix="/authors", tags=["Authors"])
+
+
+# --- GET conditionnels (ETag / Last-Modified) ---
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparaison faible d'un ETag avec l'en-tête If-None-Match."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified(request: Request, response: Response, etag: str,
+                 last_modified: Optional[datetime]) -> Optional[Response]:
+    """
+    Ajoute ETag / Last-Modified à la réponse.
+    Retourne une réponse 304 si le client possède déjà cette version, sinon None.
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def collection_etag(kind: str, version: int, request: Request) -> str:
+    """ETag d'une vue de la collection : compteur de modifications + paramètres de la requête."""
+    return f'W/"{kind}-{version}-{zlib.crc32(request.url.query.encode()):08x}"'
 
 
 def get_book_service(db: Session = Depends(get_db)) -> BookService:
     """Injection de dépendances pour le service."""
     repository = SQLAlchemyBookRepository(db)
+    if BATCHING_ENABLED:
+        # Écritures unitaires regroupées par transaction (file d'écritures du moteur)
+        repository = BatchingBookRepository(repository)
+    if METRICS_ENABLED:
+        # Au plus près de la base : les succès du cache ne sont pas comptés
+        repository = TimedBookRepository(repository)
+    if CACHE_ENABLED:
+        repository = CachingBookRepository(repository, book_cache)
+    if COALESCING_ENABLED:
+        # En dernier : des échecs de cache simultanés ne font qu'une requête
+        repository = CoalescingBookRepository(repository, flights)
     return BookService(repository)
 
 
@@ -40,10 +108,227 @@ def create_book(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+def parse_bulk_body(body: bytes, content_type: str) -> List[Tuple[int, object]]:
+    """
+    Découpe le corps d'un import en masse en lignes (numéro, données).
+    Formats acceptés : tableau JSON, NDJSON (un objet par ligne) et CSV avec en-tête.
+    Une ligne illisible est conservée sous forme d'exception pour être rejetée.
+    """
+    media_type = content_type.split(";")[0].strip().lower()
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Le corps doit être encodé en UTF-8")
+    
+    if media_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        rows = []
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                rows.append((line_number, json.loads(line)))
+            except ValueError as e:
+                rows.append((line_number, e))
+        return rows
+    
+    if media_type == "text/csv":
+        reader = csv.DictReader(io.StringIO(text))
+        rows = []
+        for row in reader:
+            try:
+                data = {
+                    "title": row.get("title"),
+                    "author": row.get("author"),
+                    "year": int(row["year"]) if row.get("year") else None,
+                    "rating": int(row["rating"]) if row.get("rating") else None,
+                }
+            except ValueError as e:
+                rows.append((reader.line_num, e))
+                continue
+            rows.append((reader.line_num, data))
+        return rows
+    
+    if media_type in ("application/json", ""):
+        try:
+            items = json.loads(text)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="JSON invalide")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Un tableau JSON est attendu")
+        return list(enumerate(items, start=1))
+    
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail=f"Format non supporté: {media_type}"
+    )
+
+
+def build_bulk_report(rows: List[Tuple[int, object]], outcomes: List[dict]) -> dict:
+    """Fusionne les rejets de lecture et les résultats du service, ligne par ligne."""
+    outcomes = iter(outcomes)
+    report = []
+    for line, data in rows:
+        if isinstance(data, dict):
+            result = next(outcomes)
+        else:
+            error = str(data) if isinstance(data, Exception) else "Un objet est attendu"
+            result = {"status": "rejected", "error": error}
+        report.append({"line": line, **result})
+    accepted = sum(1 for row in report if row["status"] == "accepted")
+    return {"accepted": accepted, "rejected": len(report) - accepted, "results": report}
+
+
+BULK_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": {"type": "array", "items": BookCreate.model_json_schema()}},
+            "application/x-ndjson": {"schema": {"type": "string"}},
+            "text/csv": {"schema": {"type": "string"}},
+        },
+    }
+}
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkImportResponse,
+    openapi_extra=BULK_OPENAPI,
+)
+async def create_books_bulk(
+    request: Request,
+    service: BookService = Depends(get_book_service)
+):
+    """
+    Importe des livres en masse.
+    
+    Accepte un tableau JSON, du NDJSON (`application/x-ndjson`) ou du CSV
+    (`text/csv`, colonnes title,author,year,rating). Chaque ligne est validée
+    individuellement ; la réponse indique les lignes acceptées et rejetées.
+    """
+    rows = parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+    valid = [data for _, data in rows if isinstance(data, dict)]
+    outcomes = await run_in_threadpool(service.create_books, valid)
+    return build_bulk_report(rows, outcomes)
+
+
+def rows_response(rows: List[BookRow], response: Optional[Response] = None) -> ORJSONResponse:
+    """
+    Sérialise des lignes (id, title, author, year, rating) directement avec orjson :
+    ni Book, ni validation pydantic. Même forme que List[BookResponse], qui reste
+    déclaré en response_model pour la documentation OpenAPI.
+    """
+    headers = dict(response.headers) if response is not None else None
+    return ORJSONResponse([dict(zip(BOOK_FIELDS, row)) for row in rows], headers=headers)
+
+
+def row_json(row: BookRow) -> bytes:
+    """Un livre en JSON (orjson), depuis sa ligne."""
+    return orjson.dumps(dict(zip(BOOK_FIELDS, row)))
+
+
+def stream_books_json(service: BookService, query: BookQuery) -> Iterator[bytes]:
+    """Génère un tableau JSON livre par livre, page par page."""
+    yield b"["
+    first = True
+    for row in service.iter_rows(query):
+        if not first:
+            yield b","
+        first = False
+        yield row_json(row)
+    yield b"]"
+
+
+def list_query(
+    author: Optional[str] = Query(None, min_length=1, description="Auteur exact (casse et espaces autour ignorés)"),
+    year_min: Optional[int] = Query(None, description="Année minimale (incluse)"),
+    year_max: Optional[int] = Query(None, description="Année maximale (incluse)"),
+    rating_min: Optional[int] = Query(None, ge=1, le=5, description="Note minimale"),
+    sort: Literal[SORT_FIELDS] = Query("id", description="Champ de tri"),
+    order: Literal["asc", "desc"] = Query("asc", description="Ordre de tri"),
+) -> BookQuery:
+    """Filtres et tri de la liste, traduits en WHERE / ORDER BY par le repository."""
+    return BookQuery(author=author, year_min=year_min, year_max=year_max, rating_min=rating_min,
+                     sort=sort, descending=order == "desc")
+
+
+# Type de la valeur triée d'un curseur, par champ de tri
+CURSOR_VALUE_TYPES = {"title": str, "author": str, "year": int, "rating": int}
+
+
+def book_cursor(query: BookQuery, row: BookRow) -> str:
+    """
+    Curseur de la page suivante (en-tête X-Next-Cursor) : l'ID du dernier livre pour
+    un tri par ID, sinon sa clé de tri [valeur, id] en JSON, encodée pour l'URL.
+    """
+    cursor = query.cursor(row)
+    return str(cursor) if query.sort == "id" else quote(orjson.dumps(cursor).decode(), safe="")
+
+
+def parse_book_cursor(after: Optional[str], query: BookQuery) -> Optional[BookCursor]:
+    """Curseur reçu dans `after` (voir book_cursor) ; 400 s'il ne correspond pas au tri demandé."""
+    if after is None:
+        return None
+    try:
+        if query.sort == "id":
+            cursor = int(after)
+            valid = cursor >= 0
+        else:
+            value, book_id = orjson.loads(after)
+            cursor = (value, book_id)
+            valid = type(value) is CURSOR_VALUE_TYPES[query.sort] and type(book_id) is int
+    except (ValueError, TypeError):
+        valid = False
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Curseur invalide pour un tri sur '{query.sort}'"
+        )
+    return cursor
+
+
 @router.get("/", response_model=List[BookResponse])
-def list_books(service: BookService = Depends(get_book_service)):
-    """Liste tous les livres de la bibliothèque."""
-    return service.list_all_books()
+def list_books(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Taille de la page"),
+    after: Optional[str] = Query(None, min_length=1, description="Curseur : en-tête X-Next-Cursor de la page précédente"),
+    stream: bool = Query(False, description="Diffuse toute la liste en continu"),
+    query: BookQuery = Depends(list_query),
+    db: Session = Depends(get_db),
+    service: BookService = Depends(get_book_service)
+):
+    """
+    Liste les livres de la bibliothèque.
+    
+    - **author**, **year_min**, **year_max**, **rating_min**: Filtres (combinés par ET)
+    - **sort**, **order**: Tri (`id` croissant par défaut ; sans note = 0)
+    - **limit**: Taille de la page (pagination par curseur sur la clé de tri)
+    - **after**: Curseur de la page précédente (`X-Next-Cursor`) : ID du dernier livre
+      pour un tri par ID, sinon `[valeur, id]` en JSON
+    - **stream**: Diffuse toute la liste sans la charger en mémoire
+    
+    En mode paginé, l'en-tête `X-Next-Cursor` contient le curseur de la page suivante.
+    Répond 304 si l'ETag envoyé dans `If-None-Match` est toujours valide.
+    """
+    version, updated_at = service.get_collection_version()
+    cached = not_modified(request, response, collection_etag("books", version, request), updated_at)
+    if cached:
+        return cached
+    if stream:
+        return StreamingResponse(
+            stream_books_json(service, query), media_type="application/json", headers=dict(response.headers),
+            # La session de la requête est fermée avant l'envoi du corps : les pages lues
+            # pendant le flux rouvrent une connexion, rendue au pool une fois le flux terminé
+            background=BackgroundTask(db.close)
+        )
+    if limit is None and after is None:
+        return rows_response(service.list_all_rows(query), response)
+    
+    page_size = limit or 100
+    rows = service.list_rows_page(after=parse_book_cursor(after, query), limit=page_size, query=query)
+    if len(rows) == page_size:
+        response.headers["X-Next-Cursor"] = book_cursor(query, rows[-1])
+    return rows_response(rows, response)
 
 
 @router.get("/search", response_model=List[BookResponse])
@@ -56,31 +341,149 @@ def search_books(
     
     - **q**: Terme de recherche (recherche partielle, insensible à la casse)
     """
-    return service.search_books(q)
+    return rows_response(service.search_rows(q))
+
+
+EXPORT_FIELDS = list(BOOK_FIELDS)
+EXPORT_CHUNK_SIZE = 500
+
+
+def ndjson_lines(rows: List[BookRow]) -> bytes:
+    """Un paquet de lignes NDJSON (orjson, comme row_json)."""
+    return b"".join(row_json(row) + b"\n" for row in rows)
+
+
+def export_ndjson(rows: Iterator[BookRow]) -> Iterator[bytes]:
+    """Sérialise les lignes en NDJSON, par paquets de lignes."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == EXPORT_CHUNK_SIZE:
+            yield ndjson_lines(chunk)
+            chunk = []
+    if chunk:
+        yield ndjson_lines(chunk)
+
+
+def export_csv(rows: Iterator[BookRow]) -> Iterator[str]:
+    """Sérialise les lignes en CSV (avec en-tête), par paquets de lignes."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+EXPORT_FORMATS = {
+    "ndjson": (export_ndjson, "application/x-ndjson"),
+    "csv": (export_csv, "text/csv; charset=utf-8"),
+}
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_books(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Format d'export"),
+    db: Session = Depends(get_db),
+    service: BookService = Depends(get_book_service)
+):
+    """
+    Exporte toute la bibliothèque en flux continu.
+    
+    - **format**: `ndjson` (un livre JSON par ligne) ou `csv`
+    
+    Les livres sont lus en lignes, page par page (keyset), et sérialisés avec orjson :
+    la mémoire reste bornée quelle que soit la taille du catalogue.
+    """
+    serializer, media_type = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        serializer(service.export_books()),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="books.{format}"'},
+        # Pages lues pendant le flux : connexion rendue au pool une fois le flux terminé (voir list_books)
+        background=BackgroundTask(db.close)
+    )
 
 
 @router.get("/stats", response_model=StatsResponse)
-def get_stats(service: BookService = Depends(get_book_service)):
-    """Retourne des statistiques sur la bibliothèque."""
+def get_stats(
+    request: Request,
+    response: Response,
+    service: BookService = Depends(get_book_service)
+):
+    """Retourne des statistiques sur la bibliothèque (304 si inchangées)."""
+    version, updated_at = service.get_collection_version()
+    cached = not_modified(request, response, collection_etag("stats", version, request), updated_at)
+    if cached:
+        return cached
     return service.get_statistics()
 
 
+@router.get("/cache/stats", response_model=CacheStatsResponse)
+def get_cache_stats():
+    """Retourne les compteurs du cache de lecture (BOOK_CACHE_ENABLED=1)."""
+    return {"enabled": CACHE_ENABLED, "caches": book_cache.stats()}
+
+
+@router.get("/coalescing/stats", response_model=CoalescingStatsResponse)
+def get_coalescing_stats():
+    """Retourne les compteurs de regroupement des lectures simultanées (BOOK_COALESCING_ENABLED)."""
+    return {"enabled": COALESCING_ENABLED, "methods": flights.stats()}
+
+
+@router.get("/batching/stats", response_model=BatchingStatsResponse)
+def get_batching_stats():
+    """Retourne les compteurs du regroupement des écritures (BOOK_WRITE_BATCHING_ENABLED=1)."""
+    return {"enabled": BATCHING_ENABLED, **write_batcher(engine).stats()}
+
+
+@router.get("/pool/stats", response_model=PoolStatsResponse)
+def get_pool_stats():
+    """Retourne l'état du pool de connexions (connexions prises, surplus, attentes)."""
+    return pool_status(engine)
+
+
 @router.get("/{book_id}", response_model=BookResponse)
 def get_book(
     book_id: int,
+    request: Request,
+    response: Response,
     service: BookService = Depends(get_book_service)
 ):
     """
     Récupère un livre par son ID.
     
     - **book_id**: ID du livre
+    
+    Répond 304 si l'ETag envoyé dans `If-None-Match` est toujours valide.
     """
+    book_version = service.get_book_version(book_id)
+    if book_version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(BookNotFoundError(f"ID {book_id}")))
+    version, updated_at = book_version
+    cached = not_modified(request, response, f'W/"book-{book_id}-{version}"', updated_at)
+    if cached:
+        return cached
     try:
         return service.get_book_by_id(book_id)
     except BookNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
+def update_fields(book: BookUpdate) -> dict:
+    """Champs à modifier ; les chaînes vides et valeurs nulles sont ignorées."""
+    return {
+        "title": book.title if book.title and book.title.strip() else None,
+        "author": book.author if book.author and book.author.strip() else None,
+        "year": book.year if book.year else None,
+        "rating": book.rating if book.rating else None,
+    }
+
+
 @router.put("/{book_id}", response_model=BookResponse)
 def update_book(
     book_id: int,
@@ -96,18 +499,54 @@ def update_book(
     - **year**: Nouvelle année
     """
     try:
-        # convertir les string vide en None
-        title = book.title if book.title and book.title.strip() else None
-        author = book.author if book.author and book.author.strip() else None
-        year = book.year if book.year else None
-        rating = book.rating if book.rating else None
-        return service.update_book(book_id, title, author, year, rating)
+        return service.update_book(book_id, **update_fields(book))
+    except BookNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except DuplicateBookError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except (YearError, TitleError, AuthorError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.patch("/{book_id}", response_model=BookResponse)
+def patch_book(
+    book_id: int,
+    book: BookUpdate,
+    service: BookService = Depends(get_book_service)
+):
+    """
+    Modifie partiellement un livre : seuls les champs envoyés sont modifiés.
+    
+    - **rating**: `null` efface la note
+    """
+    try:
+        return service.patch_book(book_id, book.model_dump(exclude_unset=True))
     except BookNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except DuplicateBookError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except (YearError, TitleError, AuthorError) as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.delete("/", response_model=BulkDeleteResponse)
+def delete_books(
+    criteria: BulkDeleteRequest,
+    service: BookService = Depends(get_book_service)
+):
+    """
+    Supprime en masse les livres correspondant à tous les critères fournis.
+    
+    - **ids**: liste d'IDs
+    - **author**, **year_min**, **year_max**: filtre
+    """
+    try:
+        deleted = service.delete_books(**criteria.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"deleted": deleted}
+
+
 @router.delete("/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_book(
     book_id: int,
@@ -122,3 +561,102 @@ def delete_book(
         service.delete_book(book_id)
     except BookNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+# --- Auteurs ---
+
+def authors_query(
+    sort: Literal[AUTHOR_SORT_FIELDS] = Query("name", description="Tri par nom ou par nombre de livres"),
+    order: Literal["asc", "desc"] = Query("asc", description="Ordre de tri"),
+) -> AuthorQuery:
+    """Tri de la liste des auteurs, traduit en ORDER BY par le repository."""
+    return AuthorQuery(sort=sort, descending=order == "desc")
+
+
+def author_books_query(
+    sort: Literal[SORT_FIELDS] = Query("year", description="Champ de tri"),
+    order: Literal["asc", "desc"] = Query("asc", description="Ordre de tri"),
+) -> BookQuery:
+    """Tri des livres d'un auteur (par année par défaut)."""
+    return BookQuery(sort=sort, descending=order == "desc")
+
+
+def author_cursor(query: AuthorQuery, author: dict) -> str:
+    """
+    Curseur de la page d'auteurs suivante, encodé pour l'URL (et l'en-tête HTTP) : le nom
+    du dernier auteur pour un tri par nom, sinon [nombre de livres, nom] en JSON.
+    """
+    if query.sort == "name":
+        return quote(author["name"], safe="")
+    return quote(orjson.dumps([author["book_count"], author["name"]]).decode(), safe="")
+
+
+def parse_author_cursor(after: Optional[str], query: AuthorQuery) -> Optional[AuthorCursor]:
+    """Curseur reçu dans `after` (voir author_cursor) ; 400 s'il ne correspond pas au tri demandé."""
+    if after is None or query.sort == "name":
+        return after
+    try:
+        count, name = orjson.loads(after)
+        valid = type(count) is int and type(name) is str
+    except (ValueError, TypeError):
+        valid = False
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Curseur invalide pour un tri sur '{query.sort}'"
+        )
+    return count, name
+
+
+@authors_router.get("/", response_model=List[AuthorResponse])
+def list_authors(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000, description="Taille de la page"),
+    after: Optional[str] = Query(None, min_length=1, description="Curseur : en-tête X-Next-Cursor de la page précédente"),
+    query: AuthorQuery = Depends(authors_query),
+    service: BookService = Depends(get_book_service)
+):
+    """
+    Liste les auteurs avec leur nombre de livres et leur note moyenne.
+    
+    Les graphies d'un même auteur (casse, espaces autour) sont regroupées.
+    
+    - **sort**, **order**: Tri par `name` (défaut) ou par `count` (nombre de livres)
+    - **limit**, **after**: Pagination par curseur ; `X-Next-Cursor` contient le curseur suivant
+    """
+    version, updated_at = service.get_collection_version()
+    cached = not_modified(request, response, collection_etag("authors", version, request), updated_at)
+    if cached:
+        return cached
+    authors = service.list_authors(after=parse_author_cursor(after, query), limit=limit, query=query)
+    if len(authors) == limit:
+        response.headers["X-Next-Cursor"] = author_cursor(query, authors[-1])
+    return authors
+
+
+@authors_router.get("/{name}/books", response_model=List[BookResponse])
+def list_author_books(
+    name: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000, description="Taille de la page"),
+    after: Optional[str] = Query(None, min_length=1, description="Curseur : en-tête X-Next-Cursor de la page précédente"),
+    query: BookQuery = Depends(author_books_query),
+    service: BookService = Depends(get_book_service)
+):
+    """
+    Liste les livres d'un auteur (casse et espaces autour ignorés), par année par défaut.
+    
+    - **limit**, **after**: Pagination par curseur ; `X-Next-Cursor` contient le curseur suivant
+    """
+    version, updated_at = service.get_collection_version()
+    cached = not_modified(request, response, collection_etag("author-books", version, request), updated_at)
+    if cached:
+        return cached
+    try:
+        rows = service.list_author_rows(name, after=parse_book_cursor(after, query), limit=limit, query=query)
+    except AuthorNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = book_cursor(query, rows[-1])
+    return rows_response(rows, response)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 
 class BookCreate(BaseModel):
     """Schéma pour créer un livre."""
@@ -48,3 +48,91 @@ class StatsResponse(BaseModel):
     total: int
     oldest: Optional[int] = None
     newest: Optional[int] = None
+    average_rating: Optional[float] = None
+    rating_distribution: Dict[int, int] = Field(default_factory=dict, description="Nombre de livres par note")
+
+
+class AuthorResponse(BaseModel):
+    """Schéma de réponse pour un auteur et ses agrégats."""
+    name: str
+    book_count: int
+    average_rating: Optional[float] = None
+
+
+class BulkRowResult(BaseModel):
+    """Résultat de l'import d'une ligne."""
+    line: int = Field(..., description="Numéro de ligne (ou position dans le tableau JSON)")
+    status: Literal["accepted", "rejected"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkImportResponse(BaseModel):
+    """Schéma de réponse pour un import en masse."""
+    accepted: int
+    rejected: int
+    results: List[BulkRowResult]
+
+
+class BulkDeleteRequest(BaseModel):
+    """Critères d'une suppression en masse (combinés par ET)."""
+    ids: Optional[List[int]] = Field(None, description="IDs des livres à supprimer")
+    author: Optional[str] = Field(None, min_length=1, description="Auteur (casse et espaces ignorés)")
+    year_min: Optional[int] = Field(None, description="Année minimale (incluse)")
+    year_max: Optional[int] = Field(None, description="Année maximale (incluse)")
+
+
+class BulkDeleteResponse(BaseModel):
+    """Schéma de réponse pour une suppression en masse."""
+    deleted: int
+
+
+class CacheCounters(BaseModel):
+    """Compteurs d'un cache."""
+    size: int
+    hits: int
+    misses: int
+
+
+class CacheStatsResponse(BaseModel):
+    """Schéma pour les statistiques du cache de lecture."""
+    enabled: bool
+    caches: Dict[str, CacheCounters]
+
+
+class FlightCounters(BaseModel):
+    """Compteurs de regroupement d'une méthode du repository."""
+    executed: int = Field(..., description="Exécutions réelles")
+    shared: int = Field(..., description="Appels servis par une exécution déjà en cours (requêtes évitées)")
+
+
+class CoalescingStatsResponse(BaseModel):
+    """Schéma pour les compteurs de regroupement des lectures."""
+    enabled: bool
+    methods: Dict[str, FlightCounters]
+
+
+class BatchingStatsResponse(BaseModel):
+    """Schéma pour les compteurs du regroupement des écritures."""
+    enabled: bool
+    batches: int = Field(..., description="Transactions validées par la file d'écritures")
+    writes: int = Field(..., description="Écritures unitaires traitées")
+    replayed: int = Field(..., description="Lots annulés puis rejoués écriture par écriture après une erreur")
+    largest: int = Field(..., description="Plus grand lot")
+
+
+class PoolStatsResponse(BaseModel):
+    """Schéma pour l'état du pool de connexions."""
+    pool_class: str
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    max_overflow: Optional[int] = None
+    timeout: Optional[float] = None
+    recycle: int
+    pre_ping: bool
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
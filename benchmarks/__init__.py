@@ -0,0 +1,6 @@
+"""
+Suite de benchmarks : catalogue synthétique, micro-benchmarks du repository,
+débit/latence des routes de bout en bout, et références contre les régressions.
+
+    python -m benchmarks --sizes 10000 --suite all
+"""
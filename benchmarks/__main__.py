@@ -0,0 +1,105 @@
+"""
+Point d'entrée : python -m benchmarks [--sizes 10000,100000,1000000] [--suite all|repository|api|book|compression|batching|schema]
+Le code de sortie vaut 1 si un cas régresse au-delà du seuil par rapport à baselines.json
+(seuls les cas qui y ont une référence sont vérifiés : 10 000 livres, schéma, écritures).
+"""
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.api_bench import run_api_benchmarks
+from benchmarks.batching_bench import run_batching_benchmarks
+from benchmarks.book_bench import run_book_benchmarks
+from benchmarks.compression_bench import run_compression_benchmarks
+from benchmarks.harness import (
+    BASELINES_PATH, DEFAULT_THRESHOLD, best_of, find_regressions, format_duration, format_results,
+    load_baselines, save_baselines, ungated
+)
+from benchmarks.repository_bench import run_repository_benchmarks
+from benchmarks.schema_bench import run_schema_benchmarks
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--sizes", default="10000",
+                        help="Tailles de catalogue, séparées par des virgules (ex. 10000,100000,1000000)")
+    parser.add_argument("--suite", choices=["all", "repository", "api", "book", "compression", "batching", "schema"], default="all")
+    parser.add_argument("--runs", type=int, default=1,
+                        help="Exécutions de la suite ; on garde la meilleure médiane de chaque cas")
+    parser.add_argument("--concurrency", type=int, default=4, help="Clients simultanés pour les routes GET")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Régression tolérée sur la médiane (0.5 = +50 %%)")
+    parser.add_argument("--baselines", type=Path, default=BASELINES_PATH)
+    parser.add_argument("--update-baselines", action="store_true",
+                        help="Enregistre les résultats comme nouvelles références")
+    parser.add_argument("--output", type=Path, help="Écrit les résultats bruts en JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    runs = []
+    for _ in range(args.runs):
+        results = []
+        if args.suite in ("all", "book"):
+            print("⏱️  Book, construction et mémoire...", flush=True)
+            results += run_book_benchmarks()
+        with tempfile.TemporaryDirectory(prefix="books-bench-") as workdir:
+            if args.suite in ("all", "schema"):
+                print("⏱️  Préparation du schéma au démarrage...", flush=True)
+                results += run_schema_benchmarks(Path(workdir))
+            if args.suite in ("all", "batching"):
+                print("⏱️  Écritures simultanées, avec et sans regroupement...", flush=True)
+                results += run_batching_benchmarks(Path(workdir))
+            for size in sizes:
+                if args.suite in ("all", "repository"):
+                    print(f"⏱️  Repository, {size} livres...", flush=True)
+                    results += run_repository_benchmarks(size, Path(workdir))
+                if args.suite in ("all", "api"):
+                    print(f"⏱️  API, {size} livres...", flush=True)
+                    results += run_api_benchmarks(size, Path(workdir), concurrency=args.concurrency)
+                if args.suite in ("all", "compression"):
+                    print(f"⏱️  Compression, {size} livres...", flush=True)
+                    results += run_compression_benchmarks(size)
+        runs.append(results)
+    results = best_of(runs)
+
+    print(format_results(results))
+    for result in results:
+        if "bytes_per_object" in result:
+            print(f"💾 {result['name']} : {result['bytes_per_object']:.0f} octets par objet")
+        if "statements" in result:
+            print(f"🗄️  {result['name']} : {result['statements']} requêtes SQL par démarrage")
+        if "wire_bytes" in result:
+            print(f"📦 {result['name']} : {result['wire_bytes']} octets transmis, "
+                  f"{format_duration(result['cpu_per_request'])} CPU par requête")
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if args.update_baselines:
+        save_baselines(results, args.baselines)
+        print(f"✅ Références enregistrées dans {args.baselines}")
+        return 0
+
+    baselines = load_baselines(args.baselines)
+    unchecked = ungated(results, baselines)
+    if unchecked:
+        print(f"⚠️  {len(unchecked)} cas sans référence, non vérifiés : {', '.join(unchecked)}")
+    regressions = find_regressions(results, baselines, args.threshold)
+    for regression in regressions:
+        print(
+            f"❌ {regression['name']} : {format_duration(regression['median'])} "
+            f"(référence {format_duration(regression['baseline'])}, x{regression['ratio']:.2f})"
+        )
+    if regressions:
+        return 1
+    print("✅ Aucune régression")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
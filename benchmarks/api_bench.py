@@ -0,0 +1,180 @@
+"""
+Benchmarks de bout en bout de chaque route de api/routes.py (livres et auteurs), via un client ASGI
+en processus (httpx.ASGITransport) : latence par requête et débit.
+"""
+import asyncio
+import itertools
+import random
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.orm import sessionmaker
+
+from adapters.database import get_db
+from adapters.repositories.sqlalchemy_repository import SQLAlchemyBookRepository
+from api.routes import authors_router, router
+from benchmarks.catalog import SEARCH_TERMS, generate_rows, iter_catalog
+from benchmarks.harness import summarize
+from benchmarks.repository_bench import create_sqlite_engine, load_catalog
+
+
+REQUESTS_PER_ROUTE = 200
+SCAN_REQUESTS = 10
+
+# Requête : (méthode, URL, options httpx) produite à la demande
+RequestFactory = Callable[[], Tuple[str, str, dict]]
+ResponseHook = Optional[Callable[[httpx.Response], None]]
+
+
+def build_app(engine) -> FastAPI:
+    """Application avec les routes synchrones, sur la base de benchmark."""
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    def bench_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(router)
+    app.include_router(authors_router)
+    app.dependency_overrides[get_db] = bench_get_db
+    return app
+
+
+class ApiWorkload:
+    """Une fabrique de requêtes et un code attendu par route (méthode, gabarit)."""
+
+    def __init__(self, size: int, seed: int = 42):
+        self.size = size
+        self.rng = random.Random(seed)
+        self.counter = itertools.count()
+        self.created: List[int] = []
+        # Auteurs réels du catalogue, pour GET /authors/{name}/books
+        self.authors = [book.author for _, book in zip(range(100), iter_catalog(size, seed))]
+
+    def random_id(self) -> int:
+        return self.rng.randint(1, self.size)
+
+    def new_row(self) -> dict:
+        return {"title": f"Bench {next(self.counter)}", "author": "Bench Author", "year": 2000, "rating": 3}
+
+    def record_created(self, response: httpx.Response):
+        self.created.append(response.json()["id"])
+
+    def routes(self) -> Dict[Tuple[str, str], Tuple[RequestFactory, int, int, ResponseHook]]:
+        """
+        (méthode, gabarit) -> (fabrique de requête, code attendu, nombre de requêtes, hook).
+        Ordre d'exécution : les livres créés par POST /books/ sont supprimés un à un,
+        puis la suppression en masse vide ce qui reste des livres "Bench".
+        """
+        point = REQUESTS_PER_ROUTE
+        scan = SCAN_REQUESTS if self.size > 10_000 else REQUESTS_PER_ROUTE // 10
+        return {
+            ("POST", "/books/"): (
+                lambda: ("POST", "/books/", {"json": self.new_row()}), 201, point, self.record_created,
+            ),
+            ("POST", "/books/bulk"): (
+                lambda: ("POST", "/books/bulk", {"json": generate_rows(100, prefix=f"Bulk {next(self.counter)} ")}),
+                200, point // 10, None,
+            ),
+            ("GET", "/books/"): (
+                lambda: ("GET", f"/books/?limit=100&after={self.random_id()}", {}), 200, point, None,
+            ),
+            ("GET", "/books/search"): (
+                lambda: ("GET", "/books/search", {"params": {"q": self.rng.choice(SEARCH_TERMS)}}), 200, scan, None,
+            ),
+            ("GET", "/books/export"): (lambda: ("GET", "/books/export?format=ndjson", {}), 200, scan, None),
+            ("GET", "/books/stats"): (lambda: ("GET", "/books/stats", {}), 200, scan, None),
+            ("GET", "/books/cache/stats"): (lambda: ("GET", "/books/cache/stats", {}), 200, point, None),
+            ("GET", "/books/coalescing/stats"): (lambda: ("GET", "/books/coalescing/stats", {}), 200, point, None),
+            ("GET", "/books/batching/stats"): (lambda: ("GET", "/books/batching/stats", {}), 200, point, None),
+            ("GET", "/books/pool/stats"): (lambda: ("GET", "/books/pool/stats", {}), 200, point, None),
+            ("GET", "/authors/"): (
+                lambda: ("GET", "/authors/", {"params": {"sort": "count", "order": "desc"}}), 200, scan, None,
+            ),
+            ("GET", "/authors/{name}/books"): (
+                lambda: ("GET", f"/authors/{self.rng.choice(self.authors)}/books", {}), 200, point, None,
+            ),
+            ("GET", "/books/{book_id}"): (lambda: ("GET", f"/books/{self.random_id()}", {}), 200, point, None),
+            ("PUT", "/books/{book_id}"): (
+                lambda: ("PUT", f"/books/{self.random_id()}", {"json": {"rating": self.rng.randint(1, 5)}}),
+                200, point, None,
+            ),
+            ("PATCH", "/books/{book_id}"): (
+                lambda: ("PATCH", f"/books/{self.random_id()}", {"json": {"rating": self.rng.randint(1, 5)}}),
+                200, point, None,
+            ),
+            ("DELETE", "/books/{book_id}"): (
+                lambda: ("DELETE", f"/books/{self.created.pop()}", {}), 204, point, None,
+            ),
+            ("DELETE", "/books/"): (
+                lambda: ("DELETE", "/books/", {"json": {"author": "Bench Author", "year_max": 2000}}), 200, scan, None,
+            ),
+        }
+
+
+def route_templates() -> List[Tuple[str, str]]:
+    """(méthode, gabarit) de chaque route de api/routes.py."""
+    routes = router.routes + authors_router.routes
+    return sorted((method, route.path) for route in routes for method in route.methods)
+
+
+async def run_route(client: httpx.AsyncClient, factory: RequestFactory, expected_status: int,
+                    count: int, concurrency: int, hook: ResponseHook = None) -> Tuple[List[float], float]:
+    """Envoie `count` requêtes avec `concurrency` clients simultanés ; retourne latences et durée totale."""
+    durations = []
+    sent = itertools.count()
+
+    async def worker():
+        while next(sent) < count:
+            method, url, options = factory()
+            start = time.perf_counter()
+            response = await client.request(method, url, **options)
+            durations.append(time.perf_counter() - start)
+            if response.status_code != expected_status:
+                raise RuntimeError(f"{method} {url} : {response.status_code} au lieu de {expected_status}")
+            if hook is not None:
+                hook(response)
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return durations, time.perf_counter() - wall_start
+
+
+async def run_api_workload(app: FastAPI, size: int, concurrency: int, seed: int = 42) -> List[dict]:
+    workload = ApiWorkload(size, seed)
+    routes = workload.routes()
+    missing = set(route_templates()) - set(routes)
+    if missing:
+        raise RuntimeError(f"Routes sans benchmark : {sorted(missing)}")
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for (method, path), (factory, expected_status, count, hook) in routes.items():
+            # Écritures en série : SQLite n'accepte qu'un écrivain à la fois
+            route_concurrency = concurrency if method == "GET" else 1
+            durations, wall_time = await run_route(client, factory, expected_status, count, route_concurrency, hook)
+            result = summarize(f"api/{size}/{method} {path}", durations, wall_time)
+            result["route"] = f"{method} {path}"
+            results.append(result)
+    return results
+
+
+def run_api_benchmarks(size: int, workdir: Path, concurrency: int = 4, seed: int = 42) -> List[dict]:
+    """Toutes les routes, sur un catalogue SQLite de `size` livres."""
+    engine = create_sqlite_engine(workdir / f"api-{size}.db")
+    session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        load_catalog(SQLAlchemyBookRepository(session), size, seed)
+    finally:
+        session.close()
+    try:
+        return asyncio.run(run_api_workload(build_app(engine), size, concurrency, seed))
+    finally:
+        engine.dispose()
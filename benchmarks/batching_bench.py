@@ -0,0 +1,63 @@
+"""
+Débit des créations simultanées, avec et sans regroupement des écritures :
+WRITERS threads appellent add_if_absent sur une base SQLite fichier en
+synchronous=FULL (un fsync par commit), comme une rafale de POST /books/.
+"""
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+from sqlalchemy.orm import sessionmaker
+
+from adapters.repositories.batching_repository import BatchingBookRepository, WriteBatcher
+from adapters.repositories.sqlalchemy_repository import SQLAlchemyBookRepository
+from benchmarks.harness import summarize
+from benchmarks.repository_bench import create_sqlite_engine
+from domain.book import Book
+
+
+WRITERS = 16
+WRITES_PER_WRITER = 25
+
+
+def run_writers(session_factory: sessionmaker, repository_factory, counter) -> tuple:
+    """Chaque écrivain crée ses livres avec sa propre session ; retourne (durées, durée totale)."""
+    def writer():
+        durations = []
+        session = session_factory()
+        try:
+            repository = repository_factory(session)
+            for _ in range(WRITES_PER_WRITER):
+                start = time.perf_counter()
+                repository.add_if_absent(Book(f"Bench {next(counter)}", "Bench Author", 2000))
+                durations.append(time.perf_counter() - start)
+        finally:
+            session.close()
+        return durations
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(WRITERS) as pool:
+        futures = [pool.submit(writer) for _ in range(WRITERS)]
+        durations = [duration for future in futures for duration in future.result()]
+    return durations, time.perf_counter() - start
+
+
+def run_batching_benchmarks(workdir: Path) -> List[dict]:
+    """Créations simultanées : une transaction par appel, puis regroupées."""
+    engine = create_sqlite_engine(workdir / "batching.db", synchronous="FULL")
+    counter = itertools.count()
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    batcher = WriteBatcher(session_factory)
+    results = []
+    try:
+        for mode, factory in (
+            ("direct", SQLAlchemyBookRepository),
+            ("batched", lambda session: BatchingBookRepository(SQLAlchemyBookRepository(session), batcher)),
+        ):
+            durations, wall_time = run_writers(session_factory, factory, counter)
+            results.append(summarize(f"batching/{WRITERS}-writers/{mode}/add_if_absent", durations, wall_time))
+    finally:
+        batcher.close()
+        engine.dispose()
+    return results
@@ -0,0 +1,61 @@
+"""
+Coût d'un objet Book : construction validée (Book(...)) ou de confiance
+(Book.from_storage), et mémoire par objet avec __slots__ comparée à une
+disposition classique avec __dict__.
+"""
+import gc
+import tracemalloc
+from typing import Callable, List
+
+from benchmarks.catalog import generate_rows
+from benchmarks.harness import measure
+from domain.book import Book, book_from_row
+
+
+# Objets construits par mesure
+BATCH_SIZE = 10_000
+REPEAT = 20
+
+
+class DictBook(Book):
+    """Même classe sans __slots__ (un __dict__ par instance), comme référence."""
+
+
+def catalog_rows(size: int) -> List[tuple]:
+    """Lignes (id, title, author, year, rating) telles que lues en base."""
+    return [
+        (book_id, row["title"], row["author"], row["year"], row["rating"])
+        for book_id, row in enumerate(generate_rows(size), start=1)
+    ]
+
+
+def bytes_per_object(build: Callable[[], list], count: int) -> float:
+    """Mémoire allouée par objet (tracemalloc), les lignes sources étant déjà en mémoire."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = build()
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    # La liste elle-même n'est pas comptée
+    return (allocated - objects.__sizeof__()) / count
+
+
+def run_book_benchmarks(size: int = BATCH_SIZE) -> List[dict]:
+    """Construction de `size` livres par les trois chemins, temps et mémoire par objet."""
+    rows = catalog_rows(size)
+    cases = {
+        "validated": lambda: [Book(title, author, year, rating=rating, book_id=book_id)
+                              for book_id, title, author, year, rating in rows],
+        "from_storage": lambda: [book_from_row(row) for row in rows],
+        "dict_layout": lambda: [DictBook(title, author, year, rating=rating, book_id=book_id)
+                                for book_id, title, author, year, rating in rows],
+    }
+    results = []
+    for name, build in cases.items():
+        result = measure(f"book/{size}/{name}", build, REPEAT)
+        result["bytes_per_object"] = bytes_per_object(build, size)
+        results.append(result)
+    return results
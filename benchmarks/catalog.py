@@ -0,0 +1,59 @@
+"""
+Générateur de catalogue synthétique, déterministe (graine fixe).
+Titres uniques, auteurs partagés par plusieurs livres, notes partiellement renseignées.
+"""
+import random
+from typing import Iterator, List
+from domain.book import Book
+
+
+ADJECTIVES = [
+    "Silent", "Hidden", "Lost", "Broken", "Golden", "Dark", "Eternal", "Last", "Secret", "Red",
+    "Frozen", "Burning", "Distant", "Ancient", "Forgotten", "Crimson", "Wild", "Quiet", "Iron", "Glass",
+]
+NOUNS = [
+    "Garden", "Empire", "River", "Kingdom", "Shadow", "Machine", "Ocean", "City", "Forest", "Tower",
+    "Voyage", "Winter", "Mirror", "Storm", "Island", "Library", "Bridge", "Desert", "Harbor", "Star",
+]
+FIRST_NAMES = [
+    "Ada", "Boris", "Chloé", "Daniel", "Élise", "Farid", "Greta", "Hugo", "Inès", "Jonas",
+    "Karin", "Léon", "Maya", "Nils", "Olga", "Paul", "Rosa", "Sven", "Théo", "Yuki",
+]
+LAST_NAMES = [
+    "Martin", "Okafor", "Nakamura", "Silva", "Novak", "Dubois", "Larsen", "Moreau", "Rossi", "Kowalski",
+    "Haddad", "Schmidt", "Fontaine", "Ivanova", "Garcia", "Lindqvist", "Bernard", "Costa", "Weber", "Petit",
+]
+
+# Mots présents dans les titres, pour les recherches
+SEARCH_TERMS = ["garden", "Shadow", "iron tower", "lost", "Star 1"]
+
+
+def author_count(size: int) -> int:
+    """Environ dix livres par auteur, bornés entre 1 et 20 000 auteurs."""
+    return max(1, min(20_000, size // 10))
+
+
+def iter_catalog(size: int, seed: int = 42) -> Iterator[Book]:
+    """Génère `size` livres valides et sans doublon, toujours les mêmes pour une graine donnée."""
+    rng = random.Random(seed)
+    authors = [
+        f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]} {i}"
+        for i in range(author_count(size))
+    ]
+    for index in range(size):
+        title = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {index}"
+        rating = rng.randint(1, 5) if rng.random() < 0.7 else None
+        yield Book(title, rng.choice(authors), rng.randint(1800, 2025), rating=rating)
+
+
+def generate_catalog(size: int, seed: int = 42) -> List[Book]:
+    """Catalogue complet en mémoire."""
+    return list(iter_catalog(size, seed))
+
+
+def generate_rows(size: int, seed: int = 42, prefix: str = "") -> List[dict]:
+    """Lignes JSON (comme pour POST /books/bulk) ; `prefix` évite les collisions entre lots."""
+    return [
+        {"title": f"{prefix}{book.title}", "author": book.author, "year": book.year, "rating": book.rating}
+        for book in iter_catalog(size, seed)
+    ]
@@ -0,0 +1,73 @@
+"""
+Coût de la compression des réponses : octets transmis et temps CPU par requête,
+pour la liste complète du catalogue en un seul corps (ORJSONResponse) ou diffusée
+livre par livre (?stream=true), sans compression, en gzip et en brotli (si installé).
+"""
+import asyncio
+import time
+from typing import List
+
+import orjson
+
+from api.compression import CompressionMiddleware, available_encodings
+from benchmarks.book_bench import catalog_rows
+from benchmarks.harness import measure
+from domain.book import BOOK_FIELDS
+
+
+REPEAT = 20
+
+
+def listing_chunks(size: int, stream: bool) -> List[bytes]:
+    """Corps de GET /books/ : un seul bloc, ou un bloc par livre comme stream_books_json."""
+    books = [orjson.dumps(dict(zip(BOOK_FIELDS, row))) for row in catalog_rows(size)]
+    if not stream:
+        return [b"[" + b",".join(books) + b"]"]
+    return [b"["] + [(b"," if index else b"") + book for index, book in enumerate(books)] + [b"]"]
+
+
+def listing_app(chunks: List[bytes]):
+    """Application ASGI minimale qui renvoie `chunks` en JSON."""
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        for index, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": index < len(chunks) - 1})
+    return app
+
+
+def request_scope(encoding: str) -> dict:
+    headers = [(b"accept-encoding", encoding.encode())] if encoding != "identity" else []
+    return {"type": "http", "method": "GET", "path": "/books/", "headers": headers}
+
+
+def run_compression_benchmarks(size: int = 10_000) -> List[dict]:
+    """Une liste de `size` livres, par mode (full/stream) et par encodage."""
+    results = []
+    loop = asyncio.new_event_loop()
+    try:
+        for mode in ("full", "stream"):
+            middleware = CompressionMiddleware(listing_app(listing_chunks(size, mode == "stream")))
+            for encoding in ["identity"] + available_encodings():
+                wire = []
+
+                async def receive():
+                    return {"type": "http.request", "body": b"", "more_body": False}
+
+                async def send(message):
+                    if message["type"] == "http.response.body":
+                        wire.append(len(message.get("body", b"")))
+
+                def request():
+                    wire.clear()
+                    loop.run_until_complete(middleware(request_scope(encoding), receive, send))
+
+                cpu_start = time.process_time()
+                result = measure(f"compression/{size}/{mode}/{encoding}", request, REPEAT)
+                # measure() exécute aussi un appel d'échauffement
+                result["cpu_per_request"] = (time.process_time() - cpu_start) / (REPEAT + 1)
+                result["wire_bytes"] = sum(wire)
+                results.append(result)
+    finally:
+        loop.close()
+    return results
@@ -0,0 +1,134 @@
+"""
+Mesure, résumé et comparaison aux références (baselines).
+"""
+import gc
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+
+# Régression : médiane plus lente que la référence de plus de DEFAULT_THRESHOLD (relatif)
+# et de plus de MIN_DELTA secondes (les opérations de quelques µs sont trop bruitées).
+# Sur une machine partagée, un même cas varie de ±50 % d'une exécution à l'autre :
+# utiliser --runs pour garder la meilleure de plusieurs exécutions.
+DEFAULT_THRESHOLD = 0.5
+MIN_DELTA = 0.000_2
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentile par rang le plus proche, sur des valeurs déjà triées."""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(name: str, durations: List[float], wall_time: Optional[float] = None) -> dict:
+    """Résumé d'une série de durées (secondes) : médiane, p95, p99 et débit."""
+    ordered = sorted(durations)
+    wall_time = wall_time if wall_time is not None else sum(durations)
+    return {
+        "name": name,
+        "runs": len(ordered),
+        "median": statistics.median(ordered),
+        "p95": percentile(ordered, 0.95),
+        "p99": percentile(ordered, 0.99),
+        "ops_per_sec": len(ordered) / wall_time if wall_time else float("inf"),
+    }
+
+
+def measure(name: str, operation: Callable[[], object], repeat: int, warmup: int = 1) -> dict:
+    """
+    Exécute `operation` `warmup` fois sans mesure, puis `repeat` fois en mesurant chaque appel.
+    Le ramasse-miettes est suspendu pendant la mesure, comme dans timeit.
+    """
+    for _ in range(warmup):
+        operation()
+    durations = []
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            operation()
+            durations.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return summarize(name, durations)
+
+
+def best_of(runs: List[List[dict]]) -> List[dict]:
+    """Pour chaque cas, le résultat de l'exécution la plus rapide (médiane minimale)."""
+    best = {}
+    for results in runs:
+        for result in results:
+            if result["name"] not in best or result["median"] < best[result["name"]]["median"]:
+                best[result["name"]] = result
+    return list(best.values())
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> Dict[str, dict]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_baselines(results: List[dict], path: Path = BASELINES_PATH):
+    """Enregistre (ou remplace) les médianes de référence des résultats fournis."""
+    baselines = load_baselines(path)
+    for result in results:
+        baselines[result["name"]] = {"median": round(result["median"], 7), "p95": round(result["p95"], 7)}
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def find_regressions(results: List[dict], baselines: Dict[str, dict],
+                     threshold: float = DEFAULT_THRESHOLD, min_delta: float = MIN_DELTA) -> List[dict]:
+    """
+    Résultats dont la médiane dépasse la référence au-delà du seuil.
+    Les cas sans référence ne sont pas vérifiés (voir ungated) : baselines.json ne couvre
+    que la taille par défaut (10 000 livres) et les suites qui ne dépendent pas de la taille.
+    """
+    regressions = []
+    for result in results:
+        baseline = baselines.get(result["name"])
+        if baseline is None:
+            continue
+        limit = baseline["median"] * (1 + threshold)
+        if result["median"] > limit and result["median"] - baseline["median"] > min_delta:
+            regressions.append({
+                "name": result["name"],
+                "baseline": baseline["median"],
+                "median": result["median"],
+                "ratio": result["median"] / baseline["median"],
+            })
+    return regressions
+
+
+def ungated(results: List[dict], baselines: Dict[str, dict]) -> List[str]:
+    """Noms des cas mesurés sans référence, que find_regressions ne peut pas vérifier."""
+    return [result["name"] for result in results if result["name"] not in baselines]
+
+
+def format_duration(seconds: float) -> str:
+    if seconds < 0.001:
+        return f"{seconds * 1_000_000:.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1000:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+def format_results(results: List[dict]) -> str:
+    """Tableau texte des résultats."""
+    width = max((len(result["name"]) for result in results), default=10)
+    lines = [f"{'cas':<{width}}  {'runs':>5}  {'médiane':>10}  {'p95':>10}  {'p99':>10}  {'ops/s':>10}"]
+    for result in results:
+        lines.append(
+            f"{result['name']:<{width}}  {result['runs']:>5}  {format_duration(result['median']):>10}  "
+            f"{format_duration(result['p95']):>10}  {format_duration(result['p99']):>10}  "
+            f"{result['ops_per_sec']:>10.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,163 @@
+"""
+Micro-benchmarks de chaque méthode de IBookRepository, sur les adapters en mémoire
+(objets et colonnaire) et sur l'adapter SQLAlchemy (fichier SQLite), pour une taille
+de catalogue donnée.
+"""
+import itertools
+import random
+from pathlib import Path
+from typing import Callable, List, Tuple
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from adapters.migrations import migrate
+from adapters.repositories.columnar_repository import ColumnarBookRepository
+from adapters.repositories.in_memory_repository import InMemoryBookRepository
+from adapters.repositories.sqlalchemy_repository import SQLAlchemyBookRepository
+from benchmarks.catalog import SEARCH_TERMS, iter_catalog
+from benchmarks.harness import measure
+from domain.book import Book
+from domain.ports import IBookRepository
+from domain.query import AuthorQuery
+
+
+LOAD_BATCH_SIZE = 5000
+
+# Nombre de mesures : opérations ponctuelles / parcours complets du catalogue
+POINT_REPEAT = 200
+SCAN_REPEAT = 5
+
+
+def create_sqlite_engine(path: Path, synchronous: str = "NORMAL"):
+    """
+    Moteur SQLite fichier avec le schéma complet (index de recherche compris).
+    WAL + synchronous=NORMAL : les fsync à chaque commit rendraient les écritures trop bruitées
+    (synchronous=FULL pour mesurer justement leur coût).
+    """
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def configure(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={synchronous}")
+        cursor.close()
+
+    migrate(engine)
+    return engine
+
+
+def load_catalog(repository: IBookRepository, size: int, seed: int = 42):
+    """Charge le catalogue par lots via add_many."""
+    books = iter_catalog(size, seed)
+    while True:
+        batch = list(itertools.islice(books, LOAD_BATCH_SIZE))
+        if not batch:
+            return
+        repository.add_many(batch)
+
+
+class RepositoryWorkload:
+    """
+    Cas de mesure, un par méthode du port. Les écritures créent leurs propres
+    livres (préfixe "Bench") pour ne pas modifier la taille du catalogue mesuré.
+    """
+
+    def __init__(self, repository: IBookRepository, size: int, seed: int = 42):
+        self.repository = repository
+        self.size = size
+        self.rng = random.Random(seed)
+        self.counter = itertools.count()
+        self.created: List[int] = []
+        # Clés réelles du catalogue, pour les recherches de clés existantes
+        self.sample = [book for _, book in zip(range(100), iter_catalog(size, seed))]
+        self.scan_repeat = SCAN_REPEAT if size > 10_000 else POINT_REPEAT // 10
+
+    def random_id(self) -> int:
+        return self.rng.randint(1, self.size)
+
+    def new_book(self) -> Book:
+        return Book(f"Bench {next(self.counter)}", "Bench Author", 2000, rating=3)
+
+    def add(self):
+        self.created.append(self.repository.add(self.new_book()).id)
+
+    def add_if_absent(self):
+        self.created.append(self.repository.add_if_absent(self.new_book()).id)
+
+    def add_many(self):
+        books = self.repository.add_many([self.new_book() for _ in range(100)])
+        self.created.extend(book.id for book in books)
+
+    def update(self):
+        book = self.repository.get_by_id(self.created[-1])
+        book.rating = book.rating % 5 + 1
+        self.repository.update(book)
+
+    def patch(self):
+        self.repository.patch(self.created[-1], {"rating": self.rng.randint(1, 5)})
+
+    def remove_by_id(self):
+        self.repository.remove_by_id(self.created.pop())
+
+    def remove_many(self):
+        batch, self.created = self.created[-100:], self.created[:-100]
+        self.repository.remove_many(ids=batch)
+
+    def cases(self) -> List[Tuple[str, Callable[[], object], int]]:
+        """(méthode, opération, nombre de mesures), dans un ordre où les écritures s'enchaînent."""
+        repository = self.repository
+        point, scan = POINT_REPEAT, self.scan_repeat
+        return [
+            ("add", self.add, point),
+            ("add_if_absent", self.add_if_absent, point),
+            ("add_many", self.add_many, point // 10),
+            ("get_all", repository.get_all, scan),
+            ("get_page", lambda: repository.get_page(after=self.random_id(), limit=100), point),
+            ("iter_all", lambda: sum(1 for _ in repository.iter_all()), scan),
+            ("get_by_id", lambda: repository.get_by_id(self.random_id()), point),
+            ("find_by_title", lambda: repository.find_by_title(self.rng.choice(SEARCH_TERMS)), scan),
+            ("get_all_rows", repository.get_all_rows, scan),
+            ("get_page_rows", lambda: repository.get_page_rows(after=self.random_id(), limit=100), point),
+            ("find_rows_by_title", lambda: repository.find_rows_by_title(self.rng.choice(SEARCH_TERMS)), scan),
+            ("get_authors", lambda: repository.get_authors(limit=100, query=AuthorQuery(sort="count", descending=True)), scan),
+            ("exists", lambda: repository.exists(*self.rng.choice(self.sample).key), point),
+            ("existing_keys", lambda: repository.existing_keys([book.key for book in self.sample]), point),
+            ("update", self.update, point),
+            ("patch", self.patch, point),
+            ("count", repository.count, point),
+            ("get_statistics", repository.get_statistics, scan),
+            ("get_book_version", lambda: repository.get_book_version(self.random_id()), point),
+            ("get_collection_version", repository.get_collection_version, point),
+            ("remove_many", self.remove_many, point // 10),
+            ("remove_by_id", self.remove_by_id, point),
+        ]
+
+
+def run_workload(adapter: str, repository: IBookRepository, size: int, seed: int = 42) -> List[dict]:
+    results = []
+    for method, operation, repeat in RepositoryWorkload(repository, size, seed).cases():
+        result = measure(f"repository/{adapter}/{size}/{method}", operation, repeat)
+        result["method"] = method
+        results.append(result)
+    return results
+
+
+def run_repository_benchmarks(size: int, workdir: Path, seed: int = 42) -> List[dict]:
+    """Toutes les méthodes du port, sur chaque adapter."""
+    results = []
+    for adapter, repository_class in (("in_memory", InMemoryBookRepository), ("columnar", ColumnarBookRepository)):
+        repository = repository_class()
+        load_catalog(repository, size, seed)
+        results += run_workload(adapter, repository, size, seed)
+
+    engine = create_sqlite_engine(workdir / f"repository-{size}.db")
+    session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        sqlite = SQLAlchemyBookRepository(session)
+        load_catalog(sqlite, size, seed)
+        results += run_workload("sqlite", sqlite, size, seed)
+    finally:
+        session.close()
+        engine.dispose()
+    return results
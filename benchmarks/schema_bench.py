@@ -0,0 +1,48 @@
+"""
+Coût de la préparation du schéma au démarrage, sur une base SQLite fichier déjà à jour :
+l'ancien create_tables (create_all puis chaque étape de mise à niveau, à chaque
+démarrage) contre setup_schema (une lecture de schema_version).
+Chaque mesure utilise un moteur neuf, comme un worker qui démarre ; le nombre de
+requêtes SQL émises indique le coût sur PostgreSQL, où chacune est un aller-retour réseau.
+"""
+from pathlib import Path
+from typing import List
+from sqlalchemy import create_engine, event
+
+from adapters.migrations import MIGRATIONS, migrate, setup_schema
+from benchmarks.harness import measure
+
+
+REPEAT = 20
+
+
+def create_all_startup(engine):
+    """Ancien démarrage : toutes les étapes rejouées, create_all compris."""
+    with engine.begin() as connection:
+        for migration in MIGRATIONS:
+            migration.apply(connection)
+
+
+def run_schema_benchmarks(workdir: Path) -> List[dict]:
+    """Démarrage sur une base à jour, avec chaque stratégie."""
+    url = f"sqlite:///{workdir / 'schema.db'}"
+    setup = create_engine(url)
+    migrate(setup)
+    setup.dispose()
+
+    results = []
+    for name, startup in (("create_all", create_all_startup), ("versioned", setup_schema)):
+        statements = []
+
+        def operation():
+            engine = create_engine(url)
+            statements.clear()
+            event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+            try:
+                startup(engine)
+            finally:
+                engine.dispose()
+        result = measure(f"schema/startup/{name}", operation, REPEAT)
+        result["statements"] = len(statements)
+        results.append(result)
+    return results
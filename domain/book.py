@@ -1,26 +1,81 @@
+from typing import Optional, Tuple
 from domain.exceptions import YearError, TitleError, AuthorError
 
 
-class Book:
-    """Représente un livre avec validation des données."""
-    
-    def __init__(self, title: str, author: str, year: int, rating: int = None, book_id: int = None):
-        # Validation complète
+# Ligne de lecture légère, dans l'ordre de BOOK_FIELDS : (id, title, author, year, rating)
+BookRow = Tuple[int, str, str, int, Optional[int]]
+BOOK_FIELDS = ("id", "title", "author", "year", "rating")
+
+
+def normalize(text: str) -> str:
+    """Forme normalisée d'un titre ou d'un auteur pour détecter les doublons."""
+    return text.strip().casefold()
+
+
+def validate_changes(changes: dict) -> dict:
+    """
+    Valide des champs modifiés avec les règles de Book.
+    Retourne les valeurs nettoyées (titre et auteur sans espaces superflus).
+    """
+    cleaned = {}
+    if "title" in changes:
+        title = changes["title"]
         if not title or not title.strip():
             raise TitleError(title)
+        cleaned["title"] = title.strip()
+    if "author" in changes:
+        author = changes["author"]
         if not author or not author.strip():
             raise AuthorError(author)
+        cleaned["author"] = author.strip()
+    if "year" in changes:
+        year = changes["year"]
         if not isinstance(year, int) or year < 1000 or year > 2025:
             raise YearError(year)
+        cleaned["year"] = year
+    if "rating" in changes:
+        rating = changes["rating"]
         if rating is not None and (not isinstance(rating, int) or rating < 1 or rating > 5):
             raise ValueError("Le rating doit être entre 1 et 5")
+        cleaned["rating"] = rating
+    return cleaned
+
+
+class Book:
+    """Représente un livre avec validation des données."""
+    
+    # Pas de __dict__ par instance : objets plus légers, attributs plus rapides
+    __slots__ = BOOK_FIELDS
+    
+    def __init__(self, title: str, author: str, year: int, rating: int = None, book_id: int = None):
+        # Validation complète
+        fields = validate_changes({"title": title, "author": author, "year": year, "rating": rating})
         
         self.id = book_id
-        self.title = title.strip()
-        self.author = author.strip()
+        self.title = fields["title"]
+        self.author = fields["author"]
         self.year = year
         self.rating = rating
 
+    @classmethod
+    def from_storage(cls, book_id: int, title: str, author: str, year: int, rating: int = None) -> "Book":
+        """
+        Reconstruit un livre lu depuis le stockage, sans revalider ses champs :
+        ils l'ont été à l'écriture. À réserver aux données de confiance.
+        """
+        book = object.__new__(cls)
+        book.id = book_id
+        book.title = title
+        book.author = author
+        book.year = year
+        book.rating = rating
+        return book
+
+    @property
+    def key(self):
+        """Clé d'unicité (titre, auteur) normalisée."""
+        return normalize(self.title), normalize(self.author)
+
     def matches_title(self, search_term: str) -> bool:
         """Vérifie si le titre contient le terme recherché (insensible à la casse)."""
         return search_term.lower() in self.title.lower()
@@ -30,3 +85,13 @@ class Book:
     
     def __repr__(self):
         return f"Book(id={self.id}, title='{self.title}', author='{self.author}', year={self.year})"
+
+
+def book_to_row(book: Book) -> BookRow:
+    """Ligne (id, title, author, year, rating) d'un livre."""
+    return book.id, book.title, book.author, book.year, book.rating
+
+
+def book_from_row(row) -> Book:
+    """Reconstruit un livre depuis une ligne (id, title, author, year, rating) lue en base."""
+    return Book.from_storage(*row)
@@ -26,4 +26,10 @@ class DuplicateBookError(Exception):
 class BookNotFoundError(Exception):
     def __init__(self, identifier):
         self.identifier = identifier
-        super().__init__(f"Livre non trouvé: {identifier}")
\ No newline at end of file
+        super().__init__(f"Livre non trouvé: {identifier}")
+
+
+class AuthorNotFoundError(Exception):
+    def __init__(self, author):
+        self.author = author
+        super().__init__(f"Auteur non trouvé: {author}")
@@ -3,8 +3,10 @@ Ports (Interfaces) pour l'architecture hexagonale.
 Ces interfaces définissent les contrats que les adapters doivent respecter.
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from domain.book import Book
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Set, Tuple
+from domain.book import Book, BookRow
+from domain.query import AuthorCursor, AuthorQuery, AuthorRow, BookCursor, BookQuery
 
 
 class IBookRepository(ABC):
@@ -18,11 +20,43 @@ class IBookRepository(ABC):
         """Ajoute un livre et retourne le livre avec son ID."""
         pass
     
+    @abstractmethod
+    def add_if_absent(self, book: Book) -> Optional[Book]:
+        """
+        Ajoute un livre en une seule opération atomique.
+        Retourne None si un livre de même clé (titre, auteur) normalisée existe déjà.
+        """
+        pass
+    
+    @abstractmethod
+    def add_many(self, books: List[Book]) -> List[Book]:
+        """
+        Ajoute plusieurs livres en une seule transaction et leur attribue un ID.
+        Les doublons (clé déjà présente) sont ignorés et gardent un ID à None.
+        """
+        pass
+    
     @abstractmethod
     def get_all(self) -> List[Book]:
         """Retourne tous les livres."""
         pass
     
+    @abstractmethod
+    def get_page(self, after: Optional[int] = None, limit: int = 100) -> List[Book]:
+        """
+        Retourne une page de livres triés par ID (pagination par curseur).
+        Seuls les livres dont l'ID est strictement supérieur à `after` sont retournés.
+        """
+        pass
+    
+    @abstractmethod
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Book]:
+        """
+        Parcourt tous les livres triés par ID sous forme de générateur.
+        Les livres sont lus par lots de `batch_size` pour borner la mémoire.
+        """
+        pass
+    
     @abstractmethod
     def get_by_id(self, book_id: int) -> Optional[Book]:
         """Récupère un livre par son ID."""
@@ -33,22 +67,225 @@ class IBookRepository(ABC):
         """Trouve des livres par titre (recherche partielle)."""
         pass
     
+    # Lectures rapides : lignes (id, title, author, year, rating) déjà valides,
+    # sérialisées telles quelles par l'API sans construire de Book
+    
+    @abstractmethod
+    def get_all_rows(self, query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Comme get_all(), sous forme de lignes ; `query` filtre et trie (WHERE / ORDER BY)."""
+        pass
+    
+    @abstractmethod
+    def get_page_rows(self, after: Optional[BookCursor] = None, limit: Optional[int] = 100,
+                      query: Optional[BookQuery] = None) -> List[BookRow]:
+        """
+        Comme get_page(), sous forme de lignes, filtrées et triées selon `query`.
+        Le curseur `after` est `query.cursor()` de la dernière ligne reçue : son ID pour
+        un tri par ID, sinon sa clé (valeur triée, id) ; `limit=None` retourne tout.
+        """
+        pass
+    
+    @abstractmethod
+    def find_rows_by_title(self, search_term: str) -> List[BookRow]:
+        """Comme find_by_title(), sous forme de lignes."""
+        pass
+    
+    @abstractmethod
+    def get_authors(self, after: Optional[AuthorCursor] = None, limit: Optional[int] = 100,
+                    query: Optional[AuthorQuery] = None) -> List[AuthorRow]:
+        """
+        Agrégats par auteur normalisé (GROUP BY) : (nom, livres, livres notés, somme des notes),
+        triés selon `query`. Le curseur `after` est le nom du dernier auteur reçu
+        (pagination par clé) ; `limit=None` retourne tout.
+        """
+        pass
+    
     @abstractmethod
     def exists(self, title: str, author: str) -> bool:
         """Vérifie si un livre existe déjà."""
         pass
     
+    @abstractmethod
+    def existing_keys(self, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """
+        Retourne, parmi les clés (titre, auteur) normalisées fournies (voir Book.key),
+        celles qui correspondent déjà à un livre enregistré.
+        """
+        pass
+    
     @abstractmethod
     def remove_by_id(self, book_id: int) -> bool:
         """Supprime un livre par son ID."""
         pass
     
+    @abstractmethod
+    def remove_many(self, ids: Optional[Iterable[int]] = None, author: Optional[str] = None,
+                    year_min: Optional[int] = None, year_max: Optional[int] = None) -> List[int]:
+        """
+        Supprime les livres correspondant à tous les critères fournis
+        (IDs, auteur normalisé, années incluses) et retourne les IDs supprimés.
+        """
+        pass
+    
     @abstractmethod
     def update(self, book: Book) -> Optional[Book]:
-        """Met à jour un livre existant."""
+        """
+        Met à jour un livre existant.
+        Lève DuplicateBookError si la nouvelle clé (titre, auteur) est déjà prise.
+        """
+        pass
+    
+    @abstractmethod
+    def patch(self, book_id: int, changes: dict) -> Optional[Book]:
+        """
+        Modifie uniquement les champs de `changes` (déjà validés) et retourne le livre à jour.
+        Retourne None si le livre n'existe pas ; lève DuplicateBookError comme update().
+        """
         pass
     
     @abstractmethod
     def count(self) -> int:
         """Retourne le nombre de livres."""
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    def get_statistics(self) -> dict:
+        """
+        Calcule les agrégats de la collection en une seule passe.
+        Retourne un dict avec les clés : total, oldest, newest, rating_count,
+        rating_sum et rating_distribution (nombre de livres par note de 1 à 5).
+        """
+        pass
+    
+    @abstractmethod
+    def get_book_version(self, book_id: int) -> Optional[Tuple[int, Optional[datetime]]]:
+        """
+        Retourne (version, date de modification) d'un livre, ou None s'il n'existe pas.
+        Lecture légère : le livre n'est pas construit.
+        """
+        pass
+    
+    @abstractmethod
+    def get_collection_version(self) -> Tuple[int, Optional[datetime]]:
+        """Retourne (compteur de modifications, date de la dernière modification) de la collection."""
+        pass
+
+
+class IAsyncBookRepository(ABC):
+    """
+    Variante asynchrone de IBookRepository.
+    Même contrat, mais chaque opération est une coroutine (I/O non bloquantes).
+    """
+    
+    @abstractmethod
+    async def add(self, book: Book) -> Book:
+        """Ajoute un livre et retourne le livre avec son ID."""
+        pass
+    
+    @abstractmethod
+    async def add_if_absent(self, book: Book) -> Optional[Book]:
+        """Ajoute un livre de façon atomique ; None si la clé (titre, auteur) existe déjà."""
+        pass
+    
+    @abstractmethod
+    async def add_many(self, books: List[Book]) -> List[Book]:
+        """Ajoute plusieurs livres en une transaction ; les doublons gardent un ID à None."""
+        pass
+    
+    @abstractmethod
+    async def get_all(self) -> List[Book]:
+        """Retourne tous les livres."""
+        pass
+    
+    @abstractmethod
+    async def get_page(self, after: Optional[int] = None, limit: int = 100) -> List[Book]:
+        """Retourne une page de livres triés par ID, après le curseur `after`."""
+        pass
+    
+    @abstractmethod
+    def iter_all(self, batch_size: int = 1000) -> AsyncIterator[Book]:
+        """Parcourt tous les livres triés par ID sous forme de générateur asynchrone."""
+        pass
+    
+    @abstractmethod
+    async def get_by_id(self, book_id: int) -> Optional[Book]:
+        """Récupère un livre par son ID."""
+        pass
+    
+    @abstractmethod
+    async def find_by_title(self, search_term: str) -> List[Book]:
+        """Trouve des livres par titre (recherche partielle)."""
+        pass
+    
+    @abstractmethod
+    async def get_all_rows(self, query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Comme get_all(), sous forme de lignes (id, title, author, year, rating) filtrées et triées."""
+        pass
+    
+    @abstractmethod
+    async def get_page_rows(self, after: Optional[BookCursor] = None, limit: Optional[int] = 100,
+                            query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Comme get_page(), sous forme de lignes (voir IBookRepository.get_page_rows)."""
+        pass
+    
+    @abstractmethod
+    async def find_rows_by_title(self, search_term: str) -> List[BookRow]:
+        """Comme find_by_title(), sous forme de lignes."""
+        pass
+    
+    @abstractmethod
+    async def get_authors(self, after: Optional[AuthorCursor] = None, limit: Optional[int] = 100,
+                          query: Optional[AuthorQuery] = None) -> List[AuthorRow]:
+        """Agrégats par auteur normalisé (voir IBookRepository.get_authors)."""
+        pass
+    
+    @abstractmethod
+    async def exists(self, title: str, author: str) -> bool:
+        """Vérifie si un livre existe déjà."""
+        pass
+    
+    @abstractmethod
+    async def existing_keys(self, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """Retourne les clés (titre, auteur) normalisées déjà enregistrées."""
+        pass
+    
+    @abstractmethod
+    async def remove_by_id(self, book_id: int) -> bool:
+        """Supprime un livre par son ID."""
+        pass
+    
+    @abstractmethod
+    async def remove_many(self, ids: Optional[Iterable[int]] = None, author: Optional[str] = None,
+                          year_min: Optional[int] = None, year_max: Optional[int] = None) -> List[int]:
+        """Supprime les livres correspondant aux critères (voir IBookRepository.remove_many)."""
+        pass
+    
+    @abstractmethod
+    async def update(self, book: Book) -> Optional[Book]:
+        """Met à jour un livre existant."""
+        pass
+    
+    @abstractmethod
+    async def patch(self, book_id: int, changes: dict) -> Optional[Book]:
+        """Modifie uniquement les champs de `changes` (voir IBookRepository.patch)."""
+        pass
+    
+    @abstractmethod
+    async def count(self) -> int:
+        """Retourne le nombre de livres."""
+        pass
+    
+    @abstractmethod
+    async def get_statistics(self) -> dict:
+        """Calcule les agrégats de la collection (mêmes clés que IBookRepository)."""
+        pass
+    
+    @abstractmethod
+    async def get_book_version(self, book_id: int) -> Optional[Tuple[int, Optional[datetime]]]:
+        """Retourne (version, date de modification) d'un livre, ou None s'il n'existe pas."""
+        pass
+    
+    @abstractmethod
+    async def get_collection_version(self) -> Tuple[int, Optional[datetime]]:
+        """Retourne (compteur de modifications, date de la dernière modification) de la collection."""
+        pass
@@ -0,0 +1,155 @@
+"""
+Critères d'une liste de livres : filtres (combinés par ET) et tri.
+Les adapters SQL les traduisent en WHERE / ORDER BY ; les adapters en mémoire
+utilisent matches() et page_rows(), qui suivent la même sémantique.
+Idem pour la liste des auteurs (GROUP BY) avec AuthorQuery et page_authors().
+"""
+import heapq
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple, Union
+from domain.book import BOOK_FIELDS, BookRow, normalize
+
+
+SORT_FIELDS = ("id", "title", "author", "year", "rating")
+AUTHOR_SORT_FIELDS = ("name", "count")
+
+# Agrégats d'un auteur : (nom, nombre de livres, livres notés, somme des notes).
+# Les graphies d'un même auteur normalisé sont regroupées ; le nom retenu est la plus petite.
+AuthorRow = Tuple[str, int, int, int]
+
+# Curseur d'une liste de livres : l'ID du dernier livre reçu pour un tri par ID,
+# sinon sa clé de tri (valeur, id), qui reste valable s'il est modifié ou supprimé
+BookCursor = Union[int, Tuple[object, int]]
+
+# Curseur de la liste des auteurs : le nom du dernier auteur reçu pour un tri par nom,
+# sinon (nombre de livres, nom), qui reste valable si ses livres changent entre-temps
+AuthorCursor = Union[str, Tuple[int, str]]
+
+
+@dataclass(frozen=True)
+class BookQuery:
+    """
+    Filtres et tri d'une liste de livres.
+    Un livre sans note est trié comme une note de 0 ; à valeur égale, l'ID départage.
+    """
+    author: Optional[str] = None
+    year_min: Optional[int] = None
+    year_max: Optional[int] = None
+    rating_min: Optional[int] = None
+    sort: str = "id"
+    descending: bool = False
+    author_key: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.sort not in SORT_FIELDS:
+            raise ValueError(f"Tri impossible sur '{self.sort}' (champs : {', '.join(SORT_FIELDS)})")
+        if self.author is not None:
+            object.__setattr__(self, "author_key", normalize(self.author))
+
+    @property
+    def is_default(self) -> bool:
+        """Aucun filtre, tri par ID croissant."""
+        return self == DEFAULT_QUERY
+
+    def matches(self, row: BookRow) -> bool:
+        """Vérifie qu'une ligne (id, title, author, year, rating) satisfait tous les filtres."""
+        _, _, author, year, rating = row
+        return (
+            (self.author_key is None or normalize(author) == self.author_key)
+            and (self.year_min is None or year >= self.year_min)
+            and (self.year_max is None or year <= self.year_max)
+            and (self.rating_min is None or (rating is not None and rating >= self.rating_min))
+        )
+
+    def sort_key(self, row: BookRow) -> tuple:
+        """Clé de tri (valeur, id) d'une ligne."""
+        value = row[BOOK_FIELDS.index(self.sort)]
+        if self.sort == "rating" and value is None:
+            value = 0
+        return value, row[0]
+
+    def cursor(self, row: BookRow) -> BookCursor:
+        """Curseur de la page suivant la ligne `row`."""
+        return row[0] if self.sort == "id" else self.sort_key(row)
+
+    def cursor_key(self, after: BookCursor) -> tuple:
+        """Clé de tri (valeur, id) d'un curseur ; ValueError s'il ne correspond pas au tri."""
+        if self.sort == "id":
+            return after, after
+        if not isinstance(after, (tuple, list)) or len(after) != 2:
+            raise ValueError(f"Curseur (valeur, id) attendu pour un tri sur '{self.sort}'")
+        return tuple(after)
+
+
+DEFAULT_QUERY = BookQuery()
+
+
+def page_rows(rows: Iterable[BookRow], query: BookQuery, after: Optional[BookCursor] = None,
+              limit: Optional[int] = None) -> List[BookRow]:
+    """
+    Trie et pagine des lignes déjà filtrées, comme le fait l'ORDER BY / LIMIT SQL.
+    Seules les lignes situées après le curseur sont gardées ; une page ne trie que
+    ses `limit` premières lignes (heapq), pas toute la liste.
+    """
+    sort_key = query.sort_key
+    if after is not None:
+        cursor = query.cursor_key(after)
+        if query.descending:
+            rows = [row for row in rows if sort_key(row) < cursor]
+        else:
+            rows = [row for row in rows if sort_key(row) > cursor]
+    if limit is None:
+        return sorted(rows, key=sort_key, reverse=query.descending)
+    select_first = heapq.nlargest if query.descending else heapq.nsmallest
+    return select_first(limit, rows, key=sort_key)
+
+
+@dataclass(frozen=True)
+class AuthorQuery:
+    """
+    Tri de la liste des auteurs : par nom normalisé, ou par nombre de livres
+    (le nom normalisé départage). L'ordre décroissant inverse la clé entière.
+    """
+    sort: str = "name"
+    descending: bool = False
+
+    def __post_init__(self):
+        if self.sort not in AUTHOR_SORT_FIELDS:
+            raise ValueError(f"Tri impossible sur '{self.sort}' (champs : {', '.join(AUTHOR_SORT_FIELDS)})")
+
+    def sort_key(self, row: AuthorRow) -> tuple:
+        """Clé de tri d'une ligne d'auteur."""
+        key = normalize(row[0])
+        return (row[1], key) if self.sort == "count" else (key,)
+
+    def cursor(self, row: AuthorRow) -> AuthorCursor:
+        """Curseur de la page suivant la ligne `row`."""
+        return row[0] if self.sort == "name" else (row[1], row[0])
+
+    def cursor_key(self, after: AuthorCursor) -> tuple:
+        """Clé de tri d'un curseur ; ValueError s'il ne correspond pas au tri."""
+        if self.sort == "name":
+            return (normalize(after),)
+        if not isinstance(after, (tuple, list)) or len(after) != 2:
+            raise ValueError("Curseur (nombre de livres, nom) attendu pour un tri sur 'count'")
+        count, name = after
+        return count, normalize(name)
+
+
+DEFAULT_AUTHOR_QUERY = AuthorQuery()
+
+
+def page_authors(rows: Iterable[AuthorRow], query: AuthorQuery, after: Optional[AuthorCursor] = None,
+                 limit: Optional[int] = None) -> List[AuthorRow]:
+    """Trie et pagine des lignes d'auteurs comme l'ORDER BY / LIMIT SQL (voir page_rows)."""
+    sort_key = query.sort_key
+    if after is not None:
+        cursor = query.cursor_key(after)
+        if query.descending:
+            rows = [row for row in rows if sort_key(row) < cursor]
+        else:
+            rows = [row for row in rows if sort_key(row) > cursor]
+    if limit is None:
+        return sorted(rows, key=sort_key, reverse=query.descending)
+    select_first = heapq.nlargest if query.descending else heapq.nsmallest
+    return select_first(limit, rows, key=sort_key)
@@ -1,12 +1,19 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from adapters.database import create_tables
-from api.routes import router
+from adapters.database import USE_ASYNC_DB
+from adapters.migrations import setup_schema
+from adapters.metrics import METRICS_ENABLED
+from api.compression import COMPRESSION_ENABLED, CompressionMiddleware
+from api.metrics import MetricsMiddleware, router as metrics_router
+from api.routes import authors_router, router
 import os
+import time
 
 
 IS_PRODUCTION = os.environ.get("RENDER") is not None
+# Schéma déjà préparé par server.py avant le démarrage des workers
+SCHEMA_READY = os.environ.get("BOOK_SCHEMA_READY", "0") == "1"
 
 # Gestion du cycle de vie de l'application (méthode moderne)
 @asynccontextmanager
@@ -17,8 +24,14 @@ async def lifespan(app: FastAPI):
     """
     # Code exécuté au DÉMARRAGE
     print("🚀 Démarrage de l'API Book Manager...")
-    create_tables()
-    print("✅ Tables de base de données créées/vérifiées")
+    if not SCHEMA_READY:
+        start = time.perf_counter()
+        applied = setup_schema()
+        elapsed = (time.perf_counter() - start) * 1000
+        if applied:
+            print(f"✅ Migrations {applied} appliquées en {elapsed:.1f} ms")
+        else:
+            print(f"✅ Schéma à jour, vérifié en {elapsed:.1f} ms")
     
     yield  # L'application tourne ici
     
@@ -48,8 +61,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Inclure les routes
-app.include_router(router)
+# Compression gzip / brotli négociée (COMPRESSION_ENABLED=1 pour l'activer)
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Métriques Prometheus (METRICS_ENABLED=1) : sans cela, aucun coût par requête
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+app.include_router(metrics_router)
+
+# Inclure les routes (pile asynchrone si USE_ASYNC_DB=1)
+if USE_ASYNC_DB:
+    from api.async_routes import authors_router as async_authors_router, router as async_router
+    app.include_router(async_router)
+    app.include_router(async_authors_router)
+else:
+    app.include_router(router)
+    app.include_router(authors_router)
 
 # Route racine pour vérifier que l'API fonctionne
 @app.get("/")
@@ -62,7 +90,7 @@ def root():
     }
 
 
-# Pour lancer l'application en développement
+# Pour lancer l'application en développement (en production : python server.py)
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
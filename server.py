@@ -0,0 +1,50 @@
+"""
+Lanceur de production : le schéma est préparé une seule fois, puis WEB_CONCURRENCY
+processus workers uvicorn (par défaut, un par cœur) servent l'application.
+Chaque worker crée son propre moteur, dont le pool est réduit pour que l'ensemble
+tienne dans DB_CONNECTION_BUDGET connexions (voir adapters/pool.py).
+Le reste de l'état est lui aussi propre à chaque worker : cache (désactivé avec
+plusieurs workers), exécutions partagées, file d'écritures et métriques.
+
+    python server.py
+"""
+import os
+import uvicorn
+
+
+HOST = os.environ.get("HOST", "0.0.0.0")
+PORT = int(os.environ.get("PORT", "8000"))
+
+
+def worker_count() -> int:
+    """WEB_CONCURRENCY, ou le nombre de cœurs ; jamais plus de workers que de connexions au budget."""
+    workers = int(os.environ.get("WEB_CONCURRENCY") or os.cpu_count() or 1)
+    budget = int(os.environ.get("DB_CONNECTION_BUDGET", "0"))
+    if 0 < budget < workers:
+        print(f"⚠️ {workers} workers pour {budget} connexions : limité à {budget} workers")
+        workers = budget
+    return max(workers, 1)
+
+
+def main():
+    workers = worker_count()
+    if workers > 1 and os.environ.get("BOOK_CACHE_ENABLED") == "1":
+        print(f"⚠️ Cache des livres désactivé : propre à chaque processus, il ignorerait "
+              f"les écritures servies par les {workers - 1} autres workers")
+    # Avant tout import de l'application : les workers héritent de l'environnement
+    # et dimensionnent leur pool en conséquence
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+
+    from adapters.database import engine
+    from adapters.migrations import setup_schema
+    applied = setup_schema()
+    # Le processus parent ne sert aucune requête : ses connexions sont rendues
+    engine.dispose()
+    os.environ["BOOK_SCHEMA_READY"] = "1"
+    print(f"✅ Schéma prêt ({len(applied)} migrations appliquées), démarrage de {workers} workers")
+
+    uvicorn.run("main:app", host=HOST, port=PORT, workers=workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Service métier asynchrone pour gérer les livres.
+Dépend de l'INTERFACE IAsyncBookRepository ; les règles sont partagées avec BookService.
+"""
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+from domain.book import Book, BookRow, validate_changes
+from domain.exceptions import AuthorNotFoundError, DuplicateBookError, BookNotFoundError
+from domain.ports import IAsyncBookRepository
+from domain.query import DEFAULT_QUERY, AuthorCursor, AuthorQuery, BookCursor, BookQuery
+from service.book_service import (
+    author_query, format_author, format_statistics, merge_update, record_created, reject_duplicates,
+    validate_rows
+)
+
+
+class AsyncBookService:
+    """Coordonne les opérations sur les livres, sans bloquer la boucle d'événements."""
+
+    def __init__(self, repository: IAsyncBookRepository):
+        self.repository = repository
+
+    async def create_book(self, title: str, author: str, year: int, rating: int = None) -> Book:
+        """Crée et enregistre un nouveau livre (insertion atomique, sans vérification préalable)."""
+        book = Book(title, author, year, rating=rating)
+        created = await self.repository.add_if_absent(book)
+        if created is None:
+            raise DuplicateBookError(title, author)
+        return created
+
+    async def create_books(self, rows: List[dict], batch_size: int = 500) -> List[dict]:
+        """Crée des livres en masse (voir BookService.create_books)."""
+        results, candidates = validate_rows(rows)
+
+        seen = await self.repository.existing_keys({book.key for _, book in candidates})
+        accepted = reject_duplicates(candidates, seen, results)
+
+        for start in range(0, len(accepted), batch_size):
+            batch = accepted[start:start + batch_size]
+            await self.repository.add_many([book for _, book in batch])
+            record_created(batch, results)
+        return results
+
+    async def get_book_by_id(self, book_id: int) -> Book:
+        """Récupère un livre par son ID."""
+        book = await self.repository.get_by_id(book_id)
+        if not book:
+            raise BookNotFoundError(f"ID {book_id}")
+        return book
+
+    async def list_all_books(self) -> List[Book]:
+        """Liste tous les livres."""
+        return await self.repository.get_all()
+
+    def export_books(self) -> AsyncIterator[BookRow]:
+        """Parcourt tous les livres en lignes, page par page, pour un export de taille quelconque."""
+        return self.iter_rows()
+
+    async def search_books(self, search_term: str) -> List[Book]:
+        """Recherche des livres par titre."""
+        return await self.repository.find_by_title(search_term)
+
+    async def list_all_rows(self, query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Liste tous les livres sous forme de lignes (id, title, author, year, rating)."""
+        return await self.repository.get_all_rows(query)
+
+    async def list_rows_page(self, after: Optional[BookCursor] = None, limit: int = 100,
+                             query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Liste une page de lignes après le curseur `after`."""
+        return await self.repository.get_page_rows(after=after, limit=limit, query=query)
+
+    async def iter_rows(self, query: Optional[BookQuery] = None, batch_size: int = 500) -> AsyncIterator[BookRow]:
+        """Parcourt les lignes page par page (curseur (valeur triée, id)), sans tout charger en mémoire."""
+        query = query or DEFAULT_QUERY
+        after = None
+        while True:
+            page = await self.repository.get_page_rows(after=after, limit=batch_size, query=query)
+            for row in page:
+                yield row
+            if len(page) < batch_size:
+                return
+            after = query.cursor(page[-1])
+
+    async def search_rows(self, search_term: str) -> List[BookRow]:
+        """Recherche des lignes par titre."""
+        return await self.repository.find_rows_by_title(search_term)
+
+    async def list_authors(self, after: Optional[AuthorCursor] = None, limit: int = 100,
+                           query: Optional[AuthorQuery] = None) -> List[dict]:
+        """Liste une page d'auteurs avec leur nombre de livres et leur note moyenne."""
+        return [format_author(row) for row in await self.repository.get_authors(after=after, limit=limit, query=query)]
+
+    async def list_author_rows(self, author: str, after: Optional[BookCursor] = None, limit: int = 100,
+                               query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Liste une page des livres d'un auteur ; AuthorNotFoundError s'il n'en a aucun."""
+        rows = await self.repository.get_page_rows(after=after, limit=limit, query=author_query(author, query))
+        if not rows and after is None:
+            raise AuthorNotFoundError(author)
+        return rows
+
+    async def delete_book(self, book_id: int) -> bool:
+        """Supprime un livre par son ID."""
+        if not await self.repository.remove_by_id(book_id):
+            raise BookNotFoundError(f"ID {book_id}")
+        return True
+
+    async def delete_books(self, ids: Optional[List[int]] = None, author: Optional[str] = None,
+                           year_min: Optional[int] = None, year_max: Optional[int] = None) -> int:
+        """Supprime en masse (voir BookService.delete_books)."""
+        if ids is None and author is None and year_min is None and year_max is None:
+            raise ValueError("Au moins un critère de suppression est requis (ids, author, year_min, year_max)")
+        return len(await self.repository.remove_many(ids, author, year_min, year_max))
+
+    async def update_book(self, book_id: int = None, title: str = None, author: str = None,
+                          year: int = None, rating: int = None) -> Book:
+        """Met à jour un livre existant."""
+        existing_book = await self.get_book_by_id(book_id)
+        updated_book = merge_update(existing_book, title, author, year, rating)
+        updated_book.id = book_id
+
+        result = await self.repository.update(updated_book)
+        if not result:
+            raise BookNotFoundError(f"ID {book_id}")
+        return result
+
+    async def patch_book(self, book_id: int, changes: dict) -> Book:
+        """Modifie uniquement les champs fournis (voir BookService.patch_book)."""
+        changes = validate_changes(changes)
+        if not changes:
+            return await self.get_book_by_id(book_id)
+        result = await self.repository.patch(book_id, changes)
+        if result is None:
+            raise BookNotFoundError(f"ID {book_id}")
+        return result
+
+    async def get_book_version(self, book_id: int) -> Optional[Tuple[int, Optional[datetime]]]:
+        """Version d'un livre (None s'il n'existe pas), sans construire le livre."""
+        return await self.repository.get_book_version(book_id)
+
+    async def get_collection_version(self) -> Tuple[int, Optional[datetime]]:
+        """Compteur de modifications de la collection."""
+        return await self.repository.get_collection_version()
+
+    async def get_statistics(self) -> dict:
+        """Retourne des statistiques sur la collection."""
+        return format_statistics(await self.repository.get_statistics())
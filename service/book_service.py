@@ -2,10 +2,102 @@
 Service métier pour gérer les livres.
 Dépend de l'INTERFACE IBookRepository, pas d'une implémentation concrète.
 """
-from typing import List, Optional
-from domain.book import Book
-from domain.exceptions import DuplicateBookError, BookNotFoundError
+from dataclasses import replace
+from datetime import datetime
+from typing import Iterator, List, Optional, Set, Tuple
+from domain.book import Book, BookRow, validate_changes
+from domain.exceptions import (
+    DuplicateBookError, BookNotFoundError, AuthorNotFoundError,
+    YearError, TitleError, AuthorError
+)
 from domain.ports import IBookRepository
+from domain.query import DEFAULT_QUERY, AuthorCursor, AuthorQuery, AuthorRow, BookCursor, BookQuery
+
+
+# Règles partagées entre BookService et AsyncBookService
+
+def validate_rows(rows: List[dict]) -> Tuple[List[dict], List[Tuple[int, Book]]]:
+    """
+    Valide chaque ligne d'un import via Book.
+    Retourne les résultats (rejets déjà renseignés) et les livres valides avec leur position.
+    """
+    results: List[dict] = [{} for _ in rows]
+    candidates = []
+    for position, row in enumerate(rows):
+        try:
+            book = Book(
+                row.get("title"),
+                row.get("author"),
+                row.get("year"),
+                rating=row.get("rating")
+            )
+        except (YearError, TitleError, AuthorError, ValueError, TypeError, AttributeError) as e:
+            results[position] = {"status": "rejected", "error": str(e)}
+            continue
+        candidates.append((position, book))
+    return results, candidates
+
+
+def record_created(batch: List[Tuple[int, Book]], results: List[dict]):
+    """Renseigne les résultats d'un lot inséré ; un livre sans ID a été ignoré (doublon concurrent)."""
+    for position, book in batch:
+        if book.id is None:
+            error = DuplicateBookError(book.title, book.author)
+            results[position] = {"status": "rejected", "error": str(error)}
+        else:
+            results[position] = {"status": "accepted", "id": book.id}
+
+
+def reject_duplicates(candidates: List[Tuple[int, Book]], seen: Set[Tuple[str, str]],
+                      results: List[dict]) -> List[Tuple[int, Book]]:
+    """Rejette les livres déjà en base (`seen`) ou répétés dans l'import."""
+    accepted = []
+    for position, book in candidates:
+        key = book.key
+        if key in seen:
+            error = DuplicateBookError(book.title, book.author)
+            results[position] = {"status": "rejected", "error": str(error)}
+            continue
+        seen.add(key)
+        accepted.append((position, book))
+    return accepted
+
+
+def merge_update(existing_book: Book, title: str = None, author: str = None,
+                 year: int = None, rating: int = None) -> Book:
+    """Applique les champs modifiés sur un livre existant (avec validation)."""
+    final_title = title if title is not None else existing_book.title
+    final_author = author if author is not None else existing_book.author
+    final_year = year if year is not None else existing_book.year
+    final_rating = rating if rating is not None else existing_book.rating
+    return Book(final_title, final_author, final_year, rating=final_rating, book_id=existing_book.id)
+
+
+def average_rating(rating_sum: int, rating_count: int) -> Optional[float]:
+    """Note moyenne arrondie au centième, None si aucun livre n'est noté."""
+    return round(rating_sum / rating_count, 2) if rating_count else None
+
+
+def format_statistics(stats: dict) -> dict:
+    """Construit la réponse de statistiques à partir des agrégats du repository."""
+    return {
+        "total": stats["total"],
+        "oldest": stats["oldest"],
+        "newest": stats["newest"],
+        "average_rating": average_rating(stats["rating_sum"], stats["rating_count"]),
+        "rating_distribution": stats["rating_distribution"],
+    }
+
+
+def format_author(row: AuthorRow) -> dict:
+    """Construit la réponse d'un auteur à partir de ses agrégats."""
+    name, book_count, rating_count, rating_sum = row
+    return {"name": name, "book_count": book_count, "average_rating": average_rating(rating_sum, rating_count)}
+
+
+def author_query(author: str, query: Optional[BookQuery]) -> BookQuery:
+    """Requête de liste restreinte aux livres d'un auteur."""
+    return replace(query or DEFAULT_QUERY, author=author)
 
 
 class BookService:
@@ -15,14 +107,35 @@ class BookService:
         self.repository = repository
 
     def create_book(self, title: str, author: str, year: int,  rating: int = None) -> Book:
-        """Crée et enregistre un nouveau livre."""
-        # Vérification des doublons
-        if self.repository.exists(title, author):
-            raise DuplicateBookError(title, author)
-        
+        """
+        Crée et enregistre un nouveau livre.
+        L'insertion et la détection des doublons se font en une seule opération atomique.
+        """
         book = Book(title, author, year, rating=rating)
-        return self.repository.add(book)
+        created = self.repository.add_if_absent(book)
+        if created is None:
+            raise DuplicateBookError(title, author)
+        return created
 
+    def create_books(self, rows: List[dict], batch_size: int = 500) -> List[dict]:
+        """
+        Crée des livres en masse.
+        Chaque ligne est validée par Book, les doublons sont détectés en une requête
+        ensembliste et les insertions sont faites par lots transactionnels.
+        Retourne un résultat par ligne, dans l'ordre : accepted (avec l'ID) ou rejected.
+        """
+        results, candidates = validate_rows(rows)
+        
+        # Doublons : déjà en base ou répétés dans l'import
+        seen = self.repository.existing_keys({book.key for _, book in candidates})
+        accepted = reject_duplicates(candidates, seen, results)
+        
+        for start in range(0, len(accepted), batch_size):
+            batch = accepted[start:start + batch_size]
+            self.repository.add_many([book for _, book in batch])
+            record_created(batch, results)
+        return results
+    
     def get_book_by_id(self, book_id: int) -> Book:
         """Récupère un livre par son ID."""
         book = self.repository.get_by_id(book_id)
@@ -34,10 +147,58 @@ class BookService:
         """Liste tous les livres."""
         return self.repository.get_all()
     
+    def export_books(self) -> Iterator[BookRow]:
+        """Parcourt tous les livres en lignes, page par page, pour un export de taille quelconque."""
+        return self.iter_rows()
+    
     def search_books(self, search_term: str) -> List[Book]:
         """Recherche des livres par titre."""
         return self.repository.find_by_title(search_term)
     
+    # Lectures rapides pour l'API : lignes (id, title, author, year, rating)
+    
+    def list_all_rows(self, query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Liste tous les livres sous forme de lignes, filtrées et triées selon `query`."""
+        return self.repository.get_all_rows(query)
+    
+    def list_rows_page(self, after: Optional[BookCursor] = None, limit: int = 100,
+                       query: Optional[BookQuery] = None) -> List[BookRow]:
+        """Liste une page de lignes après le curseur `after`."""
+        return self.repository.get_page_rows(after=after, limit=limit, query=query)
+    
+    def iter_rows(self, query: Optional[BookQuery] = None, batch_size: int = 500) -> Iterator[BookRow]:
+        """Parcourt les lignes page par page (curseur (valeur triée, id)), sans tout charger en mémoire."""
+        query = query or DEFAULT_QUERY
+        after = None
+        while True:
+            page = self.repository.get_page_rows(after=after, limit=batch_size, query=query)
+            yield from page
+            if len(page) < batch_size:
+                return
+            after = query.cursor(page[-1])
+    
+    def search_rows(self, search_term: str) -> List[BookRow]:
+        """Recherche des lignes par titre."""
+        return self.repository.find_rows_by_title(search_term)
+    
+    # Auteurs
+    
+    def list_authors(self, after: Optional[AuthorCursor] = None, limit: int = 100,
+                     query: Optional[AuthorQuery] = None) -> List[dict]:
+        """Liste une page d'auteurs avec leur nombre de livres et leur note moyenne."""
+        return [format_author(row) for row in self.repository.get_authors(after=after, limit=limit, query=query)]
+    
+    def list_author_rows(self, author: str, after: Optional[BookCursor] = None, limit: int = 100,
+                         query: Optional[BookQuery] = None) -> List[BookRow]:
+        """
+        Liste une page des livres d'un auteur (casse et espaces autour ignorés).
+        Lève AuthorNotFoundError si l'auteur n'a aucun livre.
+        """
+        rows = self.repository.get_page_rows(after=after, limit=limit, query=author_query(author, query))
+        if not rows and after is None:
+            raise AuthorNotFoundError(author)
+        return rows
+    
     def delete_book(self, book_id: int) -> bool:
         """Supprime un livre par son ID."""
         success = self.repository.remove_by_id(book_id)
@@ -45,17 +206,24 @@ class BookService:
             raise BookNotFoundError(f"ID {book_id}")
         return True
     
+    def delete_books(self, ids: Optional[List[int]] = None, author: Optional[str] = None,
+                     year_min: Optional[int] = None, year_max: Optional[int] = None) -> int:
+        """
+        Supprime en masse les livres correspondant à tous les critères fournis.
+        Retourne le nombre de livres supprimés ; au moins un critère est exigé.
+        """
+        if ids is None and author is None and year_min is None and year_max is None:
+            raise ValueError("Au moins un critère de suppression est requis (ids, author, year_min, year_max)")
+        return len(self.repository.remove_many(ids, author, year_min, year_max))
+    
     def update_book(self, book_id: int = None, title: str = None, author: str = None, year: int = None, rating: int = None) -> Book:
         """Met à jour un livre existant."""
         # Vérifier que le livre existe
         existing_book = self.get_book_by_id(book_id)
-        final_title = title if title is not None else existing_book.title
-        final_author = author if author is not None else existing_book.author
-        final_year = year if year is not None else existing_book.year
-        final_rating = rating if rating is not None else existing_book.rating
         
         # Créer le livre mis à jour (avec validation)
-        updated_book = Book(final_title, final_author, final_year, rating=final_rating, book_id=book_id)
+        updated_book = merge_update(existing_book, title, author, year, rating)
+        updated_book.id = book_id
         
         # Sauvegarder
         result = self.repository.update(updated_book)
@@ -63,15 +231,27 @@ class BookService:
             raise BookNotFoundError(f"ID {book_id}")
         return result
     
+    def patch_book(self, book_id: int, changes: dict) -> Book:
+        """
+        Modifie uniquement les champs fournis, validés avec les règles de Book.
+        Un seul aller-retour vers la base (UPDATE ... RETURNING), sans lecture préalable.
+        """
+        changes = validate_changes(changes)
+        if not changes:
+            return self.get_book_by_id(book_id)
+        result = self.repository.patch(book_id, changes)
+        if result is None:
+            raise BookNotFoundError(f"ID {book_id}")
+        return result
+    
+    def get_book_version(self, book_id: int) -> Optional[Tuple[int, Optional[datetime]]]:
+        """Version d'un livre (None s'il n'existe pas), sans construire le livre."""
+        return self.repository.get_book_version(book_id)
+    
+    def get_collection_version(self) -> Tuple[int, Optional[datetime]]:
+        """Compteur de modifications de la collection."""
+        return self.repository.get_collection_version()
+    
     def get_statistics(self) -> dict:
         """Retourne des statistiques sur la collection."""
-        books = self.repository.get_all()
-        if not books:
-            return {"total": 0, "oldest": None, "newest": None}
-        
-        years = [book.year for book in books]
-        return {
-            "total": len(books),
-            "oldest": min(years),
-            "newest": max(years)
-        }
+        return format_statistics(self.repository.get_statistics())
@@ -8,6 +8,7 @@ from sqlalchemy.pool import StaticPool
 # Imports de votre application
 from main import app
 from adapters.database import Base, get_db
+from adapters.migrations import migrate
 
 # Indiquer qu'on est en mode test
 os.environ["TESTING"] = "1"
@@ -24,7 +25,7 @@ def test_engine():
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
-    Base.metadata.create_all(bind=engine)
+    migrate(engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
 
@@ -53,4 +54,34 @@ def client(test_db):
     
     yield TestClient(app)
     
-    app.dependency_overrides.clear()
\ No newline at end of file
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def async_client():
+    """Client de test pour les routes asynchrones (aiosqlite en mémoire)."""
+    import asyncio
+    from fastapi import FastAPI
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from adapters.database import get_async_db
+    from api.async_routes import authors_router, router as async_router
+    
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    
+    async def setup():
+        async with engine.connect() as connection:
+            await connection.run_sync(migrate)
+    asyncio.run(setup())
+    
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+    
+    async_app = FastAPI()
+    async_app.include_router(async_router)
+    async_app.include_router(authors_router)
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    
+    yield TestClient(async_app)
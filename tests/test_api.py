@@ -1,4 +1,7 @@
 """Tests de l'API REST."""
+import csv
+import io
+import json
 
 
 def test_root_endpoint(client):
@@ -189,3 +192,415 @@ def test_get_statistics(client):
     assert data["oldest"] == 1950
     assert data["newest"] == 2020
 
+
+def test_get_statistics_ratings(client):
+    """Test : Note moyenne et distribution des notes."""
+    client.post("/books/", json={"title": "Book 1", "author": "Author", "year": 2000, "rating": 5})
+    client.post("/books/", json={"title": "Book 2", "author": "Author", "year": 2001, "rating": 4})
+    client.post("/books/", json={"title": "Book 3", "author": "Author", "year": 2002})
+    
+    response = client.get("/books/stats")
+    
+    data = response.json()
+    assert data["total"] == 3
+    assert data["average_rating"] == 4.5
+    assert data["rating_distribution"] == {"1": 0, "2": 0, "3": 0, "4": 1, "5": 1}
+
+
+def test_get_statistics_empty(client):
+    """Test : Statistiques d'une bibliothèque vide."""
+    response = client.get("/books/stats")
+    
+    data = response.json()
+    assert data["total"] == 0
+    assert data["oldest"] is None
+    assert data["average_rating"] is None
+
+
+
+def test_list_books_paginated(client):
+    """Test : Pagination par curseur."""
+    for i in range(5):
+        client.post("/books/", json={
+            "title": f"Book {i}",
+            "author": "Author",
+            "year": 2000 + i
+        })
+    
+    # Première page
+    response = client.get("/books/?limit=2")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert [book["title"] for book in data] == ["Book 0", "Book 1"]
+    cursor = response.headers["X-Next-Cursor"]
+    
+    # Page suivante
+    response = client.get(f"/books/?limit=2&after={cursor}")
+    data = response.json()
+    assert [book["title"] for book in data] == ["Book 2", "Book 3"]
+    
+    # Dernière page : pas de curseur suivant
+    response = client.get(f"/books/?limit=2&after={response.headers['X-Next-Cursor']}")
+    assert [book["title"] for book in response.json()] == ["Book 4"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_list_and_search_fast_path_shape(client):
+    """Test : Les lectures rapides gardent la forme et le schéma OpenAPI de BookResponse."""
+    client.post("/books/", json={"title": "Dune", "author": "Herbert", "year": 1965, "rating": 5})
+    client.post("/books/", json={"title": "Dune Messiah", "author": "Herbert", "year": 1969})
+    expected = [
+        {"id": 1, "title": "Dune", "author": "Herbert", "year": 1965, "rating": 5},
+        {"id": 2, "title": "Dune Messiah", "author": "Herbert", "year": 1969, "rating": None},
+    ]
+    
+    assert client.get("/books/").json() == expected
+    assert client.get("/books/?limit=10").json() == expected
+    assert client.get("/books/search?q=dune").json() == expected
+    assert client.get("/books/search?q=dune").headers["content-type"] == "application/json"
+    
+    schema = client.get("/openapi.json").json()["paths"]["/books/search"]["get"]["responses"]["200"]
+    assert schema["content"]["application/json"]["schema"]["items"]["$ref"].endswith("/BookResponse")
+
+
+def test_list_books_filtered_and_sorted(client):
+    """Test : Filtres et tri de la liste, en pagination et en flux."""
+    for title, author, year, rating in [
+        ("Dune", "Frank Herbert", 1965, 5),
+        ("Foundation", "Isaac Asimov", 1951, 4),
+        ("Children of Dune", "Frank Herbert", 1976, 4),
+        ("Dune Messiah", "Frank Herbert", 1969, 3),
+    ]:
+        client.post("/books/", json={"title": title, "author": author, "year": year, "rating": rating})
+    params = "author=frank%20herbert&year_min=1960&rating_min=4&sort=year&order=desc"
+    
+    assert [book["title"] for book in client.get(f"/books/?{params}").json()] == ["Children of Dune", "Dune"]
+    assert [book["title"] for book in client.get(f"/books/?{params}&stream=true").json()] == ["Children of Dune", "Dune"]
+    
+    response = client.get(f"/books/?{params}&limit=1")
+    assert [book["title"] for book in response.json()] == ["Children of Dune"]
+    cursor = response.headers["X-Next-Cursor"]
+    assert cursor == "%5B1976%2C3%5D"
+    # Le livre du curseur est supprimé : la page suivante ne change pas
+    client.delete("/books/3")
+    response = client.get(f"/books/?{params}&limit=1&after={cursor}")
+    assert [book["title"] for book in response.json()] == ["Dune"]
+    
+    assert client.get("/books/?sort=year&limit=1&after=3").status_code == 400
+    assert client.get("/books/?sort=year&limit=1&after=%5B%22x%22%2C3%5D").status_code == 400
+    assert client.get("/books/?sort=isbn").status_code == 422
+    assert client.get("/books/?rating_min=6").status_code == 422
+
+
+def test_list_authors(client):
+    """Test : Auteurs avec nombre de livres et note moyenne, paginés et triés."""
+    for title, author, year, rating in [
+        ("Dune", "Frank Herbert", 1965, 5),
+        ("Dune Messiah", "frank herbert", 1969, 2),
+        ("Foundation", "Isaac Asimov", 1951, None),
+        ("I, Robot", "Isaac Asimov", 1950, 4),
+        ("Earthsea", "Ursula Le Guin", 1968, None),
+    ]:
+        client.post("/books/", json={"title": title, "author": author, "year": year, "rating": rating})
+    
+    response = client.get("/authors/?sort=count&order=desc&limit=2")
+    assert response.status_code == 200
+    # À nombre égal, l'ordre décroissant porte aussi sur le nom
+    assert response.json() == [
+        {"name": "Isaac Asimov", "book_count": 2, "average_rating": 4.0},
+        {"name": "Frank Herbert", "book_count": 2, "average_rating": 3.5},
+    ]
+    
+    response = client.get(f"/authors/?sort=count&order=desc&limit=2&after={response.headers['X-Next-Cursor']}")
+    assert response.json() == [{"name": "Ursula Le Guin", "book_count": 1, "average_rating": None}]
+    assert "X-Next-Cursor" not in response.headers
+    assert client.get("/authors/?sort=count&after=Isaac%20Asimov").status_code == 400
+
+
+def test_list_author_books(client):
+    """Test : Livres d'un auteur, par année, 404 pour un auteur inconnu."""
+    client.post("/books/", json={"title": "Dune Messiah", "author": "Frank Herbert", "year": 1969})
+    client.post("/books/", json={"title": "Dune", "author": "frank herbert", "year": 1965})
+    client.post("/books/", json={"title": "Foundation", "author": "Isaac Asimov", "year": 1951})
+    
+    response = client.get("/authors/FRANK HERBERT/books")
+    assert [book["title"] for book in response.json()] == ["Dune", "Dune Messiah"]
+    
+    response = client.get("/authors/Frank Herbert/books?limit=1&order=desc")
+    assert [book["title"] for book in response.json()] == ["Dune Messiah"]
+    response = client.get(f"/authors/Frank Herbert/books?limit=1&order=desc&after={response.headers['X-Next-Cursor']}")
+    assert [book["title"] for book in response.json()] == ["Dune"]
+    
+    assert client.get("/authors/Nobody/books").status_code == 404
+
+
+def test_list_books_stream(client):
+    """Test : Liste diffusée en continu."""
+    client.post("/books/", json={
+        "title": "Book 1",
+        "author": "Author 1",
+        "year": 2000
+    })
+    client.post("/books/", json={
+        "title": "Book 2",
+        "author": "Author 2",
+        "year": 2001
+    })
+    
+    response = client.get("/books/?stream=true")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 2
+    assert data[1]["title"] == "Book 2"
+
+
+def test_list_books_stream_empty(client):
+    """Test : Liste diffusée vide."""
+    response = client.get("/books/?stream=true")
+    
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_bulk_import_json(client):
+    """Test : Import en masse d'un tableau JSON."""
+    client.post("/books/", json={"title": "Dune", "author": "Herbert", "year": 1965})
+    
+    response = client.post("/books/bulk", json=[
+        {"title": "1984", "author": "George Orwell", "year": 1949},
+        {"title": "dune", "author": "HERBERT", "year": 1965},
+        {"title": "", "author": "Nobody", "year": 2000},
+        {"title": "1984", "author": "George Orwell", "year": 1949},
+        {"title": "Neuromancer", "author": "Gibson", "year": 1984, "rating": 5},
+    ])
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["accepted"] == 2
+    assert data["rejected"] == 3
+    assert [row["status"] for row in data["results"]] == [
+        "accepted", "rejected", "rejected", "rejected", "accepted"
+    ]
+    assert data["results"][0]["line"] == 1
+    assert "existe déjà" in data["results"][1]["error"]
+    assert client.get("/books/stats").json()["total"] == 3
+
+
+def test_bulk_import_ndjson(client):
+    """Test : Import en masse au format NDJSON."""
+    body = (
+        '{"title": "1984", "author": "George Orwell", "year": 1949}\n'
+        'not json\n'
+        '{"title": "Dune", "author": "Herbert", "year": 3000}\n'
+    )
+    
+    response = client.post("/books/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    
+    data = response.json()
+    assert data["accepted"] == 1
+    assert [(row["line"], row["status"]) for row in data["results"]] == [
+        (1, "accepted"), (2, "rejected"), (3, "rejected")
+    ]
+
+
+def test_bulk_import_csv(client):
+    """Test : Import en masse au format CSV."""
+    body = "title,author,year,rating\n1984,George Orwell,1949,4\nDune,Herbert,abc,\nFoundation,Asimov,1951,\n"
+    
+    response = client.post("/books/bulk", content=body, headers={"Content-Type": "text/csv"})
+    
+    data = response.json()
+    assert data["accepted"] == 2
+    assert [(row["line"], row["status"]) for row in data["results"]] == [
+        (2, "accepted"), (3, "rejected"), (4, "accepted")
+    ]
+    books = client.get("/books/").json()
+    assert books[0]["rating"] == 4
+    assert books[1]["rating"] is None
+
+
+def test_bulk_import_unsupported_format(client):
+    """Test : Format d'import non supporté."""
+    response = client.post("/books/bulk", content="<books/>", headers={"Content-Type": "application/xml"})
+    
+    assert response.status_code == 415
+
+
+def test_export_ndjson(client):
+    """Test : Export NDJSON."""
+    client.post("/books/", json={"title": "1984", "author": "George Orwell", "year": 1949, "rating": 5})
+    client.post("/books/", json={"title": "Dune", "author": "Herbert", "year": 1965})
+    
+    response = client.get("/books/export?format=ndjson")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [book["title"] for book in lines] == ["1984", "Dune"]
+    assert lines[0]["rating"] == 5
+
+
+def test_export_csv(client):
+    """Test : Export CSV."""
+    client.post("/books/", json={"title": "Dune, tome 1", "author": "Herbert", "year": 1965})
+    
+    response = client.get("/books/export?format=csv")
+    
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "title", "author", "year", "rating"]
+    assert rows[1][1:4] == ["Dune, tome 1", "Herbert", "1965"]
+
+
+def test_export_invalid_format(client):
+    """Test : Format d'export invalide."""
+    response = client.get("/books/export?format=xml")
+    
+    assert response.status_code == 422
+
+
+def test_cache_stats(client):
+    """Test : Les compteurs du cache sont exposés."""
+    response = client.get("/books/cache/stats")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert "enabled" in data
+    assert set(data["caches"]) == {"by_id", "search", "count", "statistics"}
+
+
+def test_get_book_etag(client):
+    """Test : GET conditionnel sur un livre."""
+    book_id = client.post("/books/", json={"title": "Dune", "author": "Herbert", "year": 1965}).json()["id"]
+    
+    response = client.get(f"/books/{book_id}")
+    etag = response.headers["ETag"]
+    assert "Last-Modified" in response.headers
+    
+    # Même version : 304 sans corps
+    response = client.get(f"/books/{book_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    
+    # Après modification : nouvel ETag
+    client.put(f"/books/{book_id}", json={"rating": 5})
+    response = client.get(f"/books/{book_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_list_and_stats_etag(client):
+    """Test : GET conditionnel sur la liste et les statistiques."""
+    client.post("/books/", json={"title": "Dune", "author": "Herbert", "year": 1965})
+    list_etag = client.get("/books/").headers["ETag"]
+    stats_etag = client.get("/books/stats").headers["ETag"]
+    
+    assert client.get("/books/", headers={"If-None-Match": list_etag}).status_code == 304
+    assert client.get("/books/stats", headers={"If-None-Match": stats_etag}).status_code == 304
+    # Les paramètres de la requête font partie de l'ETag
+    assert client.get("/books/?limit=1", headers={"If-None-Match": list_etag}).status_code == 200
+    
+    # Toute écriture change la version de la collection
+    client.post("/books/", json={"title": "1984", "author": "Orwell", "year": 1949})
+    assert client.get("/books/", headers={"If-None-Match": list_etag}).status_code == 200
+    assert client.get("/books/stats", headers={"If-None-Match": stats_etag}).status_code == 200
+
+
+def test_create_duplicate_book_ignores_case_and_spaces(client):
+    """Test : Un doublon à la casse et aux espaces près est refusé."""
+    client.post("/books/", json={"title": "Dune", "author": "Frank Herbert", "year": 1965})
+    
+    response = client.post("/books/", json={"title": " DUNE  ", "author": "frank herbert", "year": 1965})
+    
+    assert response.status_code == 409
+
+
+def test_update_book_to_duplicate(client):
+    """Test : Renommer un livre en doublon retourne 409."""
+    client.post("/books/", json={"title": "Dune", "author": "Herbert", "year": 1965})
+    book_id = client.post("/books/", json={"title": "1984", "author": "Orwell", "year": 1949}).json()["id"]
+    
+    response = client.put(f"/books/{book_id}", json={"title": "Dune", "author": "Herbert"})
+    
+    assert response.status_code == 409
+
+
+def test_patch_book(client):
+    """Test : PATCH ne modifie que les champs envoyés."""
+    book_id = client.post("/books/", json={"title": "Dune", "author": "Herbert", "year": 1965, "rating": 3}).json()["id"]
+    
+    response = client.patch(f"/books/{book_id}", json={"title": "Dune Messiah", "rating": None})
+    
+    assert response.status_code == 200
+    assert response.json() == {"id": book_id, "title": "Dune Messiah", "author": "Herbert", "year": 1965, "rating": None}
+    assert client.get(f"/books/{book_id}").json()["title"] == "Dune Messiah"
+
+
+def test_patch_book_errors(client):
+    """Test : PATCH retourne 404, 409 ou 400 selon le cas."""
+    client.post("/books/", json={"title": "Dune", "author": "Herbert", "year": 1965})
+    book_id = client.post("/books/", json={"title": "1984", "author": "Orwell", "year": 1949}).json()["id"]
+    
+    assert client.patch("/books/999", json={"year": 2000}).status_code == 404
+    assert client.patch(f"/books/{book_id}", json={"title": "dune", "author": "HERBERT"}).status_code == 409
+    assert client.patch(f"/books/{book_id}", json={"title": None}).status_code == 400
+
+
+def test_bulk_delete_books(client):
+    """Test : DELETE /books/ par IDs ou par filtre retourne le nombre de livres supprimés."""
+    ids = [
+        client.post("/books/", json={"title": title, "author": author, "year": year}).json()["id"]
+        for title, author, year in [("Dune", "Herbert", 1965), ("Dune Messiah", "Herbert", 1969), ("1984", "Orwell", 1949)]
+    ]
+    
+    response = client.request("DELETE", "/books/", json={"author": "herbert", "year_max": 1966})
+    assert response.status_code == 200
+    assert response.json() == {"deleted": 1}
+    
+    response = client.request("DELETE", "/books/", json={"ids": ids})
+    assert response.json() == {"deleted": 2}
+    assert client.get("/books/").json() == []
+
+
+def test_bulk_delete_requires_criteria(client):
+    """Test : DELETE /books/ sans critère est refusé."""
+    client.post("/books/", json={"title": "Dune", "author": "Herbert", "year": 1965})
+    
+    response = client.request("DELETE", "/books/", json={})
+    
+    assert response.status_code == 400
+    assert len(client.get("/books/").json()) == 1
+
+
+def test_coalescing_stats(client, monkeypatch):
+    """Test : Compteurs de regroupement des lectures (désactivé par défaut)."""
+    assert client.get("/books/coalescing/stats").json()["enabled"] is False
+    monkeypatch.setattr("api.routes.COALESCING_ENABLED", True)
+    client.get("/books/stats")
+    
+    response = client.get("/books/coalescing/stats")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["enabled"] is True
+    assert data["methods"]["get_statistics"]["executed"] >= 1
+
+
+def test_batching_stats(client):
+    """Test : Compteurs du regroupement des écritures (désactivé par défaut)."""
+    response = client.get("/books/batching/stats")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["enabled"] is False
+    assert {"batches", "writes", "replayed", "largest"} <= set(data)
+
+
+def test_get_pool_stats(client):
+    """Test : L'état du pool de connexions est exposé."""
+    response = client.get("/books/pool/stats")
+    
+    assert response.status_code == 200
+    assert {"checked_out", "overflow", "checkouts", "timeouts", "wait_seconds_total"} <= set(response.json())
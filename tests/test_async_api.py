@@ -0,0 +1,125 @@
+"""Tests de l'API REST asynchrone (USE_ASYNC_DB=1)."""
+import json
+
+
+def test_async_crud(async_client):
+    """Test : Créer, lire, modifier et supprimer un livre."""
+    response = async_client.post("/books/", json={"title": "1984", "author": "George Orwell", "year": 1949})
+    assert response.status_code == 201
+    book_id = response.json()["id"]
+    
+    assert async_client.get(f"/books/{book_id}").json()["title"] == "1984"
+    
+    response = async_client.put(f"/books/{book_id}", json={"rating": 5})
+    assert response.json()["rating"] == 5
+    assert response.json()["title"] == "1984"
+    
+    assert async_client.delete(f"/books/{book_id}").status_code == 204
+    assert async_client.get(f"/books/{book_id}").status_code == 404
+    assert async_client.delete(f"/books/{book_id}").status_code == 404
+
+
+def test_async_duplicate_book(async_client):
+    """Test : Un doublon est refusé."""
+    async_client.post("/books/", json={"title": "Dune", "author": "Herbert", "year": 1965})
+    
+    response = async_client.post("/books/", json={"title": "DUNE", "author": "herbert", "year": 1965})
+    
+    assert response.status_code == 409
+    
+    other_id = async_client.post("/books/", json={"title": "1984", "author": "Orwell", "year": 1949}).json()["id"]
+    response = async_client.put(f"/books/{other_id}", json={"title": " dune ", "author": "HERBERT"})
+    assert response.status_code == 409
+    response = async_client.patch(f"/books/{other_id}", json={"title": " dune ", "author": "HERBERT"})
+    assert response.status_code == 409
+
+
+def test_async_patch_book(async_client):
+    """Test : PATCH ne modifie que les champs envoyés."""
+    book_id = async_client.post("/books/", json={"title": "Dune", "author": "Herbert", "year": 1965}).json()["id"]
+    
+    response = async_client.patch(f"/books/{book_id}", json={"rating": 4})
+    
+    assert response.json() == {"id": book_id, "title": "Dune", "author": "Herbert", "year": 1965, "rating": 4}
+    assert async_client.patch("/books/999", json={"rating": 4}).status_code == 404
+
+
+def test_async_list_search_and_stats(async_client):
+    """Test : Liste paginée, recherche et statistiques."""
+    async_client.post("/books/bulk", json=[
+        {"title": "Python Programming", "author": "Author", "year": 2020, "rating": 4},
+        {"title": "JavaScript Guide", "author": "Author", "year": 2021},
+        {"title": "Python Cookbook", "author": "Author", "year": 2013, "rating": 5},
+    ])
+    
+    page = async_client.get("/books/?limit=2")
+    assert len(page.json()) == 2
+    assert page.headers["X-Next-Cursor"] == str(page.json()[-1]["id"])
+    assert len(async_client.get("/books/?stream=true").json()) == 3
+    assert [book["title"] for book in async_client.get("/books/?rating_min=4&sort=rating&order=desc").json()] == [
+        "Python Cookbook", "Python Programming"
+    ]
+    assert [book["year"] for book in async_client.get("/books/?year_max=2020&sort=year&stream=true").json()] == [
+        2013, 2020
+    ]
+    page = async_client.get("/books/?sort=year&limit=2")
+    page = async_client.get(f"/books/?sort=year&limit=2&after={page.headers['X-Next-Cursor']}")
+    assert [book["year"] for book in page.json()] == [2021]
+    
+    assert [book["title"] for book in async_client.get("/books/search?q=python").json()] == [
+        "Python Programming", "Python Cookbook"
+    ]
+    
+    stats = async_client.get("/books/stats").json()
+    assert stats["total"] == 3
+    assert stats["oldest"] == 2013
+    assert stats["average_rating"] == 4.5
+
+
+def test_async_authors(async_client):
+    """Test : Auteurs et livres d'un auteur."""
+    async_client.post("/books/bulk", json=[
+        {"title": "Dune", "author": "Frank Herbert", "year": 1965, "rating": 5},
+        {"title": "Dune Messiah", "author": "Frank Herbert", "year": 1969, "rating": 4},
+        {"title": "Foundation", "author": "Isaac Asimov", "year": 1951},
+    ])
+    
+    assert async_client.get("/authors/?sort=count&order=desc").json() == [
+        {"name": "Frank Herbert", "book_count": 2, "average_rating": 4.5},
+        {"name": "Isaac Asimov", "book_count": 1, "average_rating": None},
+    ]
+    assert [book["year"] for book in async_client.get("/authors/frank herbert/books").json()] == [1965, 1969]
+    assert async_client.get("/authors/Nobody/books").status_code == 404
+
+
+def test_async_export(async_client):
+    """Test : Export NDJSON en flux."""
+    async_client.post("/books/", json={"title": "1984", "author": "George Orwell", "year": 1949})
+    
+    response = async_client.get("/books/export?format=ndjson")
+    
+    assert [json.loads(line)["title"] for line in response.text.splitlines()] == ["1984"]
+
+
+def test_async_get_book_etag(async_client):
+    """Test : GET conditionnel sur la pile asynchrone."""
+    book_id = async_client.post("/books/", json={"title": "Dune", "author": "Herbert", "year": 1965}).json()["id"]
+    etag = async_client.get(f"/books/{book_id}").headers["ETag"]
+    
+    assert async_client.get(f"/books/{book_id}", headers={"If-None-Match": etag}).status_code == 304
+    
+    async_client.put(f"/books/{book_id}", json={"rating": 4})
+    assert async_client.get(f"/books/{book_id}", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_async_bulk_delete(async_client):
+    """Test : Suppression en masse par filtre."""
+    async_client.post("/books/bulk", json=[
+        {"title": "Dune", "author": "Herbert", "year": 1965},
+        {"title": "1984", "author": "Orwell", "year": 1949},
+    ])
+    
+    response = async_client.request("DELETE", "/books/", json={"year_min": 1960})
+    
+    assert response.json() == {"deleted": 1}
+    assert [book["title"] for book in async_client.get("/books/").json()] == ["1984"]
@@ -0,0 +1,124 @@
+"""
+Tests de la suite de benchmarks : couverture du port et des routes, détection des régressions.
+"""
+from benchmarks import batching_bench, book_bench, compression_bench, repository_bench, schema_bench
+from benchmarks.api_bench import ApiWorkload, route_templates
+from benchmarks.catalog import generate_catalog
+from benchmarks.harness import best_of, find_regressions, measure, ungated
+from benchmarks.repository_bench import RepositoryWorkload, run_repository_benchmarks
+from adapters.repositories.in_memory_repository import InMemoryBookRepository
+from domain.ports import IBookRepository
+
+
+def test_catalog_is_deterministic_and_unique():
+    """Test : Même graine, même catalogue, sans doublon"""
+    catalog = generate_catalog(500)
+    
+    assert [book.key for book in catalog] == [book.key for book in generate_catalog(500)]
+    assert len({book.key for book in catalog}) == 500
+
+
+def test_repository_workload_covers_every_port_method():
+    """Test : Chaque méthode du port a son cas de mesure"""
+    workload = RepositoryWorkload(InMemoryBookRepository(), 100)
+    
+    assert {name for name, _, _ in workload.cases()} == set(IBookRepository.__abstractmethods__)
+
+
+def test_api_workload_covers_every_route():
+    """Test : Chaque route a sa fabrique de requêtes"""
+    assert set(ApiWorkload(100).routes()) == set(route_templates())
+
+
+def test_measure_summarizes_durations():
+    """Test : Une mesure produit médiane, percentiles et débit"""
+    calls = []
+    
+    result = measure("case", lambda: calls.append(1), repeat=20, warmup=2)
+    
+    assert len(calls) == 22
+    assert result["runs"] == 20
+    assert result["median"] <= result["p95"] <= result["p99"]
+
+
+def test_find_regressions():
+    """Test : Seuls les cas nettement plus lents que leur référence sont signalés"""
+    baselines = {"slow": {"median": 0.01}, "noise": {"median": 0.000_01}, "ok": {"median": 0.01}}
+    results = [
+        {"name": "slow", "median": 0.02},
+        {"name": "noise", "median": 0.000_03},
+        {"name": "ok", "median": 0.012},
+        {"name": "new", "median": 1.0},
+    ]
+    
+    regressions = find_regressions(results, baselines, threshold=0.5)
+    
+    assert [regression["name"] for regression in regressions] == ["slow"]
+    assert regressions[0]["ratio"] == 2.0
+    assert ungated(results, baselines) == ["new"]
+
+
+def test_best_of_keeps_fastest_run():
+    """Test : Avec plusieurs exécutions, on garde la meilleure médiane de chaque cas"""
+    runs = [
+        [{"name": "a", "median": 2.0}, {"name": "b", "median": 1.0}],
+        [{"name": "a", "median": 1.0}, {"name": "b", "median": 3.0}],
+    ]
+    
+    assert {result["name"]: result["median"] for result in best_of(runs)} == {"a": 1.0, "b": 1.0}
+
+
+def test_repository_benchmarks_smoke(tmp_path, monkeypatch):
+    """Test : La suite repository tourne de bout en bout sur un petit catalogue"""
+    monkeypatch.setattr(repository_bench, "POINT_REPEAT", 10)
+    
+    results = run_repository_benchmarks(200, tmp_path)
+    
+    assert len(results) == 3 * len(IBookRepository.__abstractmethods__)
+    assert all(result["median"] >= 0 for result in results)
+
+
+def test_book_benchmarks_report_memory(monkeypatch):
+    """Test : Le benchmark de Book mesure le temps et la mémoire de chaque chemin"""
+    monkeypatch.setattr(book_bench, "REPEAT", 2)
+    
+    results = {result["name"]: result for result in book_bench.run_book_benchmarks(200)}
+    
+    assert set(results) == {"book/200/validated", "book/200/from_storage", "book/200/dict_layout"}
+    assert results["book/200/from_storage"]["bytes_per_object"] < results["book/200/dict_layout"]["bytes_per_object"]
+
+
+def test_compression_benchmarks_report_wire_bytes(monkeypatch):
+    """Test : Le benchmark de compression mesure octets transmis et CPU par requête"""
+    monkeypatch.setattr(compression_bench, "REPEAT", 2)
+    
+    results = {result["name"]: result for result in compression_bench.run_compression_benchmarks(200)}
+    
+    for mode in ("full", "stream"):
+        identity = results[f"compression/200/{mode}/identity"]
+        gzip = results[f"compression/200/{mode}/gzip"]
+        assert gzip["wire_bytes"] < identity["wire_bytes"] / 2
+        assert gzip["cpu_per_request"] > 0
+
+
+def test_batching_benchmarks_compare_modes(monkeypatch, tmp_path):
+    """Test : Le benchmark des écritures mesure les deux modes, toutes les écritures comprises"""
+    monkeypatch.setattr(batching_bench, "WRITERS", 3)
+    monkeypatch.setattr(batching_bench, "WRITES_PER_WRITER", 2)
+    
+    results = batching_bench.run_batching_benchmarks(tmp_path)
+    
+    assert [result["name"] for result in results] == [
+        "batching/3-writers/direct/add_if_absent", "batching/3-writers/batched/add_if_absent",
+    ]
+    assert all(result["runs"] == 6 for result in results)
+
+
+def test_schema_benchmarks_count_startup_queries(monkeypatch, tmp_path):
+    """Test : Sur une base à jour, le démarrage versionné émet moins de requêtes que create_all"""
+    monkeypatch.setattr(schema_bench, "REPEAT", 2)
+    
+    create_all, versioned = schema_bench.run_schema_benchmarks(tmp_path)
+    
+    assert (create_all["name"], versioned["name"]) == ("schema/startup/create_all", "schema/startup/versioned")
+    assert versioned["statements"] < create_all["statements"]
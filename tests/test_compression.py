@@ -0,0 +1,123 @@
+"""
+Tests de la compression des réponses (négociation, seuil, flux).
+"""
+import asyncio
+import gzip
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+from api import compression
+from api.compression import CompressionMiddleware, negotiate
+
+
+LARGE = {"books": [{"id": i, "title": f"Book {i}", "author": "Author", "year": 2000} for i in range(200)]}
+
+
+@pytest.fixture
+def compressed_client():
+    """Application minimale derrière le middleware (gzip seul, comme sans brotli)."""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    
+    @app.get("/small")
+    def small():
+        return {"status": "ok"}
+    
+    @app.get("/large")
+    def large():
+        return LARGE
+    
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((f"line {i}\n" for i in range(5000)), media_type="application/x-ndjson")
+    
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+    
+    @app.get("/tiny-stream")
+    def tiny_stream():
+        return StreamingResponse(iter(["a", "b"]), media_type="text/plain")
+    
+    return TestClient(app)
+
+
+class TestNegotiation:
+    """Tests du choix de l'encodage."""
+    
+    def test_prefers_brotli_when_available(self):
+        """Test : À qualité égale, brotli passe avant gzip."""
+        assert negotiate("gzip, deflate, br", ["br", "gzip"]) == "br"
+        assert negotiate("gzip, deflate, br", ["gzip"]) == "gzip"
+    
+    def test_quality_values(self):
+        """Test : Les valeurs q ordonnent les encodages ; q=0 les refuse."""
+        assert negotiate("br;q=0.2, gzip;q=0.8", ["br", "gzip"]) == "gzip"
+        assert negotiate("gzip;q=0", ["gzip"]) is None
+        assert negotiate("*", ["br", "gzip"]) == "br"
+        assert negotiate("identity", ["gzip"]) is None
+        assert negotiate("", ["gzip"]) is None
+
+
+class TestCompressionMiddleware:
+    """Tests du middleware."""
+    
+    def test_large_body_is_compressed(self, compressed_client):
+        """Test : Un corps au-dessus du seuil est compressé, avec sa longueur et Vary."""
+        response = compressed_client.get("/large", headers={"Accept-Encoding": "gzip"})
+        
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert response.json() == LARGE
+    
+    def test_small_body_is_not_compressed(self, compressed_client):
+        """Test : Un petit corps part tel quel."""
+        response = compressed_client.get("/small", headers={"Accept-Encoding": "gzip"})
+        
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"status": "ok"}
+    
+    def test_stream_is_compressed(self, compressed_client):
+        """Test : Une réponse diffusée est compressée, sans longueur annoncée."""
+        response = compressed_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.text == "".join(f"line {i}\n" for i in range(5000))
+    
+    def test_small_stream_is_not_compressed(self, compressed_client):
+        """Test : Un flux plus petit que le seuil part non compressé."""
+        response = compressed_client.get("/tiny-stream", headers={"Accept-Encoding": "gzip"})
+        
+        assert "content-encoding" not in response.headers
+        assert response.text == "ab"
+    
+    def test_skips_binary_and_unaccepted(self, compressed_client):
+        """Test : Ni les types binaires, ni les clients sans gzip ne reçoivent de corps compressé."""
+        assert "content-encoding" not in compressed_client.get("/image", headers={"Accept-Encoding": "gzip"}).headers
+        assert "content-encoding" not in compressed_client.get("/large", headers={"Accept-Encoding": "identity"}).headers
+    
+    def test_stream_is_flushed_chunk_by_chunk(self):
+        """Test : Un flux est envoyé compressé par blocs, avant la fin de la réponse."""
+        line = b"x" * 100 + b"\n"
+        
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+            for _ in range(1000):
+                await send({"type": "http.response.body", "body": line, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        
+        messages = []
+        
+        async def send(message):
+            messages.append(message)
+        
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+        asyncio.run(CompressionMiddleware(app, minimum_size=500)(scope, None, send))
+        
+        bodies = [message for message in messages if message["type"] == "http.response.body"]
+        assert len(bodies) > 2
+        assert all(message["more_body"] for message in bodies[:-1])
+        assert gzip.decompress(b"".join(message["body"] for message in bodies)) == line * 1000
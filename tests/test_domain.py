@@ -4,6 +4,7 @@ Ces tests vérifient la logique métier isolée.
 """
 import pytest
 from domain.book import Book
+from domain.query import AuthorQuery, BookQuery, page_authors, page_rows
 from domain.exceptions import YearError, TitleError, AuthorError
 
 
@@ -117,4 +118,111 @@ class TestBookMethods:
         result = str(book)
         assert "1984" in result
         assert "George Orwell" in result
-        assert "1949" in result
\ No newline at end of file
+        assert "1949" in result
+
+class TestBookHydration:
+    """Tests de la reconstruction depuis le stockage."""
+    
+    def test_from_storage_keeps_fields(self):
+        """Test : from_storage reprend les champs tels quels."""
+        book = Book.from_storage(7, "Dune", "Frank Herbert", 1965, 5)
+        
+        assert (book.id, book.title, book.author, book.year, book.rating) == (7, "Dune", "Frank Herbert", 1965, 5)
+        assert book.key == ("dune", "frank herbert")
+    
+    def test_from_storage_skips_validation(self):
+        """Test : Les données de confiance ne sont pas revalidées."""
+        book = Book.from_storage(1, "  Dune  ", "Herbert", 3000)
+        
+        assert book.title == "  Dune  "
+        assert book.year == 3000
+    
+    def test_book_has_no_instance_dict(self):
+        """Test : Book utilise __slots__, sans __dict__ par instance."""
+        book = Book(title="1984", author="Orwell", year=1949)
+        
+        assert not hasattr(book, "__dict__")
+        with pytest.raises(AttributeError):
+            book.isbn = "123"
+
+
+class TestBookQuery:
+    """Tests des filtres et du tri d'une liste."""
+    
+    ROWS = [
+        (1, "Dune", "Frank Herbert", 1965, 5),
+        (2, "Foundation", "Isaac Asimov", 1951, None),
+        (3, "Children of Dune", " frank herbert ", 1976, 4),
+        (4, "I, Robot", "Isaac Asimov", 1950, 4),
+    ]
+    
+    def test_matches_combines_filters(self):
+        """Test : Les filtres se combinent, l'auteur ignore casse et espaces autour."""
+        query = BookQuery(author="FRANK HERBERT", year_min=1970, rating_min=4)
+        
+        assert [row[0] for row in self.ROWS if query.matches(row)] == [3]
+    
+    def test_rating_min_excludes_unrated(self):
+        """Test : Un livre sans note ne passe pas un filtre de note."""
+        assert not BookQuery(rating_min=1).matches(self.ROWS[1])
+    
+    def test_invalid_sort_rejected(self):
+        """Test : Un champ de tri inconnu est refusé."""
+        with pytest.raises(ValueError):
+            BookQuery(sort="isbn")
+    
+    def test_page_rows_sorts_with_id_tiebreak(self):
+        """Test : Tri par valeur puis par ID ; sans note = 0."""
+        assert [row[0] for row in page_rows(self.ROWS, BookQuery(sort="rating"))] == [2, 3, 4, 1]
+        assert [row[0] for row in page_rows(self.ROWS, BookQuery(sort="rating", descending=True))] == [1, 4, 3, 2]
+    
+    def test_page_rows_keyset_after_cursor(self):
+        """Test : Le curseur (valeur, id) reprend après la dernière ligne reçue, dans l'ordre du tri."""
+        query = BookQuery(sort="year", descending=True)
+        
+        assert [row[0] for row in page_rows(self.ROWS, query, after=query.cursor(self.ROWS[2]), limit=2)] == [1, 2]
+        assert [row[0] for row in page_rows(self.ROWS, BookQuery(), after=2)] == [3, 4]
+    
+    def test_page_rows_cursor_survives_deleted_row(self):
+        """Test : La page suivante ne dépend pas de la ligne du curseur, même supprimée."""
+        query = BookQuery(sort="rating")
+        cursor = query.cursor(self.ROWS[2])
+        remaining = [row for row in self.ROWS if row[0] != 3]
+        
+        assert [row[0] for row in page_rows(remaining, query, after=cursor)] == [4, 1]
+    
+    def test_cursor_must_match_sort(self):
+        """Test : Un ID seul ne suffit pas à reprendre un tri par valeur."""
+        with pytest.raises(ValueError):
+            page_rows(self.ROWS, BookQuery(sort="year"), after=3)
+
+
+class TestAuthorQuery:
+    """Tests du tri et de la pagination des auteurs."""
+    
+    ROWS = [("Isaac Asimov", 2, 1, 4), ("frank herbert", 3, 3, 12), ("Ursula Le Guin", 2, 0, 0)]
+    
+    def test_sort_by_name_ignores_case(self):
+        """Test : Le tri par nom suit la clé normalisée."""
+        assert [row[0] for row in page_authors(self.ROWS, AuthorQuery())] == [
+            "frank herbert", "Isaac Asimov", "Ursula Le Guin"
+        ]
+    
+    def test_sort_by_count_with_keyset(self):
+        """Test : Tri par nombre de livres (le nom départage), curseur (nombre, nom)."""
+        query = AuthorQuery(sort="count", descending=True)
+        
+        assert [row[0] for row in page_authors(self.ROWS, query)] == ["frank herbert", "Ursula Le Guin", "Isaac Asimov"]
+        assert query.cursor(self.ROWS[2]) == (2, "Ursula Le Guin")
+        assert [row[0] for row in page_authors(self.ROWS, query, after=(2, "ursula le guin"))] == ["Isaac Asimov"]
+        assert [row[0] for row in page_authors(self.ROWS, query, after=(3, "Abe"), limit=1)] == ["Ursula Le Guin"]
+    
+    def test_count_cursor_requires_count(self):
+        """Test : Un simple nom n'est pas un curseur valide pour un tri par nombre de livres."""
+        with pytest.raises(ValueError):
+            page_authors(self.ROWS, AuthorQuery(sort="count"), after="Nobody")
+    
+    def test_invalid_sort_rejected(self):
+        """Test : Un tri inconnu est refusé."""
+        with pytest.raises(ValueError):
+            AuthorQuery(sort="rating")
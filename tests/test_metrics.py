@@ -0,0 +1,137 @@
+"""
+Tests de l'instrumentation (métriques Prometheus).
+"""
+import threading
+import pytest
+from adapters import metrics
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from adapters.database import get_db
+from adapters.metrics import (
+    DB_QUERIES, HTTP_REQUESTS, REQUEST_QUERIES, REPOSITORY_DURATION,
+    Counter, Histogram, Metric, MetricsRegistry, RequestQueries, instrument_engine, register_pool_metrics,
+    registry, _after_cursor_execute, _before_cursor_execute
+)
+from adapters.pool import TimedQueuePool
+from adapters.repositories.in_memory_repository import InMemoryBookRepository
+from adapters.repositories.timed_repository import TimedBookRepository
+from api.metrics import MetricsMiddleware, router as metrics_router
+from api.routes import router as books_router
+from domain.book import Book
+
+
+@pytest.fixture
+def metrics_client(test_engine, test_db):
+    """Application instrumentée : middleware et chronométrage SQL sur le moteur de test."""
+    instrument_engine(test_engine)
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(books_router)
+    app.include_router(metrics_router)
+    app.dependency_overrides[get_db] = lambda: test_db
+    yield TestClient(app)
+    event.remove(test_engine, "before_cursor_execute", _before_cursor_execute)
+    event.remove(test_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test : L'export Prometheus cumule les compteurs des bornes."""
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("latency_seconds", "Latence.", ("route",), buckets=(0.1, 1.0)))
+    counter = registry.register(Counter("hits_total", "Succès.", ("route",)))
+    
+    histogram.observe(0.05, ("/a",))
+    histogram.observe(0.5, ("/a",))
+    histogram.observe(5, ("/a",))
+    counter.inc(("/a\"b",))
+    
+    lines = registry.render().splitlines()
+    assert '# TYPE latency_seconds histogram' in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+    assert 'hits_total{route="/a\\"b"} 1' in lines
+
+
+def test_metric_requires_render():
+    """Test : Une métrique sans export ne peut pas être instanciée."""
+    with pytest.raises(TypeError):
+        Metric("incomplete", "Sans render.")
+
+
+def test_pool_cumulative_counts_are_counters(tmp_path, monkeypatch):
+    """Test : Les cumuls du pool sont des compteurs (_total), son état instantané des jauges."""
+    monkeypatch.setattr(registry, "_metrics", {})
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool)
+    register_pool_metrics(engine, prefix="test_pool")
+    
+    lines = registry.render().splitlines()
+    engine.dispose()
+    assert "# TYPE test_pool_checked_out gauge" in lines
+    assert "# TYPE test_pool_checkouts_total counter" in lines
+    assert "# TYPE test_pool_timeouts_total counter" in lines
+    assert "# TYPE test_pool_wait_seconds_total counter" in lines
+
+
+def test_worker_label_on_every_series(monkeypatch):
+    """Test : Avec plusieurs workers, chaque série porte l'étiquette du worker qui l'exporte."""
+    monkeypatch.setattr(metrics, "WORKER_LABEL", 'worker="42"')
+    registry = MetricsRegistry()
+    registry.register(Counter("hits_total", "Succès.", ("route",))).inc(("/a",))
+    registry.register(Histogram("latency_seconds", "Latence.", buckets=(1.0,))).observe(0.5)
+    
+    lines = registry.render().splitlines()
+    assert 'hits_total{route="/a",worker="42"} 1' in lines
+    assert 'latency_seconds_bucket{le="1.0",worker="42"} 1' in lines
+    assert 'latency_seconds_count{worker="42"} 1' in lines
+
+
+def test_request_queries_count_across_threads():
+    """Test : Les requêtes SQL d'une même requête HTTP, exécutées par plusieurs threads, sont toutes comptées."""
+    queries = RequestQueries()
+    
+    def run():
+        for _ in range(10000):
+            queries.add(0.001)
+    
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert queries.count == 40000
+
+
+def test_middleware_records_route_and_sql(metrics_client):
+    """Test : Latence par gabarit de route et requêtes SQL comptées par requête HTTP."""
+    labels = ("GET", "/books/{book_id}")
+    book_id = metrics_client.post("/books/", json={"title": "Dune", "author": "Herbert", "year": 1965}).json()["id"]
+    requests_before = HTTP_REQUESTS.value(labels + ("200",))
+    observed_before = REQUEST_QUERIES.count(labels)
+    selects_before = DB_QUERIES.value(("SELECT",))
+    
+    assert metrics_client.get(f"/books/{book_id}").status_code == 200
+    
+    assert HTTP_REQUESTS.value(labels + ("200",)) == requests_before + 1
+    assert REQUEST_QUERIES.count(labels) == observed_before + 1
+    assert DB_QUERIES.value(("SELECT",)) > selects_before
+    
+    body = metrics_client.get("/metrics")
+    assert body.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_request_duration_seconds_count{method="GET",route="/books/{book_id}"}' in body.text
+    assert 'http_request_db_queries_bucket{method="GET",route="/books/{book_id}",le="0"}' in body.text
+
+
+def test_timed_repository_records_calls():
+    """Test : Chaque appel au repository décoré est chronométré."""
+    repository = TimedBookRepository(InMemoryBookRepository())
+    labels = ("InMemoryBookRepository", "add")
+    before = REPOSITORY_DURATION.count(labels)
+    
+    repository.add(Book("Dune", "Herbert", 1965))
+    
+    assert REPOSITORY_DURATION.count(labels) == before + 1
+    assert [book.title for book in repository.iter_all()] == ["Dune"]
@@ -0,0 +1,128 @@
+"""
+Tests des migrations de schéma versionnées.
+"""
+from unittest.mock import Mock
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from adapters import migrations
+from adapters.database import _create_search_index, has_search_index
+from adapters.migrations import DuplicateKeysError, LATEST_VERSION, MIGRATIONS, current_version, migrate, setup_schema
+
+
+# Table books telle que la créait la première version de l'application
+LEGACY_BOOKS = (
+    "CREATE TABLE books (id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, "
+    "author VARCHAR NOT NULL, year INTEGER NOT NULL, rating INTEGER)"
+)
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    """Base SQLite fichier vide."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'books.db'}")
+    yield engine
+    engine.dispose()
+
+
+def applied_versions(engine):
+    with engine.connect() as connection:
+        return [row.version for row in connection.execute(text("SELECT version FROM schema_version ORDER BY version"))]
+
+
+def index_names(engine):
+    return {index["name"] for index in inspect(engine).get_indexes("books")}
+
+
+def test_fresh_database_gets_every_migration(file_engine):
+    """Test : Une base vide reçoit toutes les migrations, dans l'ordre, une seule fois."""
+    assert setup_schema(file_engine) == [migration.version for migration in MIGRATIONS]
+    assert setup_schema(file_engine) == []
+    
+    assert applied_versions(file_engine) == list(range(1, LATEST_VERSION + 1))
+    assert {"books", "collection_state", "books_fts", "schema_version"} <= set(inspect(file_engine).get_table_names())
+    assert {"uq_books_title_author_key", "ix_books_author_key_year", "ix_books_year_rating"} <= index_names(file_engine)
+
+
+def test_current_schema_skips_all_work(file_engine, monkeypatch):
+    """Test : Schéma à jour : ni verrou, ni migration, une seule lecture de schema_version."""
+    setup_schema(file_engine)
+    monkeypatch.setattr(migrations, "schema_lock", None)
+    monkeypatch.setattr(migrations, "migrate", None)
+    
+    assert setup_schema(file_engine) == []
+
+
+def test_legacy_database_is_upgraded(file_engine):
+    """Test : Une base antérieure aux versions reçoit colonnes, clés normalisées et index."""
+    with file_engine.begin() as connection:
+        connection.execute(text(LEGACY_BOOKS))
+        connection.execute(text("INSERT INTO books (title, author, year) VALUES ('Dune', '  Frank HERBERT ', 1965)"))
+    
+    assert migrate(file_engine) == [1, 2, 3, 4, 5]
+    
+    columns = {column["name"] for column in inspect(file_engine).get_columns("books")}
+    assert {"version", "updated_at", "title_key", "author_key"} <= columns
+    with file_engine.connect() as connection:
+        assert connection.execute(text("SELECT title_key, author_key FROM books")).one() == ("dune", "frank herbert")
+        assert connection.execute(text("SELECT rowid FROM books_fts WHERE title LIKE '%un%'")).all() == [(1,)]
+    assert "uq_books_title_author_key" in index_names(file_engine)
+
+
+def test_legacy_duplicates_fail_the_migration(file_engine):
+    """Test : Des doublons existants font échouer la migration : l'index unique est obligatoire."""
+    with file_engine.begin() as connection:
+        connection.execute(text(LEGACY_BOOKS))
+        connection.execute(text("INSERT INTO books (title, author, year) VALUES ('Dune', 'Herbert', 1965), ('dune', 'herbert', 1966)"))
+    
+    with pytest.raises(DuplicateKeysError, match="'Dune' par Herbert"):
+        migrate(file_engine)
+    
+    assert "uq_books_title_author_key" not in index_names(file_engine)
+    assert applied_versions(file_engine) == [1]
+
+
+def test_failed_migration_is_retried(file_engine):
+    """Test : Une migration en échec n'est pas enregistrée et repart au démarrage suivant."""
+    with file_engine.begin() as connection:
+        connection.execute(text(LEGACY_BOOKS))
+        connection.execute(text("INSERT INTO books (title, author, year) VALUES ('Dune', 'Herbert', 1965), ('dune', 'herbert', 1966)"))
+    with pytest.raises(DuplicateKeysError):
+        setup_schema(file_engine)
+    
+    with file_engine.begin() as connection:
+        connection.execute(text("DELETE FROM books WHERE year = 1966"))
+    
+    assert setup_schema(file_engine) == [2, 3, 4, 5]
+    assert "uq_books_title_author_key" in index_names(file_engine)
+
+
+def test_only_pending_migrations_run(file_engine):
+    """Test : Seules les migrations postérieures à la version enregistrée sont appliquées."""
+    setup_schema(file_engine)
+    with file_engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_books_year_rating"))
+        connection.execute(text("DELETE FROM schema_version WHERE version >= 3"))
+        assert current_version(connection) == 2
+    
+    assert migrate(file_engine) == [3, 4, 5]
+    assert "ix_books_year_rating" in index_names(file_engine)
+
+
+def test_collection_state_row_is_seeded(file_engine):
+    """Test : Le compteur de modifications existe dès la migration : les écritures ne font qu'un UPDATE."""
+    migrate(file_engine)
+    
+    with file_engine.connect() as connection:
+        assert connection.execute(text("SELECT id, version FROM collection_state")).all() == [(1, 0)]
+
+
+def test_search_index_on_postgresql_keeps_ilike():
+    """Test : Après l'index pg_trgm, la recherche PostgreSQL n'utilise pas la table FTS5 (propre à SQLite)."""
+    engine = create_engine("postgresql+psycopg2://user@localhost/books")
+    connection = Mock(dialect=engine.dialect, engine=engine)
+    
+    _create_search_index(connection)
+    
+    assert connection.execute.call_count == 2
+    assert has_search_index(engine) is False
+    assert has_search_index(create_engine("postgresql+psycopg2://user@localhost/other")) is False
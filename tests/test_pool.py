@@ -0,0 +1,61 @@
+"""
+Tests du pool de connexions instrumenté.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from adapters.pool import TimedQueuePool, budgeted_pool_size, is_memory_sqlite, pool_options, pool_status
+
+
+@pytest.fixture
+def small_engine(tmp_path):
+    """Moteur SQLite fichier avec un pool d'une seule connexion, sans surplus."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_pool_options_from_settings():
+    """Test : Les réglages s'appliquent aux bases réelles, pas à SQLite en mémoire."""
+    options = pool_options("postgresql://user@host/db")
+    
+    assert options["poolclass"] is TimedQueuePool
+    assert {"pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"} <= set(options)
+    assert pool_options("sqlite:///:memory:") == {}
+    assert is_memory_sqlite("sqlite://")
+    assert not is_memory_sqlite("sqlite:///./books.db")
+
+
+def test_budgeted_pool_size():
+    """Test : workers × (pool_size + max_overflow) reste dans le budget de connexions."""
+    assert budgeted_pool_size(5, 10, budget=0, workers=8) == (5, 10)
+    assert budgeted_pool_size(5, 10, budget=100, workers=4) == (5, 10)
+    assert budgeted_pool_size(5, 10, budget=40, workers=4) == (5, 5)
+    assert budgeted_pool_size(5, 10, budget=12, workers=4) == (3, 0)
+    assert budgeted_pool_size(5, 10, budget=2, workers=4) == (1, 0)
+
+
+def test_pool_status_counts_checkouts(small_engine):
+    """Test : Les connexions prises et les obtentions sont comptées."""
+    with small_engine.connect():
+        status = pool_status(small_engine)
+        assert status["checked_out"] == 1
+        assert status["size"] == 1
+    
+    status = pool_status(small_engine)
+    assert status["checked_out"] == 0
+    assert status["checkouts"] == 1
+
+
+def test_pool_status_counts_timeouts(small_engine):
+    """Test : Un pool épuisé compte l'expiration et le temps d'attente."""
+    with small_engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            small_engine.connect()
+    
+    status = pool_status(small_engine)
+    assert status["timeouts"] == 1
+    assert status["wait_seconds_max"] >= 0.05
@@ -0,0 +1,933 @@
+"""
+Tests des adapters de repository.
+Chaque implémentation de IBookRepository doit respecter le même contrat.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from domain.book import Book, book_to_row
+from domain.exceptions import DuplicateBookError
+from domain.query import AuthorQuery, BookQuery
+from adapters.migrations import migrate
+from adapters.pool import TimedQueuePool
+from adapters.repositories.in_memory_repository import InMemoryBookRepository
+from adapters.repositories import columnar_repository
+from adapters.repositories.columnar_repository import ColumnarBookRepository
+from adapters.repositories import sqlalchemy_repository
+from adapters.repositories.sqlalchemy_repository import SQLAlchemyBookRepository
+from adapters.repositories.caching_repository import BookCache, CachingBookRepository, TTLCache
+from adapters.repositories.coalescing_repository import AsyncSingleflight, CoalescingBookRepository, Singleflight
+from adapters.repositories.timed_repository import TimedBookRepository
+from adapters.repositories.batching_repository import BatchingBookRepository, WriteBatcher
+
+
+@pytest.fixture(params=["in_memory", "columnar", "sqlalchemy", "caching", "timed", "coalescing", "batching"])
+def repository(request):
+    """Fournit chaque implémentation du repository."""
+    if request.param == "in_memory":
+        return InMemoryBookRepository()
+    if request.param == "columnar":
+        return ColumnarBookRepository()
+    if request.param == "timed":
+        return TimedBookRepository(SQLAlchemyBookRepository(request.getfixturevalue("test_db")))
+    if request.param == "coalescing":
+        return CoalescingBookRepository(SQLAlchemyBookRepository(request.getfixturevalue("test_db")), Singleflight())
+    if request.param == "batching":
+        batcher = WriteBatcher(sessionmaker(bind=request.getfixturevalue("test_engine"), autoflush=False))
+        request.addfinalizer(batcher.close)
+        return BatchingBookRepository(SQLAlchemyBookRepository(request.getfixturevalue("test_db")), batcher)
+    if request.param == "caching":
+        return CachingBookRepository(SQLAlchemyBookRepository(request.getfixturevalue("test_db")), BookCache())
+    return SQLAlchemyBookRepository(request.getfixturevalue("test_db"))
+
+
+class TestRepositorySearch:
+    """Tests de la recherche par titre."""
+    
+    def test_find_by_title_case_insensitive(self, repository):
+        """Test : La recherche ignore la casse."""
+        repository.add(Book("Python Programming", "Author", 2020))
+        repository.add(Book("JavaScript Guide", "Author", 2021))
+        
+        result = repository.find_by_title("PYTHON")
+        
+        assert [book.title for book in result] == ["Python Programming"]
+    
+    def test_find_by_title_short_term(self, repository):
+        """Test : Un terme plus court qu'un n-gramme fonctionne aussi."""
+        repository.add(Book("Python Programming", "Author", 2020))
+        repository.add(Book("Dune", "Herbert", 1965))
+        
+        result = repository.find_by_title("py")
+        
+        assert [book.title for book in result] == ["Python Programming"]
+    
+    def test_find_by_title_follows_updates(self, repository):
+        """Test : L'index de recherche suit les mises à jour et suppressions."""
+        first = repository.add(Book("Python Programming", "Author", 2020))
+        second = repository.add(Book("Python Cookbook", "Author", 2013))
+        
+        repository.update(Book("Rust Programming", "Author", 2020, book_id=first.id))
+        repository.remove_by_id(second.id)
+        
+        assert repository.find_by_title("python") == []
+        assert [book.title for book in repository.find_by_title("rust")] == ["Rust Programming"]
+    
+    def test_find_by_title_empty_term(self, repository):
+        """Test : Un terme vide ne retourne rien."""
+        repository.add(Book("Python Programming", "Author", 2020))
+        
+        assert repository.find_by_title("") == []
+
+
+class TestRepositoryRows:
+    """Tests des lectures rapides sous forme de lignes."""
+    
+    def test_rows_match_books(self, repository):
+        """Test : Les lignes reprennent (id, title, author, year, rating) des livres."""
+        first = repository.add(Book("Python Programming", "Author", 2020, rating=4))
+        second = repository.add(Book("Python Cookbook", "Author", 2013))
+        repository.add(Book("Dune", "Herbert", 1965))
+        
+        assert [tuple(row) for row in repository.get_all_rows()] == [book_to_row(book) for book in repository.get_all()]
+        assert [tuple(row) for row in repository.get_page_rows(after=first.id, limit=1)] == [
+            (second.id, "Python Cookbook", "Author", 2013, None)
+        ]
+        assert [row[0] for row in repository.find_rows_by_title("python")] == [first.id, second.id]
+        assert repository.find_rows_by_title("") == []
+    
+    def test_search_rows_follow_updates(self, repository):
+        """Test : Les lignes recherchées suivent les modifications (et le cache est invalidé)."""
+        book = repository.add(Book("Python Programming", "Author", 2020))
+        repository.find_rows_by_title("python")
+        
+        repository.patch(book.id, {"title": "Rust Programming"})
+        
+        assert repository.find_rows_by_title("python") == []
+        assert [row[1] for row in repository.find_rows_by_title("rust")] == ["Rust Programming"]
+
+
+class TestRepositoryQuery:
+    """Tests des filtres et du tri de liste."""
+    
+    @pytest.fixture
+    def catalog(self, repository):
+        books = [
+            Book("Dune", "Frank Herbert", 1965, rating=5),
+            Book("Foundation", "Isaac Asimov", 1951),
+            Book("Children of Dune", "Frank Herbert", 1976, rating=4),
+            Book("I, Robot", "Isaac Asimov", 1950, rating=4),
+            Book("Dune Messiah", "Frank Herbert", 1969, rating=3),
+        ]
+        return [repository.add(book).id for book in books]
+    
+    def test_filters_combine(self, repository, catalog):
+        """Test : Auteur (casse ignorée), années et note minimale se combinent."""
+        query = BookQuery(author="frank herbert", year_min=1960, year_max=1980, rating_min=4, sort="year")
+        
+        assert [row[1] for row in repository.get_all_rows(query)] == ["Dune", "Children of Dune"]
+    
+    def test_sort_descending_with_unrated_last(self, repository, catalog):
+        """Test : Tri décroissant par note, l'ID départage, sans note en dernier."""
+        rows = repository.get_all_rows(BookQuery(sort="rating", descending=True))
+        
+        assert [row[0] for row in rows] == [catalog[0], catalog[3], catalog[2], catalog[4], catalog[1]]
+    
+    def test_keyset_pagination_follows_sort(self, repository, catalog):
+        """Test : Le curseur (valeur triée, ID du dernier livre) pagine dans l'ordre du tri."""
+        query = BookQuery(sort="title")
+        seen, after = [], None
+        while True:
+            page = repository.get_page_rows(after=after, limit=2, query=query)
+            if not page:
+                break
+            seen += [row[1] for row in page]
+            after = query.cursor(page[-1])
+        
+        assert seen == ["Children of Dune", "Dune", "Dune Messiah", "Foundation", "I, Robot"]
+    
+    def test_cursor_survives_changed_and_deleted_rows(self, repository, catalog):
+        """Test : La page suivante reste juste si le dernier livre reçu est modifié ou supprimé."""
+        query = BookQuery(sort="year")
+        page = repository.get_page_rows(limit=2, query=query)
+        after = query.cursor(page[-1])
+        
+        repository.patch(page[-1][0], {"year": 2001})
+        assert [row[1] for row in repository.get_page_rows(after=after, limit=2, query=query)] == [
+            "Dune", "Dune Messiah"
+        ]
+        repository.remove_by_id(page[-1][0])
+        assert [row[1] for row in repository.get_page_rows(after=after, limit=2, query=query)] == [
+            "Dune", "Dune Messiah"
+        ]
+    
+    def test_default_query_unchanged(self, repository, catalog):
+        """Test : Sans critère, la liste reste triée par ID."""
+        assert [row[0] for row in repository.get_all_rows(BookQuery())] == catalog
+
+
+class TestRepositoryAuthors:
+    """Tests des agrégats par auteur."""
+    
+    def test_authors_group_spellings(self, repository):
+        """Test : Les graphies d'un auteur sont regroupées, nombre de livres et notes agrégés."""
+        repository.add(Book("Dune", "Frank Herbert", 1965, rating=5))
+        repository.add(Book("Dune Messiah", "frank herbert", 1969, rating=3))
+        repository.add(Book("Foundation", "Isaac Asimov", 1951))
+        
+        assert [tuple(row) for row in repository.get_authors()] == [
+            ("Frank Herbert", 2, 2, 8), ("Isaac Asimov", 1, 0, 0)
+        ]
+    
+    def test_authors_follow_writes(self, repository):
+        """Test : Les agrégats suivent modifications et suppressions."""
+        dune = repository.add(Book("Dune", "Frank Herbert", 1965, rating=5))
+        foundation = repository.add(Book("Foundation", "Isaac Asimov", 1951))
+        
+        repository.patch(dune.id, {"rating": 2})
+        repository.patch(foundation.id, {"author": "Frank Herbert"})
+        assert [tuple(row) for row in repository.get_authors()] == [("Frank Herbert", 2, 1, 2)]
+        
+        repository.remove_by_id(dune.id)
+        repository.remove_many(author="frank herbert")
+        assert repository.get_authors() == []
+    
+    def test_authors_sorted_by_count_with_cursor(self, repository):
+        """Test : Tri par nombre de livres décroissant, curseur (nombre de livres, nom)."""
+        for index, author in enumerate(["Asimov", "Herbert", "Herbert", "Le Guin", "Le Guin", "Le Guin"]):
+            repository.add(Book(f"Book {index}", author, 1960))
+        query = AuthorQuery(sort="count", descending=True)
+        
+        first = repository.get_authors(limit=2, query=query)
+        assert [row[0] for row in first] == ["Le Guin", "Herbert"]
+        assert [row[0] for row in repository.get_authors(after=query.cursor(first[-1]), limit=2, query=query)] == [
+            "Asimov"
+        ]
+        assert [row[0] for row in repository.get_authors(after="herbert", query=AuthorQuery())] == ["Le Guin"]
+    
+    def test_authors_count_cursor_survives_deleted_anchor(self, repository):
+        """Test : La page suivante ne dépend pas de l'auteur du curseur, même supprimé."""
+        books = [repository.add(Book(f"Book {index}", author, 1960)) for index, author in enumerate(
+            ["Asimov", "Herbert", "Herbert", "Le Guin", "Le Guin", "Le Guin"]
+        )]
+        query = AuthorQuery(sort="count", descending=True)
+        cursor = query.cursor(repository.get_authors(limit=2, query=query)[-1])
+        
+        for book in books[1:3]:
+            repository.remove_by_id(book.id)
+        
+        assert [row[0] for row in repository.get_authors(after=cursor, query=query)] == ["Asimov"]
+
+
+class TestRepositoryCrud:
+    """Tests des opérations de base."""
+    
+    def test_get_all_keeps_insertion_order(self, repository):
+        """Test : Les livres sont listés dans l'ordre d'insertion."""
+        for title in ["C", "A", "B"]:
+            repository.add(Book(title, "Author", 2000))
+        
+        assert [book.title for book in repository.get_all()] == ["C", "A", "B"]
+    
+    def test_get_by_id(self, repository):
+        """Test : Récupérer un livre par son ID."""
+        book = repository.add(Book("Dune", "Herbert", 1965))
+        
+        assert repository.get_by_id(book.id).title == "Dune"
+        assert repository.get_by_id(999) is None
+    
+    def test_exists_is_case_insensitive(self, repository):
+        """Test : exists() ignore la casse."""
+        repository.add(Book("Dune", "Frank Herbert", 1965))
+        
+        assert repository.exists("DUNE", "frank herbert")
+        assert not repository.exists("Dune", "Someone Else")
+    
+    def test_exists_after_update_and_remove(self, repository):
+        """Test : exists() suit les mises à jour et suppressions."""
+        book = repository.add(Book("Dune", "Herbert", 1965))
+        
+        repository.update(Book("Dune Messiah", "Herbert", 1969, book_id=book.id))
+        assert not repository.exists("Dune", "Herbert")
+        assert repository.exists("Dune Messiah", "Herbert")
+        
+        assert repository.remove_by_id(book.id)
+        assert not repository.exists("Dune Messiah", "Herbert")
+        assert not repository.remove_by_id(book.id)
+    
+    def test_add_if_absent_ignores_normalized_duplicates(self, repository):
+        """Test : add_if_absent() ignore un doublon (casse et espaces normalisés)."""
+        created = repository.add_if_absent(Book("Dune", "Frank Herbert", 1965))
+        
+        assert created.id is not None
+        assert repository.add_if_absent(Book("  DUNE ", "frank herbert", 1965)) is None
+        assert repository.count() == 1
+    
+    def test_add_duplicate_raises_error(self, repository):
+        """Test : add() refuse un doublon."""
+        repository.add(Book("Dune", "Herbert", 1965))
+        
+        with pytest.raises(DuplicateBookError):
+            repository.add(Book("dune", "HERBERT", 1965))
+    
+    def test_add_many_skips_duplicates(self, repository):
+        """Test : add_many() laisse id=None aux doublons, sans bloquer le lot."""
+        repository.add(Book("Dune", "Herbert", 1965))
+        
+        books = repository.add_many([Book("1984", "Orwell", 1949), Book("DUNE", "herbert", 1965)])
+        
+        assert books[0].id is not None
+        assert books[1].id is None
+        assert repository.count() == 2
+    
+    def test_update_to_duplicate_raises_error(self, repository):
+        """Test : Renommer un livre en doublon d'un autre lève DuplicateBookError."""
+        repository.add(Book("Dune", "Herbert", 1965))
+        book = repository.add(Book("1984", "Orwell", 1949))
+        
+        with pytest.raises(DuplicateBookError):
+            repository.update(Book("Dune", "herbert", 1965, book_id=book.id))
+        assert repository.get_by_id(book.id).title == "1984"
+    
+    def test_patch_changes_only_given_fields(self, repository):
+        """Test : patch() ne modifie que les champs fournis et suit la clé d'unicité."""
+        book = repository.add(Book("Dune", "Herbert", 1965, rating=3))
+        
+        patched = repository.patch(book.id, {"title": "Dune Messiah", "rating": None})
+        
+        assert (patched.title, patched.author, patched.year, patched.rating) == ("Dune Messiah", "Herbert", 1965, None)
+        assert repository.get_by_id(book.id).title == "Dune Messiah"
+        assert repository.exists("dune messiah", "herbert")
+        assert not repository.exists("Dune", "Herbert")
+        assert repository.get_book_version(book.id)[0] == 2
+    
+    def test_patch_missing_or_duplicate(self, repository):
+        """Test : patch() retourne None si absent, lève DuplicateBookError sur un doublon."""
+        repository.add(Book("Dune", "Herbert", 1965))
+        book = repository.add(Book("1984", "Orwell", 1949))
+        
+        assert repository.patch(999, {"year": 2000}) is None
+        with pytest.raises(DuplicateBookError):
+            repository.patch(book.id, {"title": "DUNE", "author": "herbert"})
+        assert repository.get_by_id(book.id).title == "1984"
+    
+    def test_remove_many_by_ids(self, repository):
+        """Test : remove_many() par IDs ignore les IDs absents et retourne les IDs supprimés."""
+        books = repository.add_many([Book(f"Book {i}", "Author", 2000) for i in range(5)])
+        
+        removed = repository.remove_many(ids=[books[0].id, books[2].id, 999])
+        
+        assert sorted(removed) == [books[0].id, books[2].id]
+        assert repository.count() == 3
+        assert repository.get_by_id(books[0].id) is None
+    
+    def test_remove_many_by_filter(self, repository):
+        """Test : remove_many() par auteur et intervalle d'années (critères combinés)."""
+        repository.add_many([
+            Book("Dune", "Frank Herbert", 1965),
+            Book("Dune Messiah", "Frank Herbert", 1969),
+            Book("Children of Dune", "Frank Herbert", 1976),
+            Book("1984", "Orwell", 1949),
+        ])
+        
+        removed = repository.remove_many(author=" FRANK herbert", year_min=1960, year_max=1970)
+        
+        assert len(removed) == 2
+        assert sorted(book.title for book in repository.get_all()) == ["1984", "Children of Dune"]
+        assert not repository.exists("Dune", "Frank Herbert")
+    
+    def test_update_missing_book(self, repository):
+        """Test : Mettre à jour un livre inexistant retourne None."""
+        assert repository.update(Book("Dune", "Herbert", 1965, book_id=999)) is None
+    
+    def test_get_page_skips_removed_books(self, repository):
+        """Test : La pagination saute les livres supprimés."""
+        books = [repository.add(Book(f"Book {i}", "Author", 2000)) for i in range(5)]
+        repository.remove_by_id(books[1].id)
+        repository.remove_by_id(books[2].id)
+        
+        page = repository.get_page(after=books[0].id, limit=2)
+        
+        assert [book.title for book in page] == ["Book 3", "Book 4"]
+        assert repository.count() == 3
+    
+    def test_add_many_assigns_ids_in_order(self, repository):
+        """Test : add_many() attribue les IDs dans l'ordre des livres."""
+        books = repository.add_many([Book("A", "Author", 2000), Book("B", "Author", 2001)])
+        
+        assert books[0].id < books[1].id
+        assert repository.get_by_id(books[1].id).title == "B"
+    
+    def test_existing_keys(self, repository):
+        """Test : existing_keys() retourne les clés déjà présentes."""
+        repository.add(Book("Dune", "Frank Herbert", 1965))
+        
+        found = repository.existing_keys([("dune", "frank herbert"), ("1984", "orwell")])
+        
+        assert found == {("dune", "frank herbert")}
+    
+    def test_iter_all_yields_every_book(self, repository):
+        """Test : iter_all() parcourt tous les livres dans l'ordre des IDs."""
+        for i in range(5):
+            repository.add(Book(f"Book {i}", "Author", 2000))
+        
+        books = list(repository.iter_all(batch_size=2))
+        
+        assert [book.title for book in books] == [f"Book {i}" for i in range(5)]
+
+
+
+class TestSQLAlchemyBulkDelete:
+    """Tests de la suppression par lots de l'adapter SQLAlchemy."""
+    
+    def test_remove_many_by_filter_deletes_in_batches(self, test_db, monkeypatch):
+        """Test : Une suppression filtrée enchaîne des DELETE de taille bornée."""
+        monkeypatch.setattr(sqlalchemy_repository, "DELETE_BATCH_SIZE", 2)
+        repository = SQLAlchemyBookRepository(test_db)
+        repository.add_many([Book(f"Book {i}", "Author", 2000) for i in range(5)])
+        statements = []
+        original_delete = repository._delete
+        
+        def counting_delete(condition):
+            statements.append(condition)
+            return original_delete(condition)
+        
+        monkeypatch.setattr(repository, "_delete", counting_delete)
+        
+        removed = repository.remove_many(author="author")
+        
+        assert len(removed) == 5
+        assert len(statements) == 3
+        assert repository.count() == 0
+
+    def test_patch_conflict_on_deleted_book_is_not_found(self, test_db):
+        """Test : Doublon puis livre supprimé entre-temps : patch() retourne None au lieu d'échouer."""
+        repository = SQLAlchemyBookRepository(test_db)
+        repository.add(Book("Dune", "Herbert", 1965))
+        book = repository.add(Book("1984", "Orwell", 1949))
+        rollback = repository._rollback
+        
+        def rollback_then_delete():
+            rollback()
+            SQLAlchemyBookRepository(test_db).remove_by_id(book.id)
+        
+        repository._rollback = rollback_then_delete
+        
+        assert repository.patch(book.id, {"title": "DUNE", "author": "herbert"}) is None
+
+    def test_writes_lock_book_before_collection_counter(self, test_engine, test_db):
+        """Test : Chaque écriture modifie la ligne du livre avant celle du compteur (même ordre de verrous)."""
+        repository = SQLAlchemyBookRepository(test_db)
+        book = repository.add(Book("Dune", "Herbert", 1965))
+        tables = []
+
+        def record(connection, cursor, statement, parameters, context, executemany):
+            words = statement.split()
+            if words[0] == "UPDATE":
+                tables.append(words[1])
+            elif words[0] in ("INSERT", "DELETE"):
+                tables.append(words[2])
+
+        event.listen(test_engine, "before_cursor_execute", record)
+        try:
+            repository.add(Book("1984", "Orwell", 1949))
+            repository.update(Book("Dune", "Herbert", 1966, book_id=book.id))
+            repository.patch(book.id, {"rating": 5})
+            repository.remove_by_id(book.id)
+        finally:
+            event.remove(test_engine, "before_cursor_execute", record)
+
+        assert tables == ["books", "collection_state"] * 4
+
+
+class TestRepositoryVersions:
+    """Tests des versions utilisées pour les ETag."""
+    
+    def test_book_version_increments_on_update(self, repository):
+        """Test : La version d'un livre augmente à chaque mise à jour."""
+        book = repository.add(Book("Dune", "Herbert", 1965))
+        version, _ = repository.get_book_version(book.id)
+        
+        repository.update(Book("Dune", "Herbert", 1965, rating=5, book_id=book.id))
+        
+        assert repository.get_book_version(book.id)[0] == version + 1
+        assert repository.get_book_version(999) is None
+    
+    def test_collection_version_changes_on_every_write(self, repository):
+        """Test : Le compteur de la collection change à chaque écriture."""
+        versions = [repository.get_collection_version()[0]]
+        book = repository.add(Book("Dune", "Herbert", 1965))
+        versions.append(repository.get_collection_version()[0])
+        repository.add_many([Book("1984", "Orwell", 1949)])
+        versions.append(repository.get_collection_version()[0])
+        repository.update(Book("Dune", "Herbert", 1966, book_id=book.id))
+        versions.append(repository.get_collection_version()[0])
+        repository.remove_by_id(book.id)
+        versions.append(repository.get_collection_version()[0])
+        
+        assert versions == sorted(set(versions))
+
+
+class TestCachingRepository:
+    """Tests du décorateur de cache."""
+    
+    def test_get_by_id_is_cached(self):
+        """Test : La deuxième lecture est servie par le cache."""
+        inner = InMemoryBookRepository()
+        repository = CachingBookRepository(inner, BookCache())
+        book = repository.add(Book("Dune", "Herbert", 1965))
+        
+        repository.get_by_id(book.id)
+        inner.remove_by_id(book.id)  # modification invisible pour le cache
+        
+        assert repository.get_by_id(book.id).title == "Dune"
+        assert repository.cache.by_id.stats()["hits"] == 1
+    
+    def test_update_invalidates_id_and_search(self):
+        """Test : Une mise à jour invalide l'entrée et les recherches concernées."""
+        repository = CachingBookRepository(InMemoryBookRepository(), BookCache())
+        book = repository.add(Book("Dune", "Herbert", 1965))
+        repository.add(Book("Foundation", "Asimov", 1951))
+        repository.get_by_id(book.id)
+        repository.find_by_title("dune")
+        repository.find_by_title("found")
+        repository.find_by_title("messiah")
+        
+        repository.update(Book("Dune Messiah", "Herbert", 1969, book_id=book.id))
+        
+        assert repository.get_by_id(book.id).title == "Dune Messiah"
+        assert [b.title for b in repository.find_by_title("messiah")] == ["Dune Messiah"]
+        # La recherche sans rapport reste en cache
+        hits = repository.cache.search.hits
+        repository.find_by_title("found")
+        assert repository.cache.search.hits == hits + 1
+    
+    def test_add_invalidates_matching_searches_and_stats(self):
+        """Test : Un ajout invalide les recherches qui le trouveraient et les statistiques."""
+        repository = CachingBookRepository(InMemoryBookRepository(), BookCache())
+        assert repository.find_by_title("python") == []
+        assert repository.get_statistics()["total"] == 0
+        assert repository.count() == 0
+        
+        repository.add(Book("Python Programming", "Author", 2020))
+        
+        assert len(repository.find_by_title("python")) == 1
+        assert repository.get_statistics()["total"] == 1
+        assert repository.count() == 1
+    
+    def test_remove_invalidates_searches_containing_book(self):
+        """Test : Une suppression invalide les recherches qui contenaient le livre."""
+        repository = CachingBookRepository(InMemoryBookRepository(), BookCache())
+        book = repository.add(Book("Python Programming", "Author", 2020))
+        repository.find_by_title("python")
+        
+        repository.remove_by_id(book.id)
+        
+        assert repository.find_by_title("python") == []
+        assert repository.get_by_id(book.id) is None
+    
+    def test_cached_book_is_a_copy(self):
+        """Test : Modifier le Book reçu n'altère pas l'entrée du cache."""
+        repository = CachingBookRepository(InMemoryBookRepository(), BookCache())
+        book = repository.add(Book("Dune", "Herbert", 1965))
+        
+        repository.get_by_id(book.id).rating = 1
+        cached = repository.get_by_id(book.id)
+        cached.rating = 2
+        
+        assert repository.get_by_id(book.id).rating is None
+        assert repository.cache.by_id.stats()["hits"] == 2
+    
+    def test_version_read_discards_entries_written_elsewhere(self, test_db):
+        """Test : Après l'écriture d'un autre processus, la lecture de version écarte l'entrée périmée."""
+        worker = CachingBookRepository(SQLAlchemyBookRepository(test_db), BookCache())
+        other = SQLAlchemyBookRepository(test_db)  # autre worker, sans accès à ce cache
+        book = other.add(Book("Dune", "Herbert", 1965))
+        worker.get_book_version(book.id)
+        worker.get_by_id(book.id)
+        worker.get_collection_version()
+        assert worker.get_statistics()["total"] == 1
+        
+        other.patch(book.id, {"rating": 5})
+        other.add(Book("Emma", "Austen", 1815))
+        
+        # Un nouveau repository par requête, comme get_book_service ; le cache est partagé
+        request = CachingBookRepository(SQLAlchemyBookRepository(test_db), worker.cache)
+        version, _ = request.get_book_version(book.id)
+        assert version == 2
+        assert request.get_by_id(book.id).rating == 5
+        request.get_collection_version()
+        assert request.get_statistics()["total"] == 2
+        # Version inchangée : l'entrée remplie sous cette version est servie par le cache
+        hits = request.cache.by_id.stats()["hits"]
+        request.get_book_version(book.id)
+        assert request.get_by_id(book.id).rating == 5
+        assert request.cache.by_id.stats()["hits"] == hits + 1
+    
+    def test_add_many_invalidates_collection_once(self):
+        """Test : Un ajout en masse invalide recherches, statistiques et compteur en une passe."""
+        repository = CachingBookRepository(InMemoryBookRepository(), BookCache())
+        dune = repository.add(Book("Dune", "Herbert", 1965))
+        repository.get_by_id(dune.id)
+        assert repository.find_by_title("python") == []
+        assert repository.count() == 1
+        
+        repository.add_many([Book(f"Python {index}", "Author", 2020) for index in range(50)])
+        
+        assert len(repository.find_by_title("python")) == 50
+        assert repository.count() == 51
+        assert repository.cache.by_id.stats()["size"] == 1
+
+
+class TestTTLCache:
+    """Tests du cache LRU + TTL."""
+    
+    def test_evicts_least_recently_used(self):
+        """Test : L'entrée la moins récemment utilisée est évincée."""
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["size"] == 2
+        cache.get("b")
+        assert cache.stats()["misses"] == 1
+    
+    def test_entries_expire(self):
+        """Test : Une entrée expirée n'est plus servie."""
+        cache = TTLCache(max_size=2, ttl=0)
+        cache.set("a", 1)
+        cache.get("a")
+        
+        assert cache.stats() == {"size": 0, "hits": 0, "misses": 1}
+
+
+class TestColumnarRepository:
+    """Tests propres à l'adapter colonnaire (lignes mortes et compactage)."""
+    
+    def fill(self, repository, count):
+        return repository.add_many([
+            Book(f"Book {i}", f"Author {i % 3}", 1900 + i, rating=i % 5 + 1 if i % 2 else None)
+            for i in range(count)
+        ])
+    
+    def test_reads_skip_dead_rows_before_compaction(self, monkeypatch):
+        """Test : Les lignes supprimées mais pas encore compactées sont invisibles."""
+        monkeypatch.setattr(columnar_repository, "COMPACT_RATIO", 1.0)
+        repository = ColumnarBookRepository()
+        books = self.fill(repository, 6)
+        
+        repository.remove_by_id(books[0].id)
+        repository.remove_by_id(books[3].id)
+        
+        assert repository._dead == 2
+        assert [book.id for book in repository.get_all()] == [books[1].id, books[2].id, books[4].id, books[5].id]
+        assert [book.id for book in repository.get_page(after=books[1].id, limit=2)] == [books[2].id, books[4].id]
+        stats = repository.get_statistics()
+        assert (stats["total"], stats["oldest"], stats["newest"]) == (4, 1901, 1905)
+        assert stats["rating_distribution"] == {1: 1, 2: 1, 3: 0, 4: 0, 5: 0}
+    
+    def test_compaction_keeps_contents(self):
+        """Test : Au-delà du seuil, les colonnes sont compactées sans perte."""
+        repository = ColumnarBookRepository()
+        books = self.fill(repository, 8)
+        
+        removed = repository.remove_many(author="author 0")
+        
+        assert removed == [books[0].id, books[3].id, books[6].id]
+        assert repository._dead == 0
+        assert len(repository._ids) == 5
+        assert repository.get_by_id(books[7].id).title == "Book 7"
+        assert [row[0] for row in repository.find_rows_by_title("book 5")] == [books[5].id]
+        assert repository.remove_many(year_min=1904, year_max=1905) == [books[4].id, books[5].id]
+        assert repository.count() == 3
+
+
+def wait_until(condition, timeout: float = 5):
+    """Attend qu'une condition soit vraie (appels en attente dans un autre thread)."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition jamais atteinte"
+        time.sleep(0.005)
+
+
+class BlockingRepository(InMemoryBookRepository):
+    """Repository dont get_by_id attend un signal, pour maintenir une exécution en cours."""
+    
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.calls = 0
+    
+    def get_by_id(self, book_id):
+        self.calls += 1
+        self.release.wait(5)
+        return super().get_by_id(book_id)
+
+
+class TestSingleflight:
+    """Tests du regroupement des lectures simultanées."""
+    
+    def test_concurrent_calls_share_one_execution(self):
+        """Test : Des appels identiques simultanés attendent une seule exécution."""
+        group = Singleflight()
+        release = threading.Event()
+        calls = []
+        
+        def slow():
+            calls.append(1)
+            release.wait(5)
+            return [1, 2]
+        
+        with ThreadPoolExecutor(4) as pool:
+            futures = [pool.submit(group.do, "get_all", (), slow) for _ in range(4)]
+            wait_until(lambda: group.shared["get_all"] == 3)
+            release.set()
+            results = [future.result() for future in futures]
+        
+        assert len(calls) == 1
+        assert sorted(shared for _, shared in results) == [False, True, True, True]
+        assert all(result == [1, 2] for result, _ in results)
+        assert group.stats() == {"get_all": {"executed": 1, "shared": 3}}
+    
+    def test_errors_are_shared(self):
+        """Test : L'exception de l'exécution est levée chez tous les appels qui l'attendaient."""
+        group = Singleflight()
+        release = threading.Event()
+        
+        def failing():
+            release.wait(5)
+            raise RuntimeError("base indisponible")
+        
+        with ThreadPoolExecutor(2) as pool:
+            futures = [pool.submit(group.do, "count", (), failing) for _ in range(2)]
+            wait_until(lambda: group.shared["count"] == 1)
+            release.set()
+            for future in futures:
+                with pytest.raises(RuntimeError):
+                    future.result()
+        
+        # Plus rien en cours : l'appel suivant exécute à nouveau
+        assert group.do("count", (), lambda: 3) == (3, False)
+    
+    def test_write_is_not_hidden_by_inflight_read(self):
+        """Test : Après une écriture, une lecture ne rejoint pas une exécution commencée avant."""
+        inner = BlockingRepository()
+        book = inner.add(Book("Dune", "Herbert", 1965))
+        repository = CoalescingBookRepository(inner, Singleflight())
+        
+        with ThreadPoolExecutor(1) as pool:
+            before = pool.submit(repository.get_by_id, book.id)
+            wait_until(lambda: inner.calls == 1)
+            repository.patch(book.id, {"rating": 5})
+            inner.release.set()
+            after = repository.get_by_id(book.id)
+            before.result()
+        
+        assert inner.calls == 2
+        assert after.rating == 5
+    
+    def test_shared_books_are_copies(self):
+        """Test : Chaque appel reçoit son propre Book, modifiable sans effet sur les autres."""
+        inner = BlockingRepository()
+        book = inner.add(Book("Dune", "Herbert", 1965))
+        repository = CoalescingBookRepository(inner, Singleflight())
+        
+        with ThreadPoolExecutor(2) as pool:
+            futures = [pool.submit(repository.get_by_id, book.id) for _ in range(2)]
+            wait_until(lambda: repository.flights.shared["get_by_id"] == 1)
+            inner.release.set()
+            first, second = [future.result() for future in futures]
+        
+        assert inner.calls == 1
+        assert first is not second
+        assert (first.id, first.title) == (second.id, second.title)
+    
+    def test_async_calls_share_one_execution(self):
+        """Test : Variante asynchrone, les coroutines identiques attendent le même Future."""
+        group = AsyncSingleflight()
+        calls = []
+        
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"total": 1}
+        
+        async def scenario():
+            return await asyncio.gather(*(group.do("get_statistics", (), slow) for _ in range(3)))
+        
+        results = asyncio.run(scenario())
+        
+        assert len(calls) == 1
+        assert [shared for _, shared in results] == [False, True, True]
+        assert group.stats() == {"get_statistics": {"executed": 1, "shared": 2}}
+
+    def test_async_leader_cancellation_spares_followers(self):
+        """Test : Le premier appel annulé (client parti), les suiveurs reçoivent quand même le résultat."""
+        group = AsyncSingleflight()
+
+        async def slow():
+            await asyncio.sleep(0.02)
+            return {"total": 1}
+
+        async def scenario():
+            leader = asyncio.ensure_future(group.do("get_statistics", (), slow))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(group.do("get_statistics", (), slow))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await follower, leader.cancelled()
+
+        (result, shared), leader_cancelled = asyncio.run(scenario())
+
+        assert leader_cancelled
+        assert result == {"total": 1} and shared
+
+    def test_async_cancelled_leader_waits_for_shared_execution(self):
+        """Test : Le premier appel annulé ne rend la main (et sa session) qu'après l'exécution partagée."""
+        group = AsyncSingleflight()
+        release = None
+
+        async def slow():
+            await release.wait()
+            return {"total": 1}
+
+        async def scenario():
+            nonlocal release
+            release = asyncio.Event()
+            leader = asyncio.ensure_future(group.do("get_statistics", (), slow))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(group.do("get_statistics", (), slow))
+            await asyncio.sleep(0)
+            leader.cancel()
+            await asyncio.sleep(0.01)
+            leader_waiting = not leader.done()
+            release.set()
+            await asyncio.wait({leader})
+            return leader_waiting, leader.cancelled(), await follower
+
+        leader_waiting, leader_cancelled, (result, shared) = asyncio.run(scenario())
+
+        assert leader_waiting and leader_cancelled
+        assert result == {"total": 1} and shared
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    """Base SQLite fichier : le thread d'écriture et les appelants ont chacun leur connexion."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'books.db'}", connect_args={"check_same_thread": False})
+    migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+class TestWriteBatcher:
+    """Tests du regroupement des écritures (group commit)."""
+    
+    def test_read_then_write_with_single_connection_pool(self, tmp_path):
+        """Test : Lecture puis écriture d'une requête avec un pool d'une seule connexion, sans expiration."""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'books.db'}", connect_args={"check_same_thread": False},
+            poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.5
+        )
+        migrate(engine)
+        batcher = WriteBatcher(sessionmaker(bind=engine, autoflush=False))
+        try:
+            with sessionmaker(bind=engine)() as db:
+                repository = BatchingBookRepository(SQLAlchemyBookRepository(db), batcher)
+                book = repository.add(Book("Dune", "Herbert", 1965))
+                assert repository.get_by_id(book.id).title == "Dune"
+                
+                updated = repository.update(Book("Dune", "Herbert", 1966, book_id=book.id))
+                
+                assert updated.year == 1966
+                assert repository.get_by_id(book.id).year == 1966
+        finally:
+            batcher.close()
+            engine.dispose()
+    
+    @staticmethod
+    def submit_together(batcher: WriteBatcher, calls):
+        """Soumet les écritures depuis autant de threads ; retourne résultats ou exceptions."""
+        def run(call):
+            try:
+                return batcher.submit(*call)
+            except Exception as error:
+                return error
+        
+        with ThreadPoolExecutor(len(calls)) as pool:
+            return list(pool.map(run, calls))
+    
+    def test_concurrent_writes_share_one_commit(self, file_engine):
+        """Test : Des écritures simultanées sont validées ensemble, chacune avec son résultat."""
+        batcher = WriteBatcher(sessionmaker(bind=file_engine), max_delay=5, max_size=4)
+        try:
+            books = self.submit_together(batcher, [
+                ("add_if_absent", (Book(f"Book {index}", "Author", 2000),)) for index in range(4)
+            ])
+        finally:
+            batcher.close()
+        
+        assert sorted(book.id for book in books) == [1, 2, 3, 4]
+        assert batcher.stats() == {"batches": 1, "writes": 4, "replayed": 0, "largest": 4}
+        with sessionmaker(bind=file_engine)() as db:
+            repository = SQLAlchemyBookRepository(db)
+            assert repository.count() == 4
+            assert repository.get_collection_version()[0] == 4
+    
+    def test_duplicate_in_batch_stays_local(self, file_engine):
+        """Test : Un doublon dans le lot n'échoue que chez son appelant ; le lot est rejoué."""
+        batcher = WriteBatcher(sessionmaker(bind=file_engine), max_delay=5, max_size=3)
+        try:
+            batcher.submit("add", (Book("Dune", "Herbert", 1965),))
+            results = self.submit_together(batcher, [
+                ("add", (Book("Dune", "Herbert", 1966),)),
+                ("add", (Book("Emma", "Austen", 1815),)),
+                ("add_if_absent", (Book("Dune", "Herbert", 1967),)),
+            ])
+        finally:
+            batcher.close()
+        
+        duplicate, created, absent = results
+        assert isinstance(duplicate, DuplicateBookError)
+        assert created.title == "Emma" and created.id is not None
+        assert absent is None
+        assert batcher.replayed == 1
+        with sessionmaker(bind=file_engine)() as db:
+            assert [book.title for book in SQLAlchemyBookRepository(db).get_all()] == ["Dune", "Emma"]
+    
+    def test_duplicate_without_error_does_not_replay(self, file_engine):
+        """Test : add_if_absent sur un doublon ne fait rien, le reste du lot est validé tel quel."""
+        batcher = WriteBatcher(sessionmaker(bind=file_engine), max_delay=5, max_size=2)
+        try:
+            batcher.submit("add", (Book("Dune", "Herbert", 1965),))
+            absent, created = self.submit_together(batcher, [
+                ("add_if_absent", (Book("Dune", "Herbert", 1967),)),
+                ("add_if_absent", (Book("Emma", "Austen", 1815),)),
+            ])
+        finally:
+            batcher.close()
+        
+        assert absent is None and created.title == "Emma"
+        assert batcher.stats()["replayed"] == 0
+    
+    def test_reads_see_committed_writes(self, file_engine):
+        """Test : Un appel d'écriture ne rend la main qu'après le commit de son lot."""
+        batcher = WriteBatcher(sessionmaker(bind=file_engine), max_delay=0.001)
+        with sessionmaker(bind=file_engine)() as db:
+            repository = BatchingBookRepository(SQLAlchemyBookRepository(db), batcher)
+            try:
+                book = repository.add(Book("Dune", "Herbert", 1965))
+                repository.patch(book.id, {"rating": 5})
+                assert repository.get_by_id(book.id).rating == 5
+                assert repository.remove_by_id(book.id) is True
+                assert repository.get_by_id(book.id) is None
+            finally:
+                batcher.close()
@@ -0,0 +1,78 @@
+"""
+Tests du lanceur de production et de la préparation unique du schéma.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sqlalchemy import create_engine, inspect
+import server
+from adapters.migrations import schema_lock, setup_schema
+from adapters.repositories.caching_repository import cache_allowed
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    """Base SQLite fichier vide."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'books.db'}", connect_args={"check_same_thread": False})
+    yield engine
+    engine.dispose()
+
+
+def test_worker_count(monkeypatch):
+    """Test : WEB_CONCURRENCY, sinon un worker par cœur, dans la limite du budget de connexions."""
+    monkeypatch.delenv("DB_CONNECTION_BUDGET", raising=False)
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert server.worker_count() == 3
+    
+    monkeypatch.delenv("WEB_CONCURRENCY")
+    monkeypatch.setattr(server.os, "cpu_count", lambda: 6)
+    assert server.worker_count() == 6
+    
+    monkeypatch.setenv("DB_CONNECTION_BUDGET", "4")
+    assert server.worker_count() == 4
+
+
+def test_cache_disabled_with_several_workers():
+    """Test : Le cache, propre à chaque processus, n'est activé qu'avec un seul worker."""
+    assert cache_allowed(True, workers=1)
+    assert not cache_allowed(True, workers=4)
+    assert not cache_allowed(False, workers=1)
+
+
+def test_setup_schema_is_idempotent(file_engine):
+    """Test : La préparation crée le schéma complet ; la relancer ne change rien."""
+    setup_schema(file_engine)
+    setup_schema(file_engine)
+    
+    tables = set(inspect(file_engine).get_table_names())
+    assert {"books", "collection_state", "books_fts"} <= tables
+
+
+def test_schema_lock_is_exclusive(file_engine):
+    """Test : Un second processus (ici un thread) attend la fin de la préparation en cours."""
+    events = []
+    inside = threading.Event()
+    release = threading.Event()
+    
+    def first():
+        with schema_lock(file_engine):
+            events.append("first")
+            inside.set()
+            release.wait(5)
+            events.append("first done")
+    
+    def second():
+        inside.wait(5)
+        with schema_lock(file_engine):
+            events.append("second")
+    
+    with ThreadPoolExecutor(2) as pool:
+        futures = [pool.submit(first), pool.submit(second)]
+        inside.wait(5)
+        # Le second reste bloqué tant que le premier tient le verrou
+        assert not futures[1].done()
+        release.set()
+        for future in futures:
+            future.result()
+    
+    assert events == ["first", "first done", "second"]
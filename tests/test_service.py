@@ -4,10 +4,18 @@ Tests du BookService avec mocking du Repository.
 import pytest
 from unittest.mock import Mock, MagicMock
 from domain.book import Book
-from domain.exceptions import DuplicateBookError, BookNotFoundError
+from domain.exceptions import DuplicateBookError, BookNotFoundError, YearError
+from domain.query import DEFAULT_QUERY
 from service.book_service import BookService
 
 
+def assign_ids(books):
+    """Simule add_many : attribue un ID à chaque livre inséré."""
+    for book_id, book in enumerate(books, start=1):
+        book.id = book_id
+    return books
+
+
 class TestBookServiceCreate:
     """Tests de création de livres via le service."""
     
@@ -15,8 +23,7 @@ class TestBookServiceCreate:
         """Test : Créer un livre quand il n'existe pas."""
         # ARRANGE : Préparer les données
         mock_repo = Mock()
-        mock_repo.exists.return_value = False  # Le livre n'existe pas
-        mock_repo.add.return_value = Book("1984", "Orwell", 1949, book_id=1)
+        mock_repo.add_if_absent.return_value = Book("1984", "Orwell", 1949, book_id=1)
         
         service = BookService(mock_repo)
         
@@ -26,30 +33,26 @@ class TestBookServiceCreate:
         # ASSERT : Vérifier les résultats
         assert result.title == "1984"
         assert result.id == 1
-        mock_repo.exists.assert_called_once_with("1984", "Orwell")
-        mock_repo.add.assert_called_once()
+        mock_repo.add_if_absent.assert_called_once()
+        mock_repo.exists.assert_not_called()  # Pas de vérification préalable
     
     def test_create_book_duplicate_raises_error(self):
         """Test : Créer un livre qui existe déjà doit lever DuplicateBookError."""
         # ARRANGE
         mock_repo = Mock()
-        mock_repo.exists.return_value = True  # Le livre existe déjà !
+        mock_repo.add_if_absent.return_value = None  # Le livre existe déjà !
         
         service = BookService(mock_repo)
         
         # ACT & ASSERT
         with pytest.raises(DuplicateBookError):
             service.create_book("1984", "Orwell", 1949)
-        
-        # Vérifier que add() n'a jamais été appelé
-        mock_repo.add.assert_not_called()
     
     def test_create_book_with_rating(self):
         """Test : Créer un livre avec un rating."""
         # ARRANGE
         mock_repo = Mock()
-        mock_repo.exists.return_value = False
-        mock_repo.add.return_value = Book("1984", "Orwell", 1949, rating=5, book_id=1)
+        mock_repo.add_if_absent.return_value = Book("1984", "Orwell", 1949, rating=5, book_id=1)
         
         service = BookService(mock_repo)
         
@@ -184,6 +187,49 @@ class TestBookServiceUpdate:
         assert result.title == "1984"  # Titre inchangé
 
 
+class TestBookServicePatch:
+    """Tests de la modification partielle."""
+    
+    def test_patch_book_sends_only_validated_changes(self):
+        """Test : Seuls les champs fournis, nettoyés, sont envoyés, sans lecture préalable."""
+        # ARRANGE
+        mock_repo = Mock()
+        mock_repo.patch.return_value = Book("Dune", "Herbert", 1965, book_id=1)
+        
+        service = BookService(mock_repo)
+        
+        # ACT
+        result = service.patch_book(1, {"title": "  Dune "})
+        
+        # ASSERT
+        assert result.title == "Dune"
+        mock_repo.patch.assert_called_once_with(1, {"title": "Dune"})
+        mock_repo.get_by_id.assert_not_called()
+    
+    def test_patch_book_invalid_field(self):
+        """Test : Un champ invalide est refusé avant d'atteindre le repository."""
+        # ARRANGE
+        mock_repo = Mock()
+        service = BookService(mock_repo)
+        
+        # ACT & ASSERT
+        with pytest.raises(YearError):
+            service.patch_book(1, {"year": 3000})
+        mock_repo.patch.assert_not_called()
+    
+    def test_patch_book_not_found(self):
+        """Test : Modifier un livre inexistant lève BookNotFoundError."""
+        # ARRANGE
+        mock_repo = Mock()
+        mock_repo.patch.return_value = None
+        
+        service = BookService(mock_repo)
+        
+        # ACT & ASSERT
+        with pytest.raises(BookNotFoundError):
+            service.patch_book(999, {"rating": 4})
+
+
 class TestBookServiceDelete:
     """Tests de suppression de livres."""
     
@@ -213,6 +259,32 @@ class TestBookServiceDelete:
         # ACT & ASSERT
         with pytest.raises(BookNotFoundError):
             service.delete_book(999)
+    
+    def test_delete_books_returns_count(self):
+        """Test : La suppression en masse retourne le nombre de livres supprimés."""
+        # ARRANGE
+        mock_repo = Mock()
+        mock_repo.remove_many.return_value = [1, 2, 3]
+        
+        service = BookService(mock_repo)
+        
+        # ACT
+        result = service.delete_books(author="Orwell", year_min=1940)
+        
+        # ASSERT
+        assert result == 3
+        mock_repo.remove_many.assert_called_once_with(None, "Orwell", 1940, None)
+    
+    def test_delete_books_without_criteria(self):
+        """Test : Une suppression en masse sans critère est refusée."""
+        # ARRANGE
+        mock_repo = Mock()
+        service = BookService(mock_repo)
+        
+        # ACT & ASSERT
+        with pytest.raises(ValueError):
+            service.delete_books()
+        mock_repo.remove_many.assert_not_called()
 
 
 class TestBookServiceStatistics:
@@ -222,12 +294,14 @@ class TestBookServiceStatistics:
         """Test : Statistiques quand il y a des livres."""
         # ARRANGE
         mock_repo = Mock()
-        books = [
-            Book("Book 1", "Author", 1950, book_id=1),
-            Book("Book 2", "Author", 2000, book_id=2),
-            Book("Book 3", "Author", 1975, book_id=3)
-        ]
-        mock_repo.get_all.return_value = books
+        mock_repo.get_statistics.return_value = {
+            "total": 3,
+            "oldest": 1950,
+            "newest": 2000,
+            "rating_count": 2,
+            "rating_sum": 7,
+            "rating_distribution": {1: 0, 2: 0, 3: 1, 4: 1, 5: 0},
+        }
         
         service = BookService(mock_repo)
         
@@ -238,12 +312,22 @@ class TestBookServiceStatistics:
         assert result["total"] == 3
         assert result["oldest"] == 1950
         assert result["newest"] == 2000
+        assert result["average_rating"] == 3.5
+        assert result["rating_distribution"][4] == 1
+        mock_repo.get_all.assert_not_called()
     
     def test_get_statistics_empty(self):
         """Test : Statistiques quand il n'y a pas de livres."""
         # ARRANGE
         mock_repo = Mock()
-        mock_repo.get_all.return_value = []
+        mock_repo.get_statistics.return_value = {
+            "total": 0,
+            "oldest": None,
+            "newest": None,
+            "rating_count": 0,
+            "rating_sum": 0,
+            "rating_distribution": {1: 0, 2: 0, 3: 0, 4: 0, 5: 0},
+        }
         
         service = BookService(mock_repo)
         
@@ -253,4 +337,101 @@ class TestBookServiceStatistics:
         # ASSERT
         assert result["total"] == 0
         assert result["oldest"] is None
-        assert result["newest"] is None
\ No newline at end of file
+        assert result["newest"] is None
+        assert result["average_rating"] is None
+
+
+class TestBookServicePagination:
+    """Tests de la pagination par curseur."""
+    
+    def test_list_rows_page(self):
+        """Test : Lister une page de lignes."""
+        # ARRANGE
+        mock_repo = Mock()
+        mock_repo.get_page_rows.return_value = [(3, "1984", "Orwell", 1949, None)]
+        
+        service = BookService(mock_repo)
+        
+        # ACT
+        result = service.list_rows_page(after=2, limit=1)
+        
+        # ASSERT
+        assert result[0][0] == 3
+        mock_repo.get_page_rows.assert_called_once_with(after=2, limit=1, query=None)
+    
+    def test_iter_rows_follows_cursor(self):
+        """Test : Parcourir toutes les lignes page par page."""
+        # ARRANGE
+        mock_repo = Mock()
+        mock_repo.get_page_rows.side_effect = [
+            [(1, "Book 1", "Author", 2000, None), (2, "Book 2", "Author", 2000, None)],
+            [(3, "Book 3", "Author", 2000, None)],
+        ]
+        
+        service = BookService(mock_repo)
+        
+        # ACT
+        result = list(service.iter_rows(batch_size=2))
+        
+        # ASSERT
+        assert [row[0] for row in result] == [1, 2, 3]
+        mock_repo.get_page_rows.assert_called_with(after=2, limit=2, query=DEFAULT_QUERY)
+
+
+class TestBookServiceBulk:
+    """Tests de la création en masse."""
+    
+    def test_create_books_checks_duplicates_in_one_call(self):
+        """Test : Les doublons sont vérifiés en un seul appel ensembliste."""
+        # ARRANGE
+        mock_repo = Mock()
+        mock_repo.existing_keys.return_value = {("dune", "herbert")}
+        mock_repo.add_many.side_effect = assign_ids
+        
+        service = BookService(mock_repo)
+        
+        # ACT
+        result = service.create_books([
+            {"title": "1984", "author": "Orwell", "year": 1949},
+            {"title": "Dune", "author": "Herbert", "year": 1965},
+            {"title": "1984", "author": "orwell", "year": 1949},
+            {"title": "Bad", "author": "Author", "year": 10},
+        ])
+        
+        # ASSERT
+        assert [row["status"] for row in result] == ["accepted", "rejected", "rejected", "rejected"]
+        mock_repo.existing_keys.assert_called_once()
+        mock_repo.exists.assert_not_called()
+        mock_repo.add_many.assert_called_once()
+    
+    def test_create_books_rejects_rows_ignored_by_the_database(self):
+        """Test : Un livre ignoré à l'insertion (doublon concurrent) est rejeté."""
+        # ARRANGE
+        mock_repo = Mock()
+        mock_repo.existing_keys.return_value = set()
+        mock_repo.add_many.side_effect = lambda books: books  # Aucun ID attribué
+        
+        service = BookService(mock_repo)
+        
+        # ACT
+        result = service.create_books([{"title": "1984", "author": "Orwell", "year": 1949}])
+        
+        # ASSERT
+        assert result[0]["status"] == "rejected"
+    
+    def test_create_books_inserts_in_batches(self):
+        """Test : Les insertions sont faites par lots."""
+        # ARRANGE
+        mock_repo = Mock()
+        mock_repo.existing_keys.return_value = set()
+        mock_repo.add_many.side_effect = assign_ids
+        
+        service = BookService(mock_repo)
+        rows = [{"title": f"Book {i}", "author": "Author", "year": 2000} for i in range(5)]
+        
+        # ACT
+        result = service.create_books(rows, batch_size=2)
+        
+        # ASSERT
+        assert len(result) == 5
+        assert mock_repo.add_many.call_count == 3